@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class AboutConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.about'
+
+    def ready(self):
+        from app.about import signals  # noqa: F401
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('about', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='banner',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('about', '0002_banner_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='banner',
+            name='image_status',
+            field=models.CharField(choices=[('r', 'ready'), ('p', 'processing'), ('f', 'failed')], default='r', editable=False, max_length=1),
+        ),
+    ]
@@ -1,6 +1,7 @@
 from django.core.validators import FileExtensionValidator
 from django.db import models
 from app.user.validations import validate_phone_number, check_image_size
+from app.utils.images import ImageStatus
 
 
 class OurContact(models.Model):
@@ -67,6 +68,9 @@ class Banner(models.Model):
                               validators=[FileExtensionValidator(
                                   allowed_extensions=['jpg', 'jpeg', 'png', 'svg', 'webp', 'heif', 'heic', 'avif']),
                                   check_image_size])
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+    image_status = models.CharField(max_length=1, choices=ImageStatus.choices, default=ImageStatus.ready,
+                                    editable=False)
 
     def __str__(self):
         return self.image.url
@@ -5,6 +5,8 @@ from rest_framework.exceptions import ValidationError
 from app.about.models import OurContact, Contact, SocialMedia, News, \
     Banner, About
 from app.user.validations import check_valid_email
+from app.utils.media import media_url
+from app.utils.serializers import MediaImageField, SrcsetField
 from app.utils.utility import ImageOrUrlField
 from rest_framework import serializers
 from django.conf import settings
@@ -68,7 +70,7 @@ class NewsGetSerializer(serializers.ModelSerializer):
 
     def get_images(self, obj):
         request = self.context.get('request')
-        return [request.build_absolute_uri(settings.MEDIA_URL + img) for img in obj.images if img]
+        return [media_url(img, request) for img in obj.images if img]
 
     def to_representation(self, instance):
         rep = super().to_representation(instance)
@@ -92,7 +94,7 @@ class NewsSerializer(serializers.ModelSerializer):
 
     def get_images_urls(self, obj):
         request = self.context.get('request')
-        return [request.build_absolute_uri(settings.MEDIA_URL + img) for img in obj.images if img]
+        return [media_url(img, request) for img in obj.images if img]
 
     def create(self, validated_data):
         images = validated_data.pop('images', [])
@@ -159,11 +161,12 @@ class NewsSerializer(serializers.ModelSerializer):
 
 
 class BannerSerializer(serializers.ModelSerializer):
-    image = serializers.ImageField(use_url=True)
+    image = MediaImageField(use_url=True)
+    srcset = SrcsetField()
 
     class Meta:
         model = Banner
-        fields = ('id', 'image')
+        fields = ('id', 'image', 'image_status', 'srcset')
 
 
 class AboutSerializer(serializers.ModelSerializer):
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from app.about.models import OurContact, News, SocialMedia, Banner, About
+from app.utils.cache import bump_namespace
+from app.utils.images import track_renditions
+
+track_renditions(Banner)
+
+CACHE_NAMESPACES = {
+    OurContact: 'our_contact',
+    News: 'news',
+    SocialMedia: 'social_media',
+    Banner: 'banner',
+    About: 'about',
+}
+
+
+@receiver([post_save, post_delete], sender=OurContact)
+@receiver([post_save, post_delete], sender=News)
+@receiver([post_save, post_delete], sender=SocialMedia)
+@receiver([post_save, post_delete], sender=Banner)
+@receiver([post_save, post_delete], sender=About)
+def invalidate_about_cache(sender, **kwargs):
+    bump_namespace(CACHE_NAMESPACES[sender])
@@ -0,0 +1,28 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from app.about.models import About, SocialMedia
+
+
+class AboutConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_versions_are_per_resource(self):
+        about = self.client.get(reverse('about'))
+        social_media = self.client.get(reverse('social-media'))
+
+        SocialMedia.objects.create(telegram='https://t.me/anasavdo')
+
+        self.assertEqual(self.client.get(reverse('about'), HTTP_IF_NONE_MATCH=about['ETag']).status_code, 304)
+        response = self.client.get(reverse('social-media'), HTTP_IF_NONE_MATCH=social_media['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+
+    def test_about_write_changes_etag(self):
+        etag = self.client.get(reverse('about'))['ETag']
+
+        About.objects.create(happy_clients=100)
+
+        self.assertEqual(self.client.get(reverse('about'), HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -10,6 +10,7 @@ from app.about.models import OurContact, Contact, SocialMedia, News, Banner, Abo
 from app.about.serializers import OurContactSerializer, ContactSerializer, SocialMediaSerializer, NewsSerializer, \
     BannerSerializer, AboutSerializer, NewsGetSerializer
 from app.user.validations import IsAdminOrSuperAdmin
+from app.utils.cache import cache_response, conditional_response
 
 
 @extend_schema(tags=['Our Contact'])
@@ -23,6 +24,8 @@ class OurContactAPIView(views.APIView):
             return [IsAdminOrSuperAdmin()]
         return [IsAuthenticated()]
 
+    @conditional_response('our_contact')
+    @cache_response('our_contact')
     def get(self, request):
         our_contact = OurContact.objects.all()
         serializer = OurContactSerializer(our_contact, many=True, context={'request': request})
@@ -67,6 +70,7 @@ class OurContactDetailView(views.APIView):
 class ContactAPIView(ListCreateAPIView):
     queryset = Contact.objects.all()
     serializer_class = ContactSerializer
+    keyset_ordering = ('-created_at', '-id')
 
     def get_permissions(self):
         if self.request.method == 'GET':
@@ -108,6 +112,7 @@ class ContactSDetailAPIView(views.APIView):
 class SocialMediaAPIView(ListCreateAPIView):
     queryset = SocialMedia.objects.all()
     serializer_class = SocialMediaSerializer
+    pagination_class = None
 
     def get_permissions(self):
         if self.request.method == 'GET':
@@ -116,6 +121,11 @@ class SocialMediaAPIView(ListCreateAPIView):
             return [IsAdminOrSuperAdmin()]
         return [IsAuthenticated()]
 
+    @conditional_response('social_media')
+    @cache_response('social_media')
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
 
 @extend_schema(tags=['Social Media'])
 class SocialMediaDetailAPIView(views.APIView):
@@ -130,6 +140,7 @@ class SocialMediaDetailAPIView(views.APIView):
             return [IsAdminOrSuperAdmin()]
         return [IsAuthenticated()]
 
+    @cache_response('social_media')
     def get(self, request, pk):
         social_media = get_object_or_404(SocialMedia, pk=pk)
         serializer = SocialMediaSerializer(social_media, context={'request': request})
@@ -160,6 +171,7 @@ class NewsAPIView(views.APIView):
             return [IsAdminOrSuperAdmin()]
         return [IsAuthenticated()]
 
+    @cache_response('news')
     def get(self, request):
         news = News.objects.all()
         serializer = NewsGetSerializer(news, many=True, context={'request': request})
@@ -186,6 +198,7 @@ class NewsDetailAPIView(views.APIView):
             return [IsAdminOrSuperAdmin()]
         return [IsAuthenticated()]
 
+    @cache_response('news')
     def get(self, request, pk):
         news = get_object_or_404(News, pk=pk)
         serializer = NewsGetSerializer(news, context={'request': request})
@@ -209,6 +222,7 @@ class NewsDetailAPIView(views.APIView):
 class BannerAPIView(ListCreateAPIView):
     queryset = Banner.objects.all()
     serializer_class = BannerSerializer
+    pagination_class = None
 
     def get_permissions(self):
         if self.request.method == 'GET':
@@ -217,6 +231,11 @@ class BannerAPIView(ListCreateAPIView):
             return [IsAdminOrSuperAdmin()]
         return [IsAuthenticated()]
 
+    @conditional_response('banner')
+    @cache_response('banner')
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
 
 @extend_schema(tags=['Banner'])
 class BannerDetailAPIView(views.APIView):
@@ -247,12 +266,18 @@ class BannerDetailAPIView(views.APIView):
 class AboutAPIView(ListAPIView):
     queryset = About.objects.all()
     serializer_class = AboutSerializer
+    pagination_class = None
 
     def get_permissions(self):
         if self.request.method == 'GET':
             return [AllowAny()]
         return [IsAuthenticated()]
 
+    @conditional_response('about')
+    @cache_response('about')
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
 
 @extend_schema(tags=['About'])
 class AboutDetailAPIView(views.APIView):
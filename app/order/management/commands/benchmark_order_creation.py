@@ -0,0 +1,76 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+
+from app.order.serializers import OrderSerializer
+from app.product.models import Category, Product, ProductColor, ProductType, ProductValue
+from app.user.models import User
+from app.utils.models import Color
+
+
+class Command(BaseCommand):
+    help = ('Measures the queries and latency of placing an order through OrderSerializer for carts of several '
+            'sizes. Everything runs in a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lines', type=int, nargs='+', default=[1, 20, 100], help='Cart sizes to place')
+        parser.add_argument('--features', type=int, default=2, help='Features picked per cart line')
+        parser.add_argument('--runs', type=int, default=5)
+
+    def handle(self, *args, **options):
+        request = Request(RequestFactory().get('/'))
+        request.LANGUAGE_CODE = settings.LANGUAGE_CODE
+
+        with transaction.atomic():
+            user, lines = self.generate(max(options['lines']), options['features'])
+            for size in options['lines']:
+                data = {
+                    'receive': 'd', 'payment': 'cash', 'name': 'Benchmark',
+                    'location': {'fullAddress': 'Tashkent', 'latitude': '41.311081', 'longitude': '69.240562'},
+                    'items': lines[:size],
+                }
+                timings = []
+                for _ in range(options['runs']):
+                    with CaptureQueriesContext(connection) as context:
+                        start = time.perf_counter()
+                        serializer = OrderSerializer(data=data, context={'request': request})
+                        serializer.is_valid(raise_exception=True)
+                        serializer.save(user=user)
+                        timings.append((time.perf_counter() - start) * 1000)
+                self.stdout.write(
+                    f'{size} lines: {len(context.captured_queries)} queries, {min(timings):.1f} ms'
+                )
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished, generated rows rolled back'))
+
+    def generate(self, count, features):
+        category = Category.objects.create(name='Benchmark')
+        user = User.objects.create_user(phone_number='+998900000000', full_name='Benchmark')
+        color = Color.objects.create(name='Black', image='images/color/black.png')
+        products = Product.objects.bulk_create(
+            Product(category=category, title_en=f'Product {i}', price=100 + i, slug=f'benchmark-{i}')
+            for i in range(count)
+        )
+        colors = ProductColor.objects.bulk_create(
+            ProductColor(product=product, color=color, image='images/product/black.png', price=5)
+            for product in products
+        )
+        types = ProductType.objects.bulk_create(ProductType(product=product, name_en='Memory') for product in products)
+        values = ProductValue.objects.bulk_create(
+            ProductValue(product=memory.product, type=memory, value=f'{n}GB', price=10)
+            for memory in types for n in range(features)
+        )
+        lines = [
+            {
+                'product': product.pk, 'color': product_color.pk, 'quantity': 2,
+                'feature': [value.pk for value in values[i * features:(i + 1) * features]],
+            }
+            for i, (product, product_color) in enumerate(zip(products, colors))
+        ]
+        return user, lines
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from app.order.models import PurchasedProduct
+from app.order.purchases import rebuild_purchases
+
+
+class Command(BaseCommand):
+    help = 'Refills the purchased products of every user from their successful and delivered orders'
+
+    def handle(self, *args, **options):
+        rebuild_purchases()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {PurchasedProduct.objects.count()} purchased products'))
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_purchases(apps, schema_editor):
+    Item = apps.get_model('order', 'Item')
+    PurchasedProduct = apps.get_model('order', 'PurchasedProduct')
+
+    pairs = Item.objects.filter(order__status__in=('s', 'd')) \
+        .values_list('order__user_id', 'product_id').distinct().order_by()
+    PurchasedProduct.objects.bulk_create(
+        (PurchasedProduct(user_id=user_id, product_id=product_id) for user_id, product_id in pairs.iterator()),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0004_keyset_pagination_indexes'),
+        ('product', '0008_product_ratings'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PurchasedProduct',
+            fields=[
+                ('pk', models.CompositePrimaryKey('user', 'product', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='product.product')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Purchased product',
+                'verbose_name_plural': 'Purchased products',
+                'db_table': 'purchasedproduct',
+            },
+        ),
+        migrations.RunPython(backfill_purchases, migrations.RunPython.noop),
+    ]
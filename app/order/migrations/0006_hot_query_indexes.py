@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0005_purchasedproduct'),
+        ('utils', '0004_idempotencykey'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'created', 'id'], name='order_status_created_idx'),
+        ),
+    ]
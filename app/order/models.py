@@ -41,6 +41,11 @@ class Order(models.Model):
         verbose_name = "Order"
         verbose_name_plural = "Orders"
         ordering = ['-created']
+        indexes = [
+            models.Index(fields=['user', 'created', 'id'], name='order_user_created_idx'),
+            models.Index(fields=['created', 'id'], name='order_created_idx'),
+            models.Index(fields=['status', 'created', 'id'], name='order_status_created_idx'),
+        ]
 
 
 class Item(models.Model):
@@ -69,3 +74,21 @@ class ItemValue(models.Model):
         db_table = 'itemvalue'
         verbose_name = 'Item value'
         verbose_name_plural = 'Item values'
+
+
+class PurchasedProduct(models.Model):
+    """
+    ``user`` has ``product`` in a successful or delivered order, kept in sync with the orders by
+    ``app.order.purchases``; checking a purchase is a primary key lookup.
+    """
+    pk = models.CompositePrimaryKey('user', 'product')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='+')
+
+    def __str__(self):
+        return f"{self.user_id} | {self.product_id}"
+
+    class Meta:
+        db_table = 'purchasedproduct'
+        verbose_name = 'Purchased product'
+        verbose_name_plural = 'Purchased products'
@@ -0,0 +1,161 @@
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+
+from django.conf import settings
+
+from app.product.models import Product, ProductColor, ProductValue
+from app.utils.cache import get_namespace_versions
+
+# bumped once a change of a product, colour or feature price commits (see app.order.signals)
+PRICE_NAMESPACE = 'price'
+ZERO = Decimal("0.00")
+
+
+def safe_decimal(value, default=ZERO):
+    try:
+        if value in [None, "", "nan", "NaN"]:
+            return default
+        return Decimal(str(value))
+    except Exception:
+        return default
+
+
+class Prices:
+    """
+    Prices of the products, colours and features a ``PriceBook`` had loaded.
+    """
+
+    def __init__(self, products, colors, values):
+        self.products = products
+        # id: (product_id, price)
+        self.colors = colors
+        self.values = values
+
+    def product_price(self, product_id):
+        return self.products.get(product_id)
+
+    def color_price(self, color_id):
+        color = self.colors.get(color_id)
+        return color[1] if color else None
+
+    def product_features(self, product_id, feature_ids):
+        # features of another product are ignored
+        return [
+            feature for feature in feature_ids
+            if self.values.get(feature) is not None and self.values[feature][0] == product_id
+        ]
+
+    def line_price(self, product_id, color_id=None, feature_ids=(), quantity=1):
+        """
+        ``(price, feature_ids)`` of a cart line: the product, colour and feature surcharges times
+        ``quantity``, and the features that count.
+        """
+        features = self.product_features(product_id, feature_ids)
+        price = sum((safe_decimal(self.values[feature][1]) for feature in features), ZERO)
+        price += safe_decimal(self.product_price(product_id))
+        if color_id is not None:
+            price += safe_decimal(self.color_price(color_id))
+        return price * (quantity or 1), features
+
+
+def load_prices(products, colors=(), value_ids=()):
+    """
+    ``Prices`` of already loaded ``products`` and ``colors`` and of the features ``value_ids``, read from the
+    database now. Orders are priced this way, inside their transaction, never from the ``PriceBook``.
+    """
+    values = ProductValue.objects.filter(pk__in=value_ids).values_list('id', 'product_id', 'price') \
+        if value_ids else ()
+    return Prices(
+        {product.pk: product.price for product in products},
+        {color.pk: (color.product_id, color.price) for color in colors},
+        {pk: (product_id, price) for pk, product_id, price in values},
+    )
+
+
+class PriceBook:
+    """
+    In-process prices of products, product colours and features. Entries are loaded on first use and all of
+    them are dropped when the ``PRICE_NAMESPACE`` version changes, so a warm book answers from memory.
+
+    The book is bounded: it keeps at most ``size`` entries of each kind, least recently used first out, and
+    ids that do not exist are not remembered. The version lives in the default cache: with a per-process
+    cache (locmem) other workers do not see a bump, so entries are also reloaded after ``max_age`` seconds,
+    the book only serves quotes, and orders are priced with ``load_prices``.
+    """
+
+    def __init__(self, size=None, max_age=None):
+        self.size = settings.PRICE_BOOK_SIZE if size is None else size
+        self.max_age = settings.PRICE_BOOK_MAX_AGE if max_age is None else max_age
+        self.version = None
+        self.products, self.colors, self.values = OrderedDict(), OrderedDict(), OrderedDict()
+        self.lock = threading.Lock()
+
+    def load(self, product_ids=(), color_ids=(), value_ids=()):
+        """
+        ``Prices`` covering the given ids, copied out of the book so they stay consistent while other threads
+        reload or evict.
+        """
+        version, = get_namespace_versions(PRICE_NAMESPACE)
+        now = time.monotonic()
+        with self.lock:
+            if version != self.version:
+                self.products, self.colors, self.values = OrderedDict(), OrderedDict(), OrderedDict()
+                self.version = version
+            return Prices(
+                self._fill(self.products, product_ids, Product.objects.values_list('id', 'price'),
+                           lambda row: row[1], now),
+                self._fill(self.colors, color_ids, ProductColor.objects.values_list('id', 'product_id', 'price'),
+                           lambda row: (row[1], row[2]), now),
+                self._fill(self.values, value_ids, ProductValue.objects.values_list('id', 'product_id', 'price'),
+                           lambda row: (row[1], row[2]), now),
+            )
+
+    def _fill(self, entries, ids, queryset, entry, now):
+        # id: (loaded at, price entry)
+        found, missing = {}, set()
+        for pk in ids:
+            if pk is None:
+                continue
+            if pk in entries and now - entries[pk][0] < self.max_age:
+                entries.move_to_end(pk)
+                found[pk] = entries[pk][1]
+            else:
+                missing.add(pk)
+        if missing:
+            for row in queryset.filter(pk__in=missing):
+                found[row[0]] = entry(row)
+                entries[row[0]] = (now, found[row[0]])
+                entries.move_to_end(row[0])
+            while len(entries) > self.size:
+                entries.popitem(last=False)
+        return found
+
+
+_price_book = PriceBook()
+
+
+def get_prices(lines=()):
+    """
+    ``Prices`` from the process price book for every product, colour and feature of ``lines`` (dicts of
+    ``product``, ``color`` and ``feature`` ids).
+    """
+    return _price_book.load(
+        product_ids={line['product'] for line in lines},
+        color_ids={line.get('color') for line in lines},
+        value_ids={feature for line in lines for feature in line.get('feature', ())},
+    )
+
+
+def quote(lines):
+    """
+    Prices ``lines`` of ``product``, ``color``, ``feature`` and ``quantity`` like an order would.
+    """
+    prices = get_prices(lines)
+    items = []
+    for line in lines:
+        price, features = prices.line_price(line['product'], line.get('color'), line.get('feature', ()),
+                                            line.get('quantity', 1))
+        items.append({**line, 'feature': features, 'price': price})
+    return {'items': items, 'price': sum((item['price'] for item in items), ZERO)}
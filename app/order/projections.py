@@ -0,0 +1,47 @@
+from app.order.models import Order, Item
+from app.order.serializers import OrderHistorySerializer
+from app.product.models import Product, ProductImage
+from app.utils.projections import Projection, column, decimal_formatter, datetime_formatter, translator, \
+    translated_columns, group_by
+
+
+class OrderHistoryProjection(Projection):
+    """
+    Compiled ``OrderHistorySerializer``.
+    """
+    serializer_class = OrderHistorySerializer
+    format_item_price = staticmethod(decimal_formatter(Item, 'price'))
+
+    def get_fields(self):
+        self.product_title = translator(Product, 'title', 'product__')
+        return [
+            ('id', ('id',), column('id')),
+            ('status', ('status',), column('status')),
+            ('price', ('price',), column('price', decimal_formatter(Order, 'price'))),
+            ('created', ('created',), column('created', datetime_formatter())),
+            ('items', (), self.get_items),
+        ]
+
+    def load_related(self, rows):
+        if not self.wants('items'):
+            return {}
+        items = list(
+            Item.objects.filter(order_id__in=[row['id'] for row in rows]).order_by('pk')
+            .values('id', 'order_id', 'price', 'product_id', *translated_columns('title', 'product__'))
+        )
+        covers = dict(
+            ProductImage.objects.covers().filter(product_id__in={item['product_id'] for item in items})
+            .values_list('product_id', 'image')
+        )
+        return {'items': group_by(items, 'order_id'), 'covers': covers}
+
+    def get_items(self, row, related):
+        return [
+            {
+                'id': item['id'],
+                'price': self.format_item_price(item['price']),
+                'name': self.product_title(item),
+                'image': self.media_url(related['covers'].get(item['product_id'])),
+            }
+            for item in related['items'].get(row['id'], ())
+        ]
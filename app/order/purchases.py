@@ -0,0 +1,47 @@
+from django.db import transaction
+
+from app.order.models import Item, Order, PurchasedProduct
+
+PURCHASED_STATUSES = (Order.OrderStatus.Success, Order.OrderStatus.Delivered)
+
+
+def has_purchased(user_id, product_id):
+    return PurchasedProduct.objects.filter(pk=(user_id, product_id)).exists()
+
+
+def sync_purchases(user_id, product_ids):
+    """
+    Brings the purchased set of ``user_id`` in line with its orders for ``product_ids``: a product stays
+    purchased while any successful or delivered order of the user contains it.
+    """
+    product_ids = set(product_ids)
+    if not product_ids:
+        return
+    purchased = set(
+        Item.objects.filter(order__user_id=user_id, order__status__in=PURCHASED_STATUSES, product_id__in=product_ids)
+        .values_list('product_id', flat=True).distinct()
+    )
+    with transaction.atomic():
+        PurchasedProduct.objects.filter(user_id=user_id, product_id__in=product_ids - purchased).delete()
+        PurchasedProduct.objects.bulk_create(
+            [PurchasedProduct(user_id=user_id, product_id=product_id) for product_id in purchased],
+            ignore_conflicts=True,
+        )
+
+
+def sync_order_purchases(order):
+    sync_purchases(order.user_id, order.items.values_list('product_id', flat=True))
+
+
+def rebuild_purchases(batch_size=1000):
+    """
+    Refills the purchased set from every successful or delivered order.
+    """
+    pairs = Item.objects.filter(order__status__in=PURCHASED_STATUSES) \
+        .values_list('order__user_id', 'product_id').distinct().order_by()
+    with transaction.atomic():
+        PurchasedProduct.objects.all().delete()
+        PurchasedProduct.objects.bulk_create(
+            (PurchasedProduct(user_id=user_id, product_id=product_id) for user_id, product_id in pairs.iterator()),
+            batch_size=batch_size,
+        )
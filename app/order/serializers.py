@@ -1,18 +1,74 @@
 from decimal import Decimal
+from django.db import connection, transaction
+from django.db.models import Prefetch, prefetch_related_objects
 from rest_framework import serializers
 
-from app.order.models import Order, Item, ItemValue, ProductValue
+from app.order.models import Order, Item, ItemValue, Product, ProductColor
+from app.order.pricing import ZERO, get_prices, load_prices, safe_decimal
+from app.order.purchases import PURCHASED_STATUSES, sync_order_purchases
+from app.product.models import ProductImage
 from app.user.validations import validate_phone_number
+from app.utils.media import media_url
+from app.utils.mixins import SparseFieldsetMixin
 from app.utils.models import Location
 from app.utils.serializers import LocationSerializer
 
 
+class LoadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    ``PrimaryKeyRelatedField`` resolving its pk from the objects ``ItemListSerializer`` loaded for the whole
+    list, instead of a query per value.
+    """
+
+    def to_internal_value(self, data):
+        loaded = self.context.get('loaded_objects', {}).get(self.get_queryset().model)
+        if loaded is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return loaded[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+def _pks(values):
+    pks = set()
+    for value in values:
+        try:
+            pks.add(int(value))
+        except (TypeError, ValueError):
+            pass
+    return pks
+
+
+class ItemListSerializer(serializers.ListSerializer):
+    """
+    Loads every product and colour referenced by the cart lines with one query each before the lines are
+    validated.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            lines = [line for line in data if isinstance(line, dict)]
+            fields = self.child.fields
+            self.context.setdefault('loaded_objects', {}).update({
+                Product: fields['product'].get_queryset().in_bulk(_pks(line.get('product') for line in lines)),
+                ProductColor: fields['color'].get_queryset().in_bulk(_pks(line.get('color') for line in lines)),
+            })
+        return super().to_internal_value(data)
+
+
 class ItemSerializer(serializers.ModelSerializer):
+    serializer_related_field = LoadedPrimaryKeyRelatedField
     feature = serializers.ListSerializer(write_only=True, child=serializers.IntegerField())
     images = serializers.SerializerMethodField()
 
     class Meta:
         model = Item
+        list_serializer_class = ItemListSerializer
         fields = ('product', 'quantity', 'color', 'feature', 'price', 'images')
         extra_kwargs = {
             "feature": {"required": False},
@@ -23,7 +79,7 @@ class ItemSerializer(serializers.ModelSerializer):
     def get_images(self, obj):
         request = self.context.get('request')
         images = obj.product.productimage_set.all()
-        return [request.build_absolute_uri(img.image.url) for img in images if img.image]
+        return [media_url(img.image.name, request) for img in images if img.image]
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -40,19 +96,7 @@ class ItemSerializer(serializers.ModelSerializer):
         return data
 
 
-ZERO = Decimal("0.00")
-
-
-def safe_decimal(value, default=ZERO):
-    try:
-        if value in [None, "", "nan", "NaN"]:
-            return default
-        return Decimal(str(value))
-    except Exception:
-        return default
-
-
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     items = ItemSerializer(many=True, write_only=True)
     items_detail = ItemSerializer(many=True, read_only=True, source='items')
     location = LocationSerializer()
@@ -64,6 +108,16 @@ class OrderSerializer(serializers.ModelSerializer):
         coerce_to_string=False
     )
 
+    select_related_fields = ('location',)
+    prefetch_related_fields = (
+        'items__product__productimage_set', 'items__color__color', 'items__itemvalue_set__feature__type'
+    )
+    expandable_fields = ('location', 'items_detail')
+    field_relations = {
+        'location': ('location',),
+        'items_detail': prefetch_related_fields,
+    }
+
     class Meta:
         model = Order
         fields = (
@@ -90,25 +144,20 @@ class OrderSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         items_data = validated_data.pop('items')
         location_data = validated_data.pop('location')
-        location = Location.objects.create(**location_data)
-        validated_data['location'] = location
-        order = Order.objects.create(**validated_data)
         user = validated_data.get('user')
         if user:
-            order.phone_number = user.phone_number
-
-        price = ZERO
-        for item in items_data:
-            features = item.pop('feature', [])
-            item['order'] = order
-            tmp = Item.objects.create(**item)
-            tmp_price = self._calculate_item_price(tmp, features)
-            tmp.price = tmp_price
-            tmp.save()
-            price += tmp_price
-
-        order.price = price
-        order.save()
+            validated_data['phone_number'] = user.phone_number
+
+        with transaction.atomic():
+            validated_data['location'] = Location.objects.create(**location_data)
+            items, values = self._price_items(items_data)
+            order = Order.objects.create(price=sum((item.price for item in items), ZERO), **validated_data)
+            self._save_items(order, items, values)
+            # the bulk inserts send no signals, a new order is synced here
+            if order.status in PURCHASED_STATUSES:
+                sync_order_purchases(order)
+        if self.is_requested('items_detail'):
+            prefetch_related_objects([order], *self.field_relations['items_detail'])
         return order
 
     def update(self, instance, validated_data):
@@ -118,58 +167,112 @@ class OrderSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
 
-        if location_data:
-            if instance.location:
-                for attr, value in location_data.items():
-                    setattr(instance.location, attr, value)
-                instance.location.save()
+        with transaction.atomic():
+            if location_data:
+                if instance.location:
+                    for attr, value in location_data.items():
+                        setattr(instance.location, attr, value)
+                    instance.location.save()
+                else:
+                    instance.location = Location.objects.create(**location_data)
+
+            if items_data is not None:
+                instance.items.all().delete()
+                items, values = self._price_items(items_data)
+                self._save_items(instance, items, values)
+                instance.price = sum((item.price for item in items), ZERO)
             else:
-                instance.location = Location.objects.create(**location_data)
-
-        if items_data is not None:
-            instance.items.all().delete()
-            self._create_items(instance, items_data)
-
-        price = ZERO
-        for item in instance.items.all():
-            price += safe_decimal(item.price)
+                instance.price = sum((safe_decimal(item.price) for item in instance.items.all()), ZERO)
 
-        instance.price = price
-        instance.save()
+            instance.save()
         return instance
 
-    def _create_items(self, order, items_data):
-        for item in items_data:
-            features = item.pop('feature', [])
-            item['order'] = order
-            tmp = Item.objects.create(**item)
-            tmp.price = self._calculate_item_price(tmp, features)
-            tmp.save()
-
-    def _calculate_item_price(self, item, features):
-        tmp_price = ZERO
-        for feature in features:
-            if ProductValue.objects.filter(id=feature, product_id=item.product_id).exists():
-                t = ItemValue.objects.create(item=item, feature_id=feature)
-                tmp_price += safe_decimal(t.feature.price)
-
-        product_price = safe_decimal(item.product.price)
-        color_price = safe_decimal(item.color.price) if item.color else ZERO
-
-        tmp_price += product_price + color_price
-        tmp_price *= item.quantity or 1
-        return tmp_price
+    @staticmethod
+    def _price_items(items_data):
+        """
+        Builds the unsaved items and their feature values, priced from the loaded products and colours and
+        the current feature rows.
+        """
+        lines = [
+            {
+                'product': item['product'].pk,
+                'color': item['color'].pk if item.get('color') else None,
+                'feature': item.get('feature', []),
+                'quantity': item.get('quantity', 1),
+            }
+            for item in items_data
+        ]
+        prices = load_prices(
+            {item['product'] for item in items_data},
+            {item['color'] for item in items_data if item.get('color')},
+            {feature for line in lines for feature in line['feature']},
+        )
+        items, values = [], []
+        for data, line in zip(items_data, lines):
+            data = dict(data)
+            data.pop('feature', None)
+            item = Item(**data)
+            item.price, features = prices.line_price(line['product'], line['color'], line['feature'], line['quantity'])
+            items.append(item)
+            values.append(features)
+        return items, values
+
+    @staticmethod
+    def _save_items(order, items, values):
+        for item in items:
+            item.order = order
+        Item.objects.bulk_create(items)
+        if not connection.features.can_return_rows_from_bulk_insert:
+            # the rows of one multi-row insert get consecutive ids in insertion order
+            ids = order.items.order_by('pk').values_list('pk', flat=True)
+            for item, pk in zip(items, ids):
+                item.pk = pk
+        ItemValue.objects.bulk_create(
+            ItemValue(item=item, feature_id=feature) for item, features in zip(items, values) for feature in features
+        )
 
     def to_representation(self, instance):
         rep = super().to_representation(instance)
-        lang = self.context['request'].LANGUAGE_CODE
-        rep['name'] = getattr(instance, f"name_{lang}", instance.name)
+        if self.is_requested('name'):
+            lang = self.context['request'].LANGUAGE_CODE
+            rep['name'] = getattr(instance, f"name_{lang}", instance.name)
 
-        price = safe_decimal(instance.price)
-        rep['price'] = str(price.quantize(Decimal("0.00")))
+        if self.is_requested('price'):
+            price = safe_decimal(instance.price)
+            rep['price'] = str(price.quantize(Decimal("0.00")))
         return rep
 
 
+class QuoteLineSerializer(serializers.Serializer):
+    product = serializers.IntegerField()
+    color = serializers.IntegerField(required=False, allow_null=True)
+    feature = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    quantity = serializers.IntegerField(default=1, min_value=1, max_value=100)
+    price = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+
+
+class QuoteSerializer(serializers.Serializer):
+    """
+    A cart priced like ``OrderSerializer`` would, without placing the order.
+    """
+    items = QuoteLineSerializer(many=True, allow_empty=False)
+    price = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+
+    def validate_items(self, lines):
+        prices = get_prices(lines)
+        errors = []
+        for line in lines:
+            error = {}
+            if prices.product_price(line['product']) is None:
+                error['product'] = [f'Invalid pk "{line["product"]}" - object does not exist.']
+            if line.get('color') is not None and prices.color_price(line['color']) is None:
+                error['color'] = [f'Invalid pk "{line["color"]}" - object does not exist.']
+            errors.append(error)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return lines
+
+
 class ItemHistorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Item
@@ -178,11 +281,12 @@ class ItemHistorySerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         request = self.context.get('request')
         data = super().to_representation(instance)
-        print('instance order:', instance)
         data['name'] = instance.product.title
-        images = instance.product.productimage_set.all()
-        if images:
-            data['image'] = request.build_absolute_uri(images[0].image.url)
+        covers = getattr(instance.product, 'covers', None)
+        if covers is None:
+            covers = instance.product.productimage_set.covers()
+        if covers:
+            data['image'] = media_url(covers[0].image.name, request)
         else:
             data['image'] = None
         return data
@@ -194,9 +298,17 @@ class OrderStatusSerializer(serializers.ModelSerializer):
         fields = ['status', ]
 
 
-class OrderHistorySerializer(serializers.ModelSerializer):
+class OrderHistorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     items = ItemHistorySerializer(many=True)
 
+    # items with their products, then one cover image per product: three queries for a page of any size
+    prefetch_related_fields = (
+        Prefetch('items', queryset=Item.objects.select_related('product').order_by('pk')),
+        Prefetch('items__product__productimage_set', queryset=ProductImage.objects.covers(), to_attr='covers'),
+    )
+    expandable_fields = ('items',)
+    field_relations = {'items': prefetch_related_fields}
+
     class Meta:
         model = Order
         fields = ('id', 'status', 'price', 'created', 'items')
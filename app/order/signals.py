@@ -0,0 +1,46 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from app.order.models import Item, Order
+from app.order.pricing import PRICE_NAMESPACE
+from app.order.purchases import PURCHASED_STATUSES, sync_order_purchases, sync_purchases
+from app.product.models import Product, ProductColor, ProductValue
+from app.utils.cache import bump_namespace
+
+
+@receiver(post_save, sender=Order)
+def sync_purchases_on_order_save(sender, instance, created, **kwargs):
+    # a new order has no items yet, they are synced as they are added
+    if not created:
+        sync_order_purchases(instance)
+
+
+@receiver(pre_delete, sender=Order)
+def remember_order_products(sender, instance, **kwargs):
+    instance._purchased_product_ids = list(instance.items.values_list('product_id', flat=True))
+
+
+@receiver(post_delete, sender=Order)
+def sync_purchases_on_order_delete(sender, instance, **kwargs):
+    sync_purchases(instance.user_id, getattr(instance, '_purchased_product_ids', ()))
+
+
+@receiver([post_save, post_delete], sender=Item)
+def sync_purchases_on_item_change(sender, instance, **kwargs):
+    origin = kwargs.get('origin')
+    if isinstance(origin, Order) or getattr(origin, 'model', None) is Order:
+        return
+    order = Order.objects.filter(pk=instance.order_id).values('user_id', 'status').first()
+    # items added to an open order change nothing, only removals can drop a purchase
+    if order is None or ('created' in kwargs and order['status'] not in PURCHASED_STATUSES):
+        return
+    sync_purchases(order['user_id'], [instance.product_id])
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=ProductColor)
+@receiver([post_save, post_delete], sender=ProductValue)
+def invalidate_price_book(sender, **kwargs):
+    # after the commit, so no price book reloads the old prices under the new version
+    transaction.on_commit(lambda: bump_namespace(PRICE_NAMESPACE))
@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app.order.models import Order, Item
+from app.product.models import Product, ProductImage
+from app.user.models import User
+
+
+class OrderHistoryQueryBudgetTest(TestCase):
+    # orders, items with their products, product covers
+    query_budget = 3
+
+    def setUp(self):
+        self.user = User.objects.create_user(phone_number='+998901234567')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        self.products = []
+        for i in range(5):
+            product = Product.objects.create(title=f'Phone {i}', price=100)
+            for side in ('cover', 'back', 'side'):
+                ProductImage.objects.create(product=product, image=f'images/product/{i}-{side}.jpg')
+            self.products.append(product)
+        self.place(1)
+
+    def place(self, count):
+        for _ in range(count):
+            order = Order.objects.create(user=self.user, receive='d', payment='cash', price=300)
+            Item.objects.bulk_create(Item(order=order, product=product, price=100) for product in self.products)
+
+    def get(self, params=None):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('order-history'), params)
+        self.assertEqual(response.status_code, 200)
+        return response, len(context.captured_queries)
+
+    def test_queries_do_not_grow_with_orders(self):
+        for enabled in (False, True):
+            with self.subTest(compiled=enabled), override_settings(COMPILED_SERIALIZERS_ENABLED=enabled):
+                _, few = self.get()
+                self.place(49)
+                page, many = self.get()
+                Order.objects.exclude(pk=Order.objects.order_by('pk').first().pk).delete()
+
+                self.assertEqual(len(page.data['results']), 20)
+                self.assertIsNotNone(page.data['next'])
+                self.assertEqual(few, many)
+                self.assertLessEqual(many, self.query_budget)
+
+    def test_items_show_the_first_image(self):
+        response, _ = self.get()
+
+        images = [item['image'] for item in response.data['results'][0]['items']]
+        self.assertEqual(images, [f'http://testserver/media/images/product/{i}-cover.jpg' for i in range(5)])
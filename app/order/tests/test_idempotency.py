@@ -0,0 +1,93 @@
+from datetime import timedelta
+from io import StringIO
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app.order.models import Order
+from app.product.models import Category, Product
+from app.user.models import User
+from app.utils.idempotency import request_fingerprint
+from app.utils.models import IdempotencyKey
+
+CREATE_URL = '/api/v1/order/create/'
+
+
+class IdempotentOrderCreationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(phone_number='+998901234567')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        product = Product.objects.create(category=Category.objects.create(name='Phones'), title='Phone', price=100)
+        self.payload = {'receive': 'd', 'payment': 'cash', 'location': {'latitude': 41.3, 'longitude': 69.2},
+                        'items': [{'product': product.pk, 'quantity': 1, 'feature': []}]}
+
+    def place(self, key='order-1', payload=None):
+        return self.client.post(CREATE_URL, payload or self.payload, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_the_first_response(self):
+        first = self.place()
+
+        with CaptureQueriesContext(connection) as context:
+            retry = self.place()
+
+        self.assertEqual((first.status_code, retry.status_code), (201, 201))
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertFalse(any(query['sql'].startswith(('INSERT', 'UPDATE')) for query in context.captured_queries
+                             if 'idempotencykey' not in query['sql']))
+
+        self.assertEqual(self.place(key='order-2').status_code, 201)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_key_reused_with_another_body(self):
+        self.place()
+
+        response = self.place(payload=dict(self.payload, payment='card'))
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_keys_are_per_user(self):
+        self.place()
+        self.client.force_authenticate(User.objects.create_user(phone_number='+998901234568'))
+
+        self.assertEqual(self.place().status_code, 201)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_rejected_requests_release_the_key(self):
+        invalid = dict(self.payload, items=[{'product': 0, 'feature': []}])
+
+        self.assertEqual(self.place(payload=invalid).status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        # the corrected cart goes through under the same key
+        self.assertEqual(self.place().status_code, 201)
+
+    @override_settings(IDEMPOTENCY_WAIT_TIMEOUT=0)
+    def test_in_flight_duplicate(self):
+        fingerprint = request_fingerprint(SimpleNamespace(method='POST', path=CREATE_URL, data=self.payload))
+        IdempotencyKey.objects.create(user=self.user, scope='order-create', key='order-1', fingerprint=fingerprint)
+
+        self.assertEqual(self.place().status_code, 409)
+
+        # a request that died in flight is taken over
+        IdempotencyKey.objects.filter(key='order-1').update(created=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(self.place().status_code, 201)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_purge_command(self):
+        self.place()
+        IdempotencyKey.objects.update(created=timezone.now() - timedelta(days=2))
+
+        call_command('purge_idempotency_keys', stdout=StringIO())
+
+        self.assertFalse(IdempotencyKey.objects.exists())
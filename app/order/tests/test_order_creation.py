@@ -0,0 +1,78 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from app.order.models import Order, ItemValue
+from app.order.purchases import has_purchased
+from app.product.models import Category, Product, ProductColor, ProductType, ProductValue
+from app.user.models import User
+from app.utils.models import Color
+
+CREATE_URL = '/api/v1/order/create/'
+
+
+class OrderCreationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(phone_number='+998901234567')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        category = Category.objects.create(name='Phones')
+        color = Color.objects.create(name='Black', image='images/color/black.png')
+        self.lines = []
+        for i in range(20):
+            product = Product.objects.create(category=category, title=f'Phone {i}', price=100)
+            product_color = ProductColor.objects.create(product=product, color=color, image='images/product/a.png',
+                                                        price=5)
+            memory = ProductType.objects.create(product=product, name='Memory')
+            value = ProductValue.objects.create(product=product, type=memory, value='256GB', price=10)
+            self.lines.append({'product': product.pk, 'color': product_color.pk, 'quantity': 2,
+                               'feature': [value.pk]})
+
+    def place(self, lines, **data):
+        payload = {'receive': 'd', 'payment': 'cash', 'location': {'latitude': 41.3, 'longitude': 69.2},
+                   'items': lines, **data}
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(CREATE_URL, payload, format='json')
+        return response, len(context.captured_queries)
+
+    def test_queries_do_not_grow_with_the_cart(self):
+        single, single_queries = self.place(self.lines[:1])
+        cart, cart_queries = self.place(self.lines)
+
+        self.assertEqual((single.status_code, cart.status_code), (201, 201))
+        self.assertEqual(single_queries, cart_queries)
+
+        order = Order.objects.get(pk=cart.data['id'])
+        self.assertEqual(order.price, Decimal('4600.00'))
+        self.assertEqual(order.phone_number, self.user.phone_number)
+        self.assertEqual(list(order.items.values_list('price', flat=True)), [Decimal('230.00')] * 20)
+        self.assertEqual(ItemValue.objects.filter(item__order=order).count(), 20)
+
+    def test_features_of_other_products_are_dropped(self):
+        line = dict(self.lines[0], feature=self.lines[0]['feature'] + self.lines[1]['feature'])
+
+        response, _ = self.place([line])
+
+        order = Order.objects.get(pk=response.data['id'])
+        self.assertEqual(order.price, Decimal('230.00'))
+        self.assertEqual(list(ItemValue.objects.filter(item__order=order).values_list('feature_id', flat=True)),
+                         self.lines[0]['feature'])
+
+    def test_unknown_product_rejects_the_whole_order(self):
+        response, _ = self.place([self.lines[0], dict(self.lines[1], product=0)])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('product', response.data['errors']['items'][1])
+        self.assertFalse(Order.objects.exists())
+
+    def test_purchased_status_syncs_purchases(self):
+        response, _ = self.place(self.lines[:1], status='s')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(has_purchased(self.user.pk, self.lines[0]['product']))
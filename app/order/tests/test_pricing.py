@@ -0,0 +1,117 @@
+import time
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app.order import pricing
+from app.order.models import Order
+from app.product.models import Category, Product, ProductColor, ProductType, ProductValue
+from app.user.models import User
+from app.utils.models import Color
+
+
+class QuoteTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        category = Category.objects.create(name='Phones')
+        color = Color.objects.create(name='Black', image='images/color/black.png')
+        self.phone = Product.objects.create(category=category, title='Phone', price=100)
+        self.case = Product.objects.create(category=category, title='Case', price=10)
+        self.black = ProductColor.objects.create(product=self.phone, color=color, image='images/product/a.png',
+                                                 price=5)
+        memory = ProductType.objects.create(product=self.phone, name='Memory')
+        self.memory = ProductValue.objects.create(product=self.phone, type=memory, value='256GB', price=20)
+        self.lines = [
+            {'product': self.phone.pk, 'color': self.black.pk, 'feature': [self.memory.pk], 'quantity': 2},
+            {'product': self.case.pk, 'feature': [self.memory.pk]},
+        ]
+
+    def quote(self, lines):
+        return self.client.post(reverse('order-quote'), {'items': lines}, format='json')
+
+    def test_quote_matches_the_order(self):
+        response = self.quote(self.lines)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['price'], '260.00')
+        self.assertEqual([item['price'] for item in response.data['items']], ['250.00', '10.00'])
+        # the feature of another product does not count
+        self.assertEqual(response.data['items'][1]['feature'], [])
+
+        user = User.objects.create_user(phone_number='+998901234567')
+        self.client.force_authenticate(user)
+        order = self.client.post('/api/v1/order/create/', {
+            'receive': 'd', 'payment': 'cash', 'location': {'latitude': 41.3, 'longitude': 69.2}, 'items': self.lines,
+        }, format='json')
+        self.assertEqual(Order.objects.get(pk=order.data['id']).price, Decimal('260.00'))
+
+    def test_warm_quotes_do_not_query(self):
+        self.quote(self.lines)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.quote(self.lines)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(context.captured_queries), 0)
+
+    def test_price_changes_invalidate_the_book(self):
+        self.quote(self.lines)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.memory.price = 30
+            self.memory.save()
+
+        self.assertEqual(self.quote(self.lines).data['price'], '280.00')
+
+    def test_writes_missed_by_this_cache_are_picked_up(self):
+        self.quote(self.lines)
+        # written by another worker: its version bump went to that worker's cache
+        Product.objects.filter(pk=self.phone.pk).update(price=200)
+        self.assertEqual(self.quote(self.lines).data['price'], '260.00')
+
+        later = time.monotonic() + pricing._price_book.max_age
+        with mock.patch.object(pricing.time, 'monotonic', return_value=later):
+            self.assertEqual(self.quote(self.lines).data['price'], '460.00')
+
+    def test_book_is_bounded(self):
+        book = pricing.PriceBook(size=1)
+
+        book.load(product_ids={self.phone.pk, 0})
+        self.assertEqual(list(book.products), [self.phone.pk])
+        book.load(product_ids={self.case.pk})
+        self.assertEqual(list(book.products), [self.case.pk])
+
+        with CaptureQueriesContext(connection) as context:
+            prices = book.load(product_ids={0})
+        # unknown ids are looked up again instead of being remembered
+        self.assertIsNone(prices.product_price(0))
+        self.assertEqual(len(context.captured_queries), 1)
+
+    def test_orders_do_not_use_the_book(self):
+        self.quote(self.lines)
+        # as seen by a worker whose cache missed the version bump
+        Product.objects.filter(pk=self.phone.pk).update(price=200)
+        ProductValue.objects.filter(pk=self.memory.pk).update(price=30)
+
+        self.client.force_authenticate(User.objects.create_user(phone_number='+998901234567'))
+        order = self.client.post('/api/v1/order/create/', {
+            'receive': 'd', 'payment': 'cash', 'location': {'latitude': 41.3, 'longitude': 69.2}, 'items': self.lines,
+        }, format='json')
+
+        self.assertEqual(Order.objects.get(pk=order.data['id']).price, Decimal('480.00'))
+
+    def test_unknown_ids(self):
+        response = self.quote([{'product': 0}, {'product': self.phone.pk, 'color': 0}])
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.data['errors']['items']
+        self.assertIn('product', errors[0])
+        self.assertIn('color', errors[1])
+        self.assertEqual(self.quote([]).status_code, 400)
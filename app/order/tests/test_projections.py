@@ -0,0 +1,39 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app.order.models import Order, Item
+from app.product.models import Product, ProductImage
+from app.user.models import User
+
+
+class OrderHistoryProjectionTest(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(phone_number='+998901234567')
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+        phone = Product.objects.create(title_en='Phone', title_ru='Телефон', price=100)
+        ProductImage.objects.create(product=phone, image='images/product/cover.jpg')
+        ProductImage.objects.create(product=phone, image='images/product/back.jpg')
+        case = Product.objects.create(title_uz="G'ilof", price=10)
+        for status in ('s', 'p'):
+            order = Order.objects.create(user=user, receive='d', payment='cash', status=status, price='110.5')
+            Item.objects.create(order=order, product=phone, price=100)
+            Item.objects.create(order=order, product=case)
+        Order.objects.create(user=user, receive='p', payment='card')
+
+    def test_history_matches_serializer(self):
+        for params in (None, {'fields': 'id,items'}, {'expand': ''}):
+            for language in ('uz', 'en', 'ru'):
+                responses = []
+                for enabled in (False, True):
+                    cache.clear()
+                    with override_settings(COMPILED_SERIALIZERS_ENABLED=enabled):
+                        responses.append(
+                            self.client.get(reverse('order-history'), params, HTTP_ACCEPT_LANGUAGE=language)
+                        )
+                serialized, compiled = responses
+                self.assertEqual(serialized.status_code, 200)
+                self.assertEqual(compiled.content, serialized.content)
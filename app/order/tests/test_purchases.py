@@ -0,0 +1,87 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app.order.models import Order, Item, PurchasedProduct
+from app.order.purchases import has_purchased
+from app.product.models import Product
+from app.user.models import User
+
+
+class PurchasedProductTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(phone_number='+998901234567')
+        self.phone = Product.objects.create(title='Phone', price=100)
+        self.case = Product.objects.create(title='Case', price=10)
+        self.order = Order.objects.create(user=self.user, receive='d', payment='cash')
+        Item.objects.create(order=self.order, product=self.phone)
+        Item.objects.create(order=self.order, product=self.case)
+
+    def set_status(self, order, status):
+        order.status = status
+        order.save()
+
+    def test_follows_order_status(self):
+        self.assertFalse(has_purchased(self.user.pk, self.phone.pk))
+
+        self.set_status(self.order, Order.OrderStatus.Success)
+        self.assertTrue(has_purchased(self.user.pk, self.phone.pk))
+        self.assertTrue(has_purchased(self.user.pk, self.case.pk))
+
+        self.set_status(self.order, Order.OrderStatus.Delivered)
+        self.assertEqual(PurchasedProduct.objects.count(), 2)
+
+        self.set_status(self.order, Order.OrderStatus.Cancelled)
+        self.assertFalse(PurchasedProduct.objects.exists())
+
+    def test_other_purchased_orders_keep_the_product(self):
+        self.set_status(self.order, Order.OrderStatus.Success)
+        other = Order.objects.create(user=self.user, receive='p', payment='card', status=Order.OrderStatus.Delivered)
+        Item.objects.create(order=other, product=self.phone)
+
+        self.order.delete()
+
+        self.assertTrue(has_purchased(self.user.pk, self.phone.pk))
+        self.assertFalse(has_purchased(self.user.pk, self.case.pk))
+
+        other.items.get().delete()
+        self.assertFalse(has_purchased(self.user.pk, self.phone.pk))
+
+    def test_lookup_is_a_single_query(self):
+        self.set_status(self.order, Order.OrderStatus.Success)
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertTrue(has_purchased(self.user.pk, self.phone.pk))
+
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn('JOIN', context.captured_queries[0]['sql'])
+
+    def test_comment_requires_purchase(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        data = {'product': self.phone.pk, 'rate': 5, 'message': 'Great'}
+
+        self.assertEqual(client.post(reverse('create-comment'), data).status_code, 400)
+        self.assertEqual(client.get(reverse('product-purchased', kwargs={'pk': self.phone.pk})).data,
+                         {'purchased': False})
+
+        self.set_status(self.order, Order.OrderStatus.Success)
+        self.assertEqual(client.post(reverse('create-comment'), data).status_code, 201)
+        self.assertEqual(client.get(reverse('product-purchased', kwargs={'pk': self.phone.pk})).data,
+                         {'purchased': True})
+
+    def test_rebuild_command(self):
+        self.set_status(self.order, Order.OrderStatus.Success)
+        PurchasedProduct.objects.all().delete()
+
+        call_command('rebuild_purchases', stdout=StringIO())
+
+        self.assertEqual(
+            set(PurchasedProduct.objects.values_list('user_id', 'product_id')),
+            {(self.user.pk, self.phone.pk), (self.user.pk, self.case.pk)}
+        )
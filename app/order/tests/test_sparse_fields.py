@@ -0,0 +1,57 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app.order.models import Order, Item
+from app.product.models import Category, Product, ProductImage
+from app.user.models import User
+from app.utils.models import Location
+
+
+class OrderSparseFieldsetTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(phone_number='+998901234567')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        category = Category.objects.create(name='Phones')
+        self.order = Order.objects.create(
+            user=self.user, location=Location.objects.create(latitude=41.3, longitude=69.2),
+            receive='d', payment='cash', price=300
+        )
+        for i in range(3):
+            product = Product.objects.create(category=category, title=f'Phone {i}', price=100)
+            ProductImage.objects.create(product=product, image=f'images/product/{i}.jpg')
+            Item.objects.create(order=self.order, product=product, price=100)
+
+    def get(self, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response, len(context.captured_queries)
+
+    def test_detail_fields(self):
+        url = reverse('order-detail', kwargs={'pk': self.order.pk})
+        full, full_queries = self.get(url)
+        sparse, sparse_queries = self.get(url, {'fields': 'id,status,price'})
+
+        self.assertEqual(len(full.data['items_detail']), 3)
+        self.assertEqual(sparse.data, {'id': self.order.pk, 'status': 'p', 'price': '300.00'})
+        self.assertLess(sparse_queries, full_queries)
+
+    def test_detail_does_not_grow_with_items(self):
+        url = reverse('order-detail', kwargs={'pk': self.order.pk})
+        _, few = self.get(url)
+
+        product = Product.objects.create(title='Case', price=10)
+        Item.objects.create(order=self.order, product=product, price=10)
+        _, many = self.get(url)
+
+        self.assertEqual(few, many)
+
+    def test_history_expand(self):
+        response, _ = self.get(reverse('order-history'), {'expand': ''})
+
+        self.assertEqual(set(response.data['results'][0]), {'id', 'status', 'price', 'created'})
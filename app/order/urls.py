@@ -1,11 +1,12 @@
 from django.urls import path
 
 from app.order.views import OrderCreateAPIView, OrderCancelAPIView, OrderHistoryAPIView, OrderDetailAPIView, \
-    AllOrderAPIView, OrderStatusAPIView
+    AllOrderAPIView, OrderStatusAPIView, OrderQuoteAPIView
 
 urlpatterns = [
     path('all/', AllOrderAPIView.as_view(), name='order-create'),
     path('create/', OrderCreateAPIView.as_view(), name='order-create'),
+    path('quote/', OrderQuoteAPIView.as_view(), name='order-quote'),
     path('<int:pk>/', OrderDetailAPIView.as_view(), name='order-detail'),
     path('status/<int:pk>/', OrderStatusAPIView.as_view(), name='order-status'),
     path('cancel/<int:pk>/', OrderCancelAPIView.as_view(), name='order-cancel'),
@@ -2,16 +2,20 @@ from django.shortcuts import render, get_object_or_404
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.generics import CreateAPIView, ListAPIView, ListCreateAPIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from app.order.serializers import OrderSerializer, OrderHistorySerializer, OrderStatusSerializer
+from app.order.pricing import quote
+from app.order.serializers import OrderSerializer, OrderHistorySerializer, OrderStatusSerializer, QuoteSerializer
 from app.order.models import Order, Item
+from app.order.projections import OrderHistoryProjection
+from app.utils.idempotency import idempotent
+from app.utils.mixins import QueryPlanMixin, ProjectionListMixin
 
 
 @extend_schema(tags=['Order'])
-class AllOrderAPIView(ListAPIView):
+class AllOrderAPIView(QueryPlanMixin, ListAPIView):
     serializer_class = OrderSerializer
     queryset = Order.objects.all()
     permission_classes = [IsAuthenticated, ]
@@ -23,17 +27,35 @@ class OrderCreateAPIView(CreateAPIView):
     queryset = Order.objects.all()
     permission_classes = [IsAuthenticated, ]
 
+    @idempotent('order-create')
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
 
+@extend_schema(tags=['Order'])
+class OrderQuoteAPIView(APIView):
+    """
+    Prices a cart from the in-process price book; a warm book answers without database queries.
+    """
+    permission_classes = [AllowAny, ]
+    serializer_class = QuoteSerializer
+
+    def post(self, request):
+        serializer = QuoteSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        return Response(QuoteSerializer(quote(serializer.validated_data['items'])).data, status=status.HTTP_200_OK)
+
+
 @extend_schema(tags=['Order'])
 class OrderDetailAPIView(APIView):
     permission_classes = [IsAuthenticated, ]
     serializer_class = OrderSerializer
 
     def get(self, request, pk):
-        order = get_object_or_404(Order, pk=pk)
+        order = get_object_or_404(OrderSerializer.setup_eager_loading(Order.objects.all(), request), pk=pk)
         serializer = OrderSerializer(order, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -104,9 +126,11 @@ class OrderStatusAPIView(APIView):
 
 
 @extend_schema(tags=['Order'])
-class OrderHistoryAPIView(ListAPIView):
+class OrderHistoryAPIView(ProjectionListMixin, QueryPlanMixin, ListAPIView):
     serializer_class = OrderHistorySerializer
+    projection_class = OrderHistoryProjection
+    queryset = Order.objects.all()
     permission_classes = [IsAuthenticated, ]
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user).order_by('-created')
+        return super().get_queryset().filter(user=self.request.user).order_by('-created')
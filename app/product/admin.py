@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db import transaction
 from modeltranslation.admin import TranslationAdmin, TranslationTabularInline
 from unfold.admin import ModelAdmin as UnfoldModelAdmin, TabularInline as UnfoldTabularInline
 
@@ -61,3 +62,21 @@ class ProductImageAdmin(UnfoldModelAdmin):
 @admin.register(Comment)
 class CommentAdmin(UnfoldModelAdmin):
     list_display = ('id', 'user', 'product', 'rate', 'is_active')
+    list_filter = ('is_active',)
+    actions = ('activate_comments', 'deactivate_comments')
+
+    @admin.action(description='Publish selected comments')
+    def activate_comments(self, request, queryset):
+        self._moderate(queryset, True)
+
+    @admin.action(description='Hide selected comments')
+    def deactivate_comments(self, request, queryset):
+        self._moderate(queryset, False)
+
+    @staticmethod
+    def _moderate(queryset, is_active):
+        # saved one by one rather than ``update()``, so the rating aggregates follow
+        with transaction.atomic():
+            for comment in queryset.select_for_update().exclude(is_active=is_active):
+                comment.is_active = is_active
+                comment.save(update_fields=['is_active'])
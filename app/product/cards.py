@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import translation
+
+from app.product.models import Product, ProductCard
+from app.product.serializers import AllProductSerializer
+
+# where the product listing orderings (see ``app.product.filters``) live when listing cards
+CARD_ORDERING_COLUMNS = {
+    'price': 'product__price', 'discount': 'product__discount', 'rating': 'product__rating', 'id': 'product_id',
+}
+
+
+class CardRequest:
+    """
+    Stand-in for the request while cards are built outside of one: carries the language and keeps media
+    URLs relative, they are made absolute when a card is served.
+    """
+
+    def __init__(self, language):
+        self.LANGUAGE_CODE = language
+
+    def build_absolute_uri(self, location=None):
+        return location
+
+
+def build_card_data(product, language):
+    with translation.override(language):
+        return AllProductSerializer(product, context={'request': CardRequest(language)}).data
+
+
+def rebuild_product_cards(product_ids):
+    product_ids = set(product_ids)
+    if not product_ids:
+        return
+
+    products = AllProductSerializer.setup_eager_loading(
+        Product.objects.filter(pk__in=product_ids, is_active=True)
+    )
+    cards = [
+        ProductCard(
+            product=product,
+            category_id=product.category_id,
+            language=language,
+            data=build_card_data(product, language),
+            created=product.created,
+        )
+        for product in products
+        for language, _ in settings.LANGUAGES
+    ]
+    with transaction.atomic():
+        ProductCard.objects.filter(product_id__in=product_ids).delete()
+        ProductCard.objects.bulk_create(cards)
+
+
+def serve_card(data, request):
+    origin = request.build_absolute_uri('/')[:-1]
+    for image in data['images']:
+        if image['image'] and image['image'].startswith('/'):
+            image['image'] = origin + image['image']
+        for entry in image.get('srcset', {}).values():
+            for key, value in entry.items():
+                if isinstance(value, str) and value.startswith('/'):
+                    entry[key] = origin + value
+    return data
@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import translation
+from django.utils.text import slugify
+
+from app.product.models import Product, ProductFacet, FacetCount
+
+COLOR_FACET = 'color'
+
+
+def facet_key(name, value):
+    return f"{slugify(name, allow_unicode=True)}:{slugify(value, allow_unicode=True)}"
+
+
+def color_facet_key(color):
+    with translation.override(settings.MODELTRANSLATION_DEFAULT_LANGUAGE):
+        return facet_key(COLOR_FACET, color.name)
+
+
+def product_facet_keys(product):
+    with translation.override(settings.MODELTRANSLATION_DEFAULT_LANGUAGE):
+        keys = {facet_key(value.type.name, value.value) for value in product.values.select_related('type')}
+        keys.update(
+            facet_key(COLOR_FACET, product_color.color.name)
+            for product_color in product.colors.select_related('color') if product_color.color
+        )
+    return keys
+
+
+def sync_product_facets(product_id, clear=False):
+    """
+    Brings the postings of one product in line with its features and colors, adjusting the per-category
+    counts by the difference only.
+    """
+    product = None if clear else Product.objects.filter(pk=product_id).first()
+    if product is not None and product.is_active:
+        wanted = {(key, product.category_id) for key in product_facet_keys(product)}
+    else:
+        wanted = set()
+
+    with transaction.atomic():
+        current = set(
+            ProductFacet.objects.select_for_update().filter(product_id=product_id).values_list('key', 'category_id')
+        )
+        removed = current - wanted
+        added = wanted - current
+        if removed:
+            ProductFacet.objects.filter(product_id=product_id, key__in={key for key, _ in removed}).delete()
+        if added:
+            ProductFacet.objects.bulk_create(
+                ProductFacet(key=key, product_id=product_id, category_id=category_id) for key, category_id in added
+            )
+        for key, category_id in removed:
+            _adjust_count(category_id, key, -1)
+        for key, category_id in added:
+            _adjust_count(category_id, key, 1)
+
+
+def _adjust_count(category_id, key, delta):
+    updated = FacetCount.objects.filter(category_id=category_id, key=key).update(count=F('count') + delta)
+    if not updated and delta > 0:
+        FacetCount.objects.create(category_id=category_id, key=key, count=delta)
+
+
+def rebuild_facet_counts():
+    rows = ProductFacet.objects.values('category_id', 'key').annotate(total=Count('id')).order_by()
+    with transaction.atomic():
+        FacetCount.objects.all().delete()
+        FacetCount.objects.bulk_create(
+            FacetCount(category_id=row['category_id'], key=row['key'], count=row['total']) for row in rows
+        )
+
+
+def filter_by_facets(queryset, keys, product_field='pk'):
+    """
+    Narrows ``queryset`` to products carrying every facet in ``keys``; each facet adds one posting list
+    lookup to intersect.
+    """
+    for key in set(keys):
+        postings = ProductFacet.objects.filter(key=key).values('product_id')
+        queryset = queryset.filter(**{f'{product_field}__in': postings})
+    return queryset
+
+
+def get_facet_counts(category_id=None):
+    counts = FacetCount.objects.filter(count__gt=0)
+    if category_id is not None:
+        counts = counts.filter(category_id=category_id).values_list('key', 'count')
+    else:
+        counts = counts.values('key').annotate(total=Sum('count')).values_list('key', 'total')
+    return sorted(counts.order_by())
@@ -0,0 +1,51 @@
+from decimal import Decimal, InvalidOperation
+
+from rest_framework.exceptions import ValidationError
+
+ORDERING_PARAM = 'ordering'
+DEFAULT_ORDERING = '-created'
+# ``ordering`` values accepted by the product listings, each backed by a ``([category,] <field>, id)``
+# index on the product table
+ORDERING_FIELDS = ('created', 'price', 'discount', 'rating')
+
+
+def get_product_ordering(request, columns=None):
+    """
+    Keyset of the product listing for ``?ordering=`` (``price``, ``-price``, ``created``, ``discount``,
+    ``-rating``, ...), with the product id as tie-breaker. ``columns`` maps the field names onto another model
+    listing products, e.g. ``{'price': 'product__price', 'id': 'product_id'}`` for product cards. Unknown
+    values fall back to newest first.
+    """
+    columns = columns or {}
+    ordering = request.GET.get(ORDERING_PARAM, DEFAULT_ORDERING)
+    if ordering.lstrip('-') not in ORDERING_FIELDS:
+        ordering = DEFAULT_ORDERING
+    sign = '-' if ordering.startswith('-') else ''
+    field = ordering.lstrip('-')
+    return f'{sign}{columns.get(field, field)}', f'{sign}{columns.get("id", "id")}'
+
+
+def parse_price(request, name):
+    value = request.GET.get(name)
+    if not value:
+        return None
+    try:
+        price = Decimal(value)
+    except InvalidOperation:
+        raise ValidationError({name: 'A valid number is required.'})
+    if not price.is_finite() or price < 0:
+        raise ValidationError({name: 'A valid number is required.'})
+    return price
+
+
+def filter_by_price(queryset, request, price_field='price'):
+    """
+    Applies the ``?min_price=`` / ``?max_price=`` range, both ends inclusive.
+    """
+    min_price = parse_price(request, 'min_price')
+    max_price = parse_price(request, 'max_price')
+    if min_price is not None:
+        queryset = queryset.filter(**{f'{price_field}__gte': min_price})
+    if max_price is not None:
+        queryset = queryset.filter(**{f'{price_field}__lte': max_price})
+    return queryset
@@ -0,0 +1,103 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from app.product.models import Category, Product
+
+
+class Command(BaseCommand):
+    help = ('Compares seek (keyset) and OFFSET pagination of the product listing orderings and price ranges on '
+            'generated products. Everything runs in a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=100_000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--depth', type=int, default=2_000, help='Page number of the deep page')
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--explain', action='store_true', help='Print the query plans of the seek queries')
+
+    def handle(self, *args, **options):
+        self.runs = options['runs']
+        page_size = options['page_size']
+        offset = (options['depth'] - 1) * page_size
+
+        with transaction.atomic():
+            categories = self.generate(options['products'], options['categories'])
+            category = categories[0]
+            active = Product.objects.filter(is_active=True)
+            in_range = active.filter(category=category, price__gte=Decimal('100'), price__lte=Decimal('5000'))
+
+            cases = [
+                ('newest', active, ('-created', '-id')),
+                ('price ascending', active, ('price', 'id')),
+                ('biggest discount', active, ('-discount', '-id')),
+                ('category price range', in_range, ('price', 'id')),
+            ]
+            for label, queryset, ordering in cases:
+                queryset = queryset.order_by(*ordering)
+                # the deep page, or the middle of smaller result sets
+                skip = max(1, min(offset, queryset.count() // 2))
+                last = queryset.values(*[name.lstrip('-') for name in ordering])[skip - 1:skip].first()
+                if last is None:
+                    self.stdout.write(f'{label}: no rows, skipped')
+                    continue
+                seek = queryset.filter(self.seek(ordering, last))[:page_size]
+                offset_page = queryset[skip:skip + page_size]
+
+                self.stdout.write(
+                    f'{label}: seek {self.measure(seek):.2f} ms, '
+                    f'offset {self.measure(offset_page):.2f} ms (row {skip})'
+                )
+                if options['explain']:
+                    self.stdout.write(seek.explain())
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished, generated rows rolled back'))
+
+    def generate(self, count, category_count):
+        categories = [Category.objects.create(name=f'Benchmark {i}') for i in range(category_count)]
+        now = timezone.now()
+        rng = random.Random(0)
+        products = []
+        for i in range(count):
+            price = Decimal(rng.randint(1_000, 1_000_000)) / 100
+            products.append(Product(
+                category=categories[i % category_count],
+                title=f'Benchmark product {i}',
+                price=price,
+                old_price=price + rng.randint(0, 500) if rng.random() < 0.3 else None,
+                is_active=rng.random() < 0.95,
+                created=now - timedelta(minutes=rng.randint(0, 525_600)),
+            ))
+        Product.objects.bulk_create(products, batch_size=1_000)
+        return categories
+
+    @staticmethod
+    def seek(ordering, position):
+        condition = Q()
+        for index, name in enumerate(ordering):
+            field = name.lstrip('-')
+            clause = Q(**{f'{field}__{"lt" if name.startswith("-") else "gt"}': position[field]})
+            for previous in ordering[:index]:
+                clause &= Q(**{previous.lstrip('-'): position[previous.lstrip('-')]})
+            condition |= clause
+        leading = ordering[0].lstrip('-')
+        bound = Q(**{f'{leading}__{"lte" if ordering[0].startswith("-") else "gte"}': position[leading]})
+        return bound & condition
+
+    def measure(self, queryset):
+        timings = []
+        for _ in range(self.runs):
+            start = time.perf_counter()
+            list(queryset.values_list('id', flat=True))
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,107 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+from app.order.models import Order, Item
+from app.order.projections import OrderHistoryProjection
+from app.order.serializers import OrderHistorySerializer
+from app.product.models import Category, Product, ProductImage, ProductType, ProductValue, Comment
+from app.product.projections import ProductListProjection, CommentProjection
+from app.product.serializers import AllProductSerializer, CommentSerializer
+from app.user.models import User
+
+
+class Command(BaseCommand):
+    help = ('Compares the throughput of the DRF serializers and their compiled projections on generated rows. '
+            'Everything runs in a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10_000)
+        parser.add_argument('--page-size', type=int, default=100, help='Rows serialized per query, as in a page')
+        parser.add_argument('--runs', type=int, default=3)
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        request = Request(RequestFactory().get('/'))
+        request.LANGUAGE_CODE = settings.LANGUAGE_CODE
+
+        with transaction.atomic():
+            products, comments, orders = self.generate(rows)
+            cases = [
+                ('products', AllProductSerializer, ProductListProjection, products),
+                ('comments', CommentSerializer, CommentProjection, comments),
+                ('order history', OrderHistorySerializer, OrderHistoryProjection, orders),
+            ]
+            for label, serializer_class, projection_class, queryset in cases:
+                ids = list(queryset.values_list('id', flat=True))
+                pages = [
+                    queryset.filter(pk__in=ids[start:start + options['page_size']])
+                    for start in range(0, len(ids), options['page_size'])
+                ]
+                serialized = self.measure(options['runs'], pages, lambda page: serializer_class(
+                    serializer_class.setup_eager_loading(page), many=True, context={'request': request}
+                ).data)
+                compiled = self.measure(
+                    options['runs'], pages, lambda page: self.project(projection_class, request, page)
+                )
+                self.stdout.write(
+                    f'{label}: serializer {serialized:.0f} ms, compiled {compiled:.0f} ms per {rows} rows '
+                    f'({rows / serialized * 1000:.0f} vs {rows / compiled * 1000:.0f} rows/s)'
+                )
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished, generated rows rolled back'))
+
+    def generate(self, count):
+        category = Category.objects.create(name='Benchmark')
+        user = User.objects.create_user(phone_number='+998900000000', full_name='Benchmark')
+        products = Product.objects.bulk_create(
+            Product(category=category, title_en=f'Product {i}', title_uz=f'Mahsulot {i}', description_en='Text',
+                    price=100 + i, old_price=200 + i)
+            for i in range(count)
+        )
+        ProductImage.objects.bulk_create(
+            ProductImage(product=product, image=f'images/product/{product.pk}-{n}.jpg')
+            for product in products for n in range(2)
+        )
+        types = ProductType.objects.bulk_create(
+            ProductType(product=product, name_en='Memory') for product in products
+        )
+        ProductValue.objects.bulk_create(
+            ProductValue(product=memory.product, type=memory, value=value, price=10)
+            for memory in types for value in ('128GB', '256GB')
+        )
+        Comment.objects.bulk_create(
+            Comment(user=user, product=products[0], rate=5, message='Great', is_active=True) for _ in range(count)
+        )
+        orders = Order.objects.bulk_create(
+            Order(user=user, receive='d', payment='cash', price=100) for _ in range(count)
+        )
+        Item.objects.bulk_create(
+            Item(order=order, product=products[i], price=100) for i, order in enumerate(orders)
+        )
+
+        return (
+            Product.objects.filter(category=category).order_by('-created', '-id'),
+            Comment.objects.filter(product=products[0]).order_by('-created', '-id'),
+            Order.objects.filter(user=user).order_by('-created', '-id'),
+        )
+
+    @staticmethod
+    def project(projection_class, request, queryset):
+        projection = projection_class(request)
+        return projection.serialize(projection.get_rows(queryset))
+
+    @staticmethod
+    def measure(runs, pages, serialize):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            for page in pages:
+                serialize(page)
+            timings.append((time.perf_counter() - start) * 1000)
+        return min(timings)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from app.product.facets import sync_product_facets, rebuild_facet_counts
+from app.product.models import Product, ProductFacet
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the facet postings of every product and recomputes the facet counts'
+
+    def handle(self, *args, **options):
+        product_ids = set(Product.objects.values_list('id', flat=True))
+        product_ids.update(ProductFacet.objects.values_list('product_id', flat=True))
+        for product_id in product_ids:
+            sync_product_facets(product_id)
+        rebuild_facet_counts()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt facets for {len(product_ids)} products'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from app.product.cards import rebuild_product_cards
+from app.product.models import Product, ProductCard
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the denormalized product cards of every active product'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        ProductCard.objects.filter(product__is_active=False).delete()
+
+        product_ids = list(Product.objects.filter(is_active=True).order_by('id').values_list('id', flat=True))
+        for start in range(0, len(product_ids), batch_size):
+            rebuild_product_cards(product_ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt cards for {len(product_ids)} products'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from app.product.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text product search index'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt the search index with {type(backend).__name__}'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from app.product.cards import rebuild_product_cards
+from app.product.ratings import reconcile_ratings
+from app.utils.cache import bump_namespace
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the rating count, sum and histogram of every product from its active comments'
+
+    def handle(self, *args, **options):
+        drifted = reconcile_ratings()
+        if drifted:
+            bump_namespace('product')
+            rebuild_product_cards(drifted)
+        self.stdout.write(self.style.SUCCESS(f'Reconciled ratings, {len(drifted)} products corrected'))
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['product', 'is_active', 'created', 'id'], name='comment_product_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['is_active', 'created', 'id'], name='product_active_created_idx'),
+        ),
+    ]
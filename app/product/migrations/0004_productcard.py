@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0003_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductCard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=10)),
+                ('data', models.JSONField()),
+                ('created', models.DateTimeField()),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='product.category')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cards', to='product.product')),
+            ],
+            options={
+                'verbose_name': 'Product card',
+                'verbose_name_plural': 'Product cards',
+                'db_table': 'productcard',
+                'indexes': [models.Index(fields=['language', 'created', 'product'], name='productcard_language_idx'), models.Index(fields=['language', 'category', 'created', 'product'], name='productcard_category_idx')],
+                'constraints': [models.UniqueConstraint(fields=('product', 'language'), name='productcard_product_language_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations
+
+SEARCH_FIELDS = ('title_uz', 'title_en', 'title_ru', 'description_uz', 'description_en', 'description_ru')
+
+
+def create_search_index(apps, schema_editor):
+    columns = ', '.join(SEARCH_FIELDS)
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE product_search USING fts5({columns}, tokenize='unicode61 remove_diacritics 2')"
+        )
+        coalesced = ', '.join(f"COALESCE({field}, '')" for field in SEARCH_FIELDS)
+        schema_editor.execute(
+            f"INSERT INTO product_search (rowid, {columns}) SELECT id, {coalesced} FROM product WHERE is_active"
+        )
+    elif vendor == 'mysql':
+        schema_editor.execute(f"ALTER TABLE product ADD FULLTEXT INDEX product_fulltext_idx ({columns})")
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE product_search")
+    elif vendor == 'mysql':
+        schema_editor.execute("ALTER TABLE product DROP INDEX product_fulltext_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0004_productcard'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0005_product_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=150)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='product.category')),
+            ],
+            options={
+                'db_table': 'facetcount',
+                'constraints': [models.UniqueConstraint(fields=('category', 'key'), name='facetcount_category_key_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=150)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='product.category')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='facets', to='product.product')),
+            ],
+            options={
+                'db_table': 'productfacet',
+                'constraints': [models.UniqueConstraint(fields=('key', 'product'), name='productfacet_key_product_uniq')],
+            },
+        ),
+    ]
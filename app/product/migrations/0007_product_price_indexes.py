@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:56
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0006_product_facets'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='product',
+            name='product_active_created_idx',
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='discount',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(old_price__gt=models.F('price'), then=django.db.models.expressions.CombinedExpression(models.F('old_price'), '-', models.F('price'))), default=models.Value(0), output_field=models.DecimalField(decimal_places=2, max_digits=9)), output_field=models.DecimalField(decimal_places=2, max_digits=9)),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['created', 'id'], name='product_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['price', 'id'], name='product_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['discount', 'id'], name='product_discount_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'created', 'id'], name='product_category_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'price', 'id'], name='product_category_price_idx'),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:24
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+import django.db.models.functions.math
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_ratings(apps, schema_editor):
+    Comment = apps.get_model('product', 'Comment')
+    Product = apps.get_model('product', 'Product')
+
+    aggregates = {}
+    rows = Comment.objects.filter(is_active=True).values_list('product_id', 'rate').annotate(total=Count('id'))
+    for product_id, rate, total in rows.order_by():
+        fields = aggregates.setdefault(product_id, {'rating_count': 0, 'rating_sum': 0})
+        fields['rating_count'] += total
+        fields['rating_sum'] += rate * total
+        fields[f'rating_{rate}'] = total
+    for product_id, fields in aggregates.items():
+        Product.objects.filter(pk=product_id).update(**fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0007_product_price_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_0',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_1',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_2',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_3',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_4',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating_5',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='rating',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(rating_count__gt=0, then=django.db.models.functions.math.Round(django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast('rating_sum', models.FloatField()), '/', models.F('rating_count')), 2)), default=models.Value(0), output_field=models.DecimalField(decimal_places=2, max_digits=3)), output_field=models.DecimalField(decimal_places=2, max_digits=3)),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['rating', 'id'], name='product_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'rating', 'id'], name='product_category_rating_idx'),
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:30
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def fill_slugs(apps, schema_editor):
+    Product = apps.get_model('product', 'Product')
+
+    taken = set()
+    products = Product.objects.order_by('pk').only('pk', 'title')
+    for product in products.iterator():
+        base = slugify(product.title)[:110].strip('-') or 'product'
+        slug, suffix = base, 0
+        while slug in taken:
+            suffix += 1
+            slug = f'{base}-{suffix}'
+        taken.add(slug)
+        Product.objects.filter(pk=product.pk).update(slug=slug)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0008_product_ratings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=120, null=True),
+        ),
+        migrations.RunPython(fill_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='product',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=120, null=True, unique=True),
+        ),
+    ]
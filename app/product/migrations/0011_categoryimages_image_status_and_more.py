@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product', '0010_categoryimages_renditions_productcolor_renditions_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='categoryimages',
+            name='image_status',
+            field=models.CharField(choices=[('r', 'ready'), ('p', 'processing'), ('f', 'failed')], default='r', editable=False, max_length=1),
+        ),
+        migrations.AddField(
+            model_name='productcolor',
+            name='image_status',
+            field=models.CharField(choices=[('r', 'ready'), ('p', 'processing'), ('f', 'failed')], default='r', editable=False, max_length=1),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='image_status',
+            field=models.CharField(choices=[('r', 'ready'), ('p', 'processing'), ('f', 'failed')], default='r', editable=False, max_length=1),
+        ),
+    ]
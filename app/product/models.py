@@ -1,11 +1,14 @@
 from django.core.validators import FileExtensionValidator, MinValueValidator, MaxValueValidator
 from django.db import models
+from django.db.models import F, Q, Window
+from django.db.models.functions import Cast, Round, RowNumber
 from django.utils import timezone
-from django.utils.text import slugify
 
 from app.user.models import User
 from app.user.validations import check_image_size
+from app.utils.images import ImageStatus
 from app.utils.models import Color
+from app.utils.slugs import save_with_slug
 
 
 class Category(models.Model):
@@ -23,15 +26,7 @@ class Category(models.Model):
     created = models.DateTimeField(default=timezone.now)
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.name)
-            unique_slug = base_slug
-            num = 1
-            while Category.objects.filter(slug=unique_slug).exclude(pk=self.pk).exists():
-                unique_slug = f"{base_slug}-{num}"
-                num += 1
-            self.slug = unique_slug
-        super().save(*args, **kwargs)
+        save_with_slug(self, self.name, lambda: super(Category, self).save(*args, **kwargs))
 
     def __str__(self):
         return str(self.name)
@@ -42,15 +37,74 @@ class Category(models.Model):
         verbose_name_plural = 'Categories'
 
 
+# single-segment paths of app.product.urls, declared before the ``<slug>/`` route and shadowing those slugs
+RESERVED_PRODUCT_SLUGS = (
+    'all', 'search', 'facets', 'create', 'create-images', 'create-features', 'create-color',
+    'create-product-colors', 'create-product-type', 'categories',
+)
+
+
+# maintained by ``app.product.ratings`` and never written by ``Product.save`` once the row exists
+RATING_FIELDS = ('rating_count', 'rating_sum', *(f'rating_{rate}' for rate in range(6)))
+
+
 class Product(models.Model):
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='products')
 
     title = models.CharField(max_length=100)
+    # null rather than empty until allocated, e.g. for rows of ``bulk_create``, which skips ``save``
+    slug = models.SlugField(max_length=120, unique=True, null=True, blank=True)
     description = models.TextField(null=True, blank=True)
     price = models.DecimalField(decimal_places=2, max_digits=9)
     old_price = models.DecimalField(decimal_places=2, max_digits=9, null=True, blank=True)
+    discount = models.GeneratedField(
+        expression=models.Case(
+            models.When(old_price__gt=models.F('price'), then=models.F('old_price') - models.F('price')),
+            default=models.Value(0),
+            output_field=models.DecimalField(decimal_places=2, max_digits=9),
+        ),
+        output_field=models.DecimalField(decimal_places=2, max_digits=9),
+        db_persist=True,
+    )
     is_active = models.BooleanField(default=True)
     created = models.DateTimeField(default=timezone.now)
+    # aggregates of the active comments, kept up to date by ``app.product.ratings``: their number, the sum of
+    # their rates and a histogram bucket per rate
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_0 = models.PositiveIntegerField(default=0, editable=False)
+    rating_1 = models.PositiveIntegerField(default=0, editable=False)
+    rating_2 = models.PositiveIntegerField(default=0, editable=False)
+    rating_3 = models.PositiveIntegerField(default=0, editable=False)
+    rating_4 = models.PositiveIntegerField(default=0, editable=False)
+    rating_5 = models.PositiveIntegerField(default=0, editable=False)
+    rating = models.GeneratedField(
+        expression=models.Case(
+            models.When(
+                rating_count__gt=0,
+                then=Round(Cast('rating_sum', models.FloatField()) / models.F('rating_count'), 2),
+            ),
+            default=models.Value(0),
+            output_field=models.DecimalField(decimal_places=2, max_digits=3),
+        ),
+        output_field=models.DecimalField(decimal_places=2, max_digits=3),
+        db_persist=True,
+    )
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not kwargs.get('force_insert'):
+            # the aggregates only move through relative updates; writing back the loaded values would undo
+            # ratings added since
+            update_fields = kwargs.get('update_fields')
+            if update_fields is None:
+                deferred = self.get_deferred_fields()
+                update_fields = [
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key and not field.generated and field.attname not in deferred
+                ]
+            kwargs['update_fields'] = [field for field in update_fields if field not in RATING_FIELDS]
+        save_with_slug(self, self.title, lambda: super(Product, self).save(*args, **kwargs),
+                       reserved=RESERVED_PRODUCT_SLUGS)
 
     def __str__(self):
         return str(self.title)
@@ -59,6 +113,32 @@ class Product(models.Model):
         db_table = 'product'
         verbose_name = 'Product'
         verbose_name_plural = 'Products'
+        indexes = [
+            # ``is_active=True`` compiles to a bare boolean predicate rather than an equality, which planners do
+            # not match against a leading ``is_active`` column, so listing keys start with the ordering column
+            models.Index(fields=['created', 'id'], name='product_created_idx'),
+            models.Index(fields=['price', 'id'], name='product_price_idx'),
+            models.Index(fields=['discount', 'id'], name='product_discount_idx'),
+            models.Index(fields=['category', 'created', 'id'], name='product_category_created_idx'),
+            models.Index(fields=['category', 'price', 'id'], name='product_category_price_idx'),
+            models.Index(fields=['rating', 'id'], name='product_rating_idx'),
+            models.Index(fields=['category', 'rating', 'id'], name='product_category_rating_idx'),
+            # the partial indexes hold active products only, so the default listing and category pages skip
+            # inactive rows without reading them. MySQL ignores ``condition`` and relies on the indexes above
+            models.Index(fields=['created', 'id'], condition=Q(is_active=True), name='product_active_created_idx'),
+            models.Index(fields=['category', 'created', 'id'], condition=Q(is_active=True),
+                         name='product_active_category_idx'),
+        ]
+
+
+class ProductImageQuerySet(models.QuerySet):
+    def covers(self):
+        """
+        The first image of every product, numbered in the database so a product's other images are not loaded.
+        """
+        return self.alias(
+            position=Window(RowNumber(), partition_by=F('product_id'), order_by=F('id').asc())
+        ).filter(position=1)
 
 
 class ProductImage(models.Model):
@@ -67,6 +147,11 @@ class ProductImage(models.Model):
         check_image_size])
 
     product = models.ForeignKey(Product, on_delete=models.CASCADE)
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+    image_status = models.CharField(max_length=1, choices=ImageStatus.choices, default=ImageStatus.ready,
+                                    editable=False)
+
+    objects = ProductImageQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.product} | {self.id}"
@@ -85,6 +170,9 @@ class ProductColor(models.Model):
         FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'svg', 'webp', 'heic', 'heif']),
         check_image_size])
     price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+    image_status = models.CharField(max_length=1, choices=ImageStatus.choices, default=ImageStatus.ready,
+                                    editable=False)
 
     def __str__(self):
         return f"{self.product} | {self.color}, {self.price}"
@@ -138,6 +226,71 @@ class Comment(models.Model):
 
     class Meta:
         db_table = 'comment'
+        indexes = [
+            models.Index(fields=['product', 'is_active', 'created', 'id'], name='comment_product_created_idx'),
+        ]
+
+
+class ProductCard(models.Model):
+    """
+    Denormalized, per-language listing representation of an active product, rebuilt whenever the product
+    or one of its relations changes (see ``app.product.cards``).
+    """
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='cards')
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    language = models.CharField(max_length=10)
+    data = models.JSONField()
+    created = models.DateTimeField()
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.product_id} | {self.language}"
+
+    class Meta:
+        db_table = 'productcard'
+        verbose_name = 'Product card'
+        verbose_name_plural = 'Product cards'
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'language'], name='productcard_product_language_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['language', 'created', 'product'], name='productcard_language_idx'),
+            models.Index(fields=['language', 'category', 'created', 'product'], name='productcard_category_idx'),
+        ]
+
+
+class ProductFacet(models.Model):
+    """
+    Posting list entry of the facet index: active ``product`` has the normalized ``key``,
+    ``<type>:<value>`` for features and ``color:<name>`` for colors (see ``app.product.facets``).
+    """
+    key = models.CharField(max_length=150)
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='facets')
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+
+    def __str__(self):
+        return f"{self.key} | {self.product_id}"
+
+    class Meta:
+        db_table = 'productfacet'
+        constraints = [
+            models.UniqueConstraint(fields=['key', 'product'], name='productfacet_key_product_uniq'),
+        ]
+
+
+class FacetCount(models.Model):
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    key = models.CharField(max_length=150)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.category_id} | {self.key}: {self.count}"
+
+    class Meta:
+        db_table = 'facetcount'
+        constraints = [
+            models.UniqueConstraint(fields=['category', 'key'], name='facetcount_category_key_uniq'),
+        ]
 
 
 class CategoryImages(models.Model):
@@ -145,6 +298,9 @@ class CategoryImages(models.Model):
     image = models.ImageField(upload_to='images/category/', validators=[
         FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'svg', 'webp', 'heic', 'heif', 'avif']),
         check_image_size])
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+    image_status = models.CharField(max_length=1, choices=ImageStatus.choices, default=ImageStatus.ready,
+                                    editable=False)
 
     def __str__(self):
         return str(self.category)
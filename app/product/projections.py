@@ -0,0 +1,143 @@
+from django.conf import settings
+
+from app.product.models import Product, ProductColor, ProductImage, ProductValue, ProductType
+from app.product.serializers import AllProductSerializer, CategoryProductSerializer, CommentSerializer
+from app.utils.images import get_srcset
+from app.utils.models import Color
+from app.utils.projections import Projection, column, decimal_formatter, datetime_formatter, translator, \
+    translated_columns, group_by
+
+LANGUAGE_CODES = {code for code, _ in settings.LANGUAGES}
+
+
+class ProductListProjection(Projection):
+    """
+    Compiled ``AllProductSerializer``.
+    """
+    serializer_class = AllProductSerializer
+    format_value_price = staticmethod(decimal_formatter(ProductValue, 'price'))
+
+    def get_fields(self):
+        self.type_name = translator(ProductType, 'name', 'type__')
+        return [
+            ('id', ('id',), column('id')),
+            ('slug', ('slug',), column('slug')),
+            ('title', translated_columns('title'), self.localized('title')),
+            ('title_uz', ('title_uz',), column('title_uz')),
+            ('title_en', ('title_en',), column('title_en')),
+            ('title_ru', ('title_ru',), column('title_ru')),
+            ('description', translated_columns('description'), self.localized('description')),
+            ('description_uz', ('description_uz',), column('description_uz')),
+            ('description_en', ('description_en',), column('description_en')),
+            ('description_ru', ('description_ru',), column('description_ru')),
+            ('price', ('price',), column('price', decimal_formatter(Product, 'price'))),
+            ('old_price', ('old_price',), column('old_price', decimal_formatter(Product, 'old_price'))),
+            ('rating', ('rating',), column('rating', decimal_formatter(Product, 'rating'))),
+            ('rating_count', ('rating_count',), column('rating_count')),
+            ('images', (), self.get_images),
+            ('features', (), self.get_features),
+            ('category', ('category__slug',), column('category__slug')),
+        ]
+
+    def localized(self, field_name):
+        # AllProductSerializer reads the raw column of the request language
+        if self.language in LANGUAGE_CODES:
+            return column(f'{field_name}_{self.language}')
+        read = translator(Product, field_name)
+        return lambda row, related: read(row)
+
+    def load_related(self, rows):
+        product_ids = [row['id'] for row in rows]
+        related = {}
+        if self.wants('images'):
+            images = ProductImage.objects.filter(product_id__in=product_ids).order_by('pk') \
+                .values('product_id', 'image', 'image_status', 'renditions')
+            related['images'] = group_by(images, 'product_id')
+        if self.wants('features'):
+            values = ProductValue.objects.filter(product_id__in=product_ids).order_by('pk').values(
+                'id', 'product_id', 'type_id', 'value', 'price', *translated_columns('name', 'type__')
+            )
+            related['features'] = group_by(values, 'product_id')
+        return related
+
+    def get_images(self, row, related):
+        return [
+            {
+                'image': self.media_url(image['image']),
+                'image_status': image['image_status'],
+                'product': row['id'],
+                'srcset': get_srcset(image['renditions'], image['image'], self.media_url),
+            }
+            for image in related['images'].get(row['id'], ())
+        ]
+
+    def get_features(self, row, related):
+        return [
+            {
+                'id': value['id'],
+                'product': row['id'],
+                'type': value['type_id'],
+                'value': value['value'],
+                'price': self.format_value_price(value['price']),
+                'type_name': self.type_name(value),
+            }
+            for value in related['features'].get(row['id'], ())
+        ]
+
+
+class CategoryProductProjection(ProductListProjection):
+    """
+    Compiled ``CategoryProductSerializer``.
+    """
+    serializer_class = CategoryProductSerializer
+    format_color_price = staticmethod(decimal_formatter(ProductColor, 'price'))
+
+    def get_fields(self):
+        self.color_name = translator(Color, 'name', 'color__')
+        fields = super().get_fields()
+        # after ``features``, before ``category`` which the serializer adds last
+        fields.insert(-1, ('colors', (), self.get_colors))
+        return fields
+
+    def load_related(self, rows):
+        related = super().load_related(rows)
+        if self.wants('colors'):
+            colors = ProductColor.objects.filter(product_id__in=[row['id'] for row in rows]).order_by('pk').values(
+                'id', 'product_id', 'color_id', 'image', 'image_status', 'price', 'renditions', 'color__image',
+                *translated_columns('name', 'color__')
+            )
+            related['colors'] = group_by(colors, 'product_id')
+        return related
+
+    def get_colors(self, row, related):
+        return [
+            {
+                'id': color['id'],
+                'product': row['id'],
+                'color': color['color_id'],
+                'image': self.media_url(color['image']),
+                'image_status': color['image_status'],
+                'price': self.format_color_price(color['price']),
+                'srcset': get_srcset(color['renditions'], color['image'], self.media_url),
+                'name': self.color_name(color) if color['color_id'] else None,
+                'color_image': self.media_url(color['color__image']) if color['color_id'] else None,
+            }
+            for color in related['colors'].get(row['id'], ())
+        ]
+
+
+class CommentProjection(Projection):
+    """
+    Compiled ``CommentSerializer``.
+    """
+    serializer_class = CommentSerializer
+
+    def get_fields(self):
+        return [
+            ('id', ('id',), column('id')),
+            ('rate', ('rate',), column('rate')),
+            ('message', ('message',), column('message')),
+            ('created', ('created',), column('created', datetime_formatter())),
+            ('user', ('user__full_name',), column('user__full_name')),
+            ('image', ('user__image',), lambda row, related: self.media_url(row['user__image'])),
+        ]
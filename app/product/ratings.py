@@ -0,0 +1,77 @@
+from django.db import transaction
+from django.db.models import Count, F
+
+from app.product.models import Comment, Product
+
+RATES = range(0, 6)
+HISTOGRAM_FIELDS = tuple(f'rating_{rate}' for rate in RATES)
+
+
+def comment_rating(product_id, rate, is_active):
+    """
+    What a comment adds to the aggregates: its ``(product_id, rate)`` while active, nothing otherwise.
+    """
+    return (product_id, rate) if is_active else None
+
+
+def stored_comment_rating(comment_id):
+    row = Comment.objects.filter(pk=comment_id).values_list('product_id', 'rate', 'is_active').first()
+    return comment_rating(*row) if row else None
+
+
+def apply_rating_change(before, after):
+    """
+    Moves one comment's contribution from ``before`` to ``after`` (see ``comment_rating``). Each side is a
+    single relative ``UPDATE`` of the product row, so concurrent changes never overwrite each other.
+    """
+    if before == after:
+        return
+    with transaction.atomic():
+        if before is not None:
+            _adjust(*before, -1)
+        if after is not None:
+            _adjust(*after, 1)
+
+
+def _adjust(product_id, rate, delta):
+    Product.objects.filter(pk=product_id).update(**{
+        'rating_count': F('rating_count') + delta,
+        'rating_sum': F('rating_sum') + rate * delta,
+        f'rating_{rate}': F(f'rating_{rate}') + delta,
+    })
+
+
+def reconcile_ratings(batch_size=500):
+    """
+    Recomputes the aggregates of every product from its active comments, a locked batch of products at a
+    time, and returns the ids of the products that had drifted.
+    """
+    drifted = []
+    product_ids = list(Product.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(product_ids), batch_size):
+        batch = product_ids[start:start + batch_size]
+        with transaction.atomic():
+            stored = {
+                product.pop('id'): product
+                for product in Product.objects.select_for_update().filter(pk__in=batch)
+                .values('id', 'rating_count', 'rating_sum', *HISTOGRAM_FIELDS)
+            }
+            counts = {}
+            rows = Comment.objects.filter(product_id__in=batch, is_active=True) \
+                .values_list('product_id', 'rate').annotate(total=Count('id')).order_by()
+            for product_id, rate, total in rows:
+                counts.setdefault(product_id, {})[rate] = total
+
+            for product_id, product in stored.items():
+                histogram = counts.get(product_id, {})
+                expected = {f'rating_{rate}': histogram.get(rate, 0) for rate in RATES}
+                expected['rating_count'] = sum(histogram.values())
+                expected['rating_sum'] = sum(rate * total for rate, total in histogram.items())
+                if expected != product:
+                    Product.objects.filter(pk=product_id).update(**expected)
+                    drifted.append(product_id)
+    return drifted
+
+
+def rating_histogram(product):
+    return {str(rate): getattr(product, f'rating_{rate}') for rate in RATES}
@@ -0,0 +1,168 @@
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from app.product.models import Product
+
+SEARCH_FIELDS = ('title_uz', 'title_en', 'title_ru', 'description_uz', 'description_en', 'description_ru')
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(query):
+    return WORD_RE.findall(query.lower())
+
+
+class SearchBackend:
+    """
+    Full-text index over the translated product titles and descriptions.
+    ``search`` returns the ids of matching active products, best match first; every word of the query
+    must match, the last characters of a word being treated as a prefix.
+    """
+
+    def search(self, query, limit):
+        raise NotImplementedError
+
+    def index_products(self, products):
+        raise NotImplementedError
+
+    def remove_products(self, product_ids):
+        raise NotImplementedError
+
+    def rebuild(self):
+        raise NotImplementedError
+
+
+class SQLiteFTSBackend(SearchBackend):
+    """
+    Keeps a separate FTS5 table (``product_search``, created by migration) whose rowid is the product id.
+    """
+    table = 'product_search'
+    # bm25 column weights: titles count more than descriptions
+    weights = (10.0, 10.0, 10.0, 1.0, 1.0, 1.0)
+
+    def search(self, query, limit):
+        words = tokenize(query)
+        if not words:
+            return []
+        match = ' '.join(f'"{word}"*' for word in words)
+        weights = ', '.join(str(weight) for weight in self.weights)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s '
+                f'ORDER BY bm25({self.table}, {weights}) LIMIT %s',
+                [match, limit]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def index_products(self, products):
+        products = list(products)
+        self.remove_products([product.pk for product in products])
+        rows = [
+            [product.pk] + [getattr(product, field) or '' for field in SEARCH_FIELDS]
+            for product in products if product.is_active
+        ]
+        if not rows:
+            return
+        placeholders = ', '.join(['%s'] * (len(SEARCH_FIELDS) + 1))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.table} (rowid, {", ".join(SEARCH_FIELDS)}) VALUES ({placeholders})', rows
+            )
+
+    def remove_products(self, product_ids):
+        product_ids = list(product_ids)
+        if not product_ids:
+            return
+        placeholders = ', '.join(['%s'] * len(product_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid IN ({placeholders})', product_ids)
+
+    def rebuild(self, batch_size=500):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+        products = Product.objects.filter(is_active=True).only('pk', 'is_active', *SEARCH_FIELDS).order_by('pk')
+        batch = []
+        for product in products.iterator(chunk_size=batch_size):
+            batch.append(product)
+            if len(batch) == batch_size:
+                self.index_products(batch)
+                batch = []
+        self.index_products(batch)
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {self.table} ({self.table}) VALUES ('optimize')")
+
+
+class MySQLFullTextBackend(SearchBackend):
+    """
+    Uses the FULLTEXT index on the product table itself (created by migration), which InnoDB keeps
+    current on every write, so indexing is a no-op.
+    """
+    table = 'product'
+
+    def search(self, query, limit):
+        words = tokenize(query)
+        if not words:
+            return []
+        against = ' '.join(f'+{word}*' for word in words)
+        match = f'MATCH ({", ".join(SEARCH_FIELDS)}) AGAINST (%s IN BOOLEAN MODE)'
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT id, {match} AS score FROM {self.table} WHERE is_active AND {match} '
+                f'ORDER BY score DESC LIMIT %s',
+                [against, against, limit]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def index_products(self, products):
+        pass
+
+    def remove_products(self, product_ids):
+        pass
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'OPTIMIZE TABLE {self.table}')
+            cursor.fetchall()
+
+
+class ContainsBackend(SearchBackend):
+    """
+    Fallback for databases without a supported full-text index: a ``LIKE`` scan of the product table, titles
+    first. Slow on big catalogues, but saving products and searching keep working.
+    """
+
+    def search(self, query, limit):
+        words = tokenize(query)
+        if not words:
+            return []
+        titles = [field for field in SEARCH_FIELDS if field.startswith('title')]
+        products = Product.objects.filter(is_active=True)
+        for word in words:
+            products = products.filter(reduce(or_, (Q(**{f'{field}__icontains': word}) for field in SEARCH_FIELDS)))
+        title_match = reduce(or_, (Q(**{f'{field}__icontains': words[0]}) for field in titles))
+        products = products.annotate(
+            title_match=Case(When(title_match, then=Value(1)), default=Value(0), output_field=IntegerField())
+        ).order_by('-title_match', 'pk')
+        return list(products.values_list('pk', flat=True)[:limit])
+
+    def index_products(self, products):
+        pass
+
+    def remove_products(self, product_ids):
+        pass
+
+    def rebuild(self):
+        pass
+
+
+BACKENDS = {
+    'sqlite': SQLiteFTSBackend,
+    'mysql': MySQLFullTextBackend,
+}
+
+
+def get_search_backend():
+    return BACKENDS.get(connection.vendor, ContainsBackend)()
@@ -1,11 +1,20 @@
+from django.db.models import Prefetch
 from rest_framework import serializers
 
+from app.order.purchases import has_purchased
 from app.product.models import Category, Product, ProductImage, Comment, ProductColor, ProductValue, CategoryImages, \
     ProductType
+from app.product.ratings import rating_histogram, HISTOGRAM_FIELDS
+from app.utils.mixins import SparseFieldsetMixin
 from app.utils.models import Color
+from app.utils.media import media_url
+from app.utils.serializers import MediaURLMixin, SrcsetField
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    select_related_fields = ('user',)
+    field_relations = {'user': ('user',), 'image': ('user',)}
+
     class Meta:
         model = Comment
         fields = ('id', 'product', 'rate', 'message', 'created')
@@ -23,8 +32,7 @@ class CommentSerializer(serializers.ModelSerializer):
         rate = validated_data.get("rate")
         message = validated_data.get("message")
 
-        has_order = user.order_set.filter(items__product=product, status="s").exists()
-        if not has_order:
+        if not has_purchased(user.pk, product.pk):
             raise serializers.ValidationError(
                 {"detail": "Siz faqat sotib olgan mahsulotlaringizga sharh qoldira olasiz."}
             )
@@ -40,47 +48,47 @@ class CommentSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        data['user'] = instance.user.full_name
-        request = self.context.get('request')
-        if instance.user.image:
-            if request:
-                data['image'] = request.build_absolute_uri(instance.user.image.url)
-            else:
-                data['image'] = instance.user.image.url
-        else:
-            data['image'] = None
+        if self.is_requested('user'):
+            data['user'] = instance.user.full_name
+        if self.is_requested('image'):
+            data['image'] = media_url(instance.user.image.name, self.context.get('request'))
         return data
 
 
-class CategoryGetSerializer(serializers.ModelSerializer):
+class CategoryGetSerializer(SparseFieldsetMixin, MediaURLMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ('id', 'name', 'name_uz', 'name_en', 'name_ru', 'slug', 'image')
 
     def to_representation(self, instance):
         rep = super().to_representation(instance)
-        lang = self.context['request'].LANGUAGE_CODE
-        rep['name'] = getattr(instance, f"name_{lang}", instance.name)
+        if self.is_requested('name'):
+            lang = self.context['request'].LANGUAGE_CODE
+            rep['name'] = getattr(instance, f"name_{lang}", instance.name)
         return rep
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(MediaURLMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ('id', 'name_uz', 'name_en', 'name_ru', 'slug', 'image')
         extra_kwargs = {'slug': {'read_only': True}}
 
 
-class ProductImageSerializer(serializers.ModelSerializer):
+class ProductImageSerializer(MediaURLMixin, serializers.ModelSerializer):
+    srcset = SrcsetField()
+
     class Meta:
         model = ProductImage
-        fields = ('image', 'product')
+        fields = ('image', 'image_status', 'product', 'srcset')
+
 
+class ColorGetSerializer(MediaURLMixin, serializers.ModelSerializer):
+    srcset = SrcsetField()
 
-class ColorGetSerializer(serializers.ModelSerializer):
     class Meta:
         model = Color
-        fields = ('id', 'name', 'name_uz', 'name_en', 'name_ru', 'image')
+        fields = ('id', 'name', 'name_uz', 'name_en', 'name_ru', 'image', 'srcset')
 
     def to_representation(self, instance):
         rep = super().to_representation(instance)
@@ -89,10 +97,12 @@ class ColorGetSerializer(serializers.ModelSerializer):
         return rep
 
 
-class ColorSerializer(serializers.ModelSerializer):
+class ColorSerializer(MediaURLMixin, serializers.ModelSerializer):
+    srcset = SrcsetField()
+
     class Meta:
         model = Color
-        fields = ('id', 'name_uz', 'name_en', 'name_ru', 'image')
+        fields = ('id', 'name_uz', 'name_en', 'name_ru', 'image', 'srcset')
 
 
 class ProductTypeGetSerializer(serializers.ModelSerializer):
@@ -107,10 +117,12 @@ class ProductTypeSerializer(serializers.ModelSerializer):
         fields = ('id', 'product', 'name_uz', 'name_en', 'name_ru')
 
 
-class ProductColorSerializer(serializers.ModelSerializer):
+class ProductColorSerializer(MediaURLMixin, serializers.ModelSerializer):
+    srcset = SrcsetField()
+
     class Meta:
         model = ProductColor
-        fields = ('id', 'product', 'color', 'image', 'price')
+        fields = ('id', 'product', 'color', 'image', 'image_status', 'price', 'srcset')
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -122,18 +134,10 @@ class ProductColorSerializer(serializers.ModelSerializer):
             data['name'] = None
 
         if instance.color:
-            data['color_image'] = request.build_absolute_uri(instance.color.image.url)
+            data['color_image'] = media_url(instance.color.image.name, request)
         else:
             data['color_image'] = None
 
-        if request and instance.image:
-            data["image"] = request.build_absolute_uri(instance.image.url)
-
-        if instance.image.url:
-            data['image'] = request.build_absolute_uri(instance.image.url)
-        else:
-            data['image'] = None
-
         return data
 
 
@@ -149,67 +153,125 @@ class ProductValueSerializer(serializers.ModelSerializer):
         return data
 
 
-class ProductGetSerializer(serializers.ModelSerializer):
+PRODUCT_FIELD_RELATIONS = {
+    'category': ('category',),
+    'images': ('productimage_set',),
+    'colors': ('colors__color',),
+    'features': ('values__type',),
+}
+
+
+class ProductGetSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     images = ProductImageSerializer(many=True, source="productimage_set", read_only=True)
     colors = ProductColorSerializer(many=True, read_only=True)
     features = ProductValueSerializer(many=True, read_only=True, source='values')
+    rating = serializers.DecimalField(max_digits=3, decimal_places=2, read_only=True)
+    rating_histogram = serializers.SerializerMethodField()
+
+    select_related_fields = ('category',)
+    prefetch_related_fields = ('productimage_set', 'colors__color', 'values__type')
+    expandable_fields = ('images', 'colors', 'features')
+    field_relations = PRODUCT_FIELD_RELATIONS
+    field_columns = {'rating_histogram': HISTOGRAM_FIELDS}
 
     class Meta:
         model = Product
-        fields = ('id', 'title', 'description', 'price', 'old_price', 'images', 'colors', 'features')
+        fields = ('id', 'slug', 'title', 'description', 'price', 'old_price', 'rating', 'rating_count',
+                  'rating_histogram', 'images', 'colors', 'features')
+
+    def get_rating_histogram(self, instance):
+        return rating_histogram(instance)
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
         lang = self.context['request'].LANGUAGE_CODE
-        data['title'] = getattr(instance, f"title_{lang}", instance.title)
-        data['description'] = getattr(instance, f"description_{lang}", instance.description)
-        data['category'] = instance.category.slug
+        if self.is_requested('title'):
+            data['title'] = getattr(instance, f"title_{lang}", instance.title)
+        if self.is_requested('description'):
+            data['description'] = getattr(instance, f"description_{lang}", instance.description)
+        if self.is_requested('category'):
+            data['category'] = instance.category.slug
         return data
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     images = ProductImageSerializer(many=True, source="productimage_set", read_only=True)
     colors = ProductColorSerializer(many=True, read_only=True)
     features = ProductValueSerializer(many=True, read_only=True, source='values')
 
+    select_related_fields = ('category',)
+    prefetch_related_fields = ('productimage_set', 'colors__color', 'values__type')
+    expandable_fields = ('images', 'colors', 'features')
+    field_relations = PRODUCT_FIELD_RELATIONS
+
     class Meta:
         model = Product
-        fields = ('id', 'category', 'title', 'title_uz', 'title_en', 'title_ru', 'description_uz', 'description_en',
-                  'description_ru', 'price', 'old_price', 'images', 'colors', 'features')
+        fields = ('id', 'category', 'slug', 'title', 'title_uz', 'title_en', 'title_ru', 'description_uz',
+                  'description_en', 'description_ru', 'price', 'old_price', 'images', 'colors', 'features')
         extra_kwargs = {
+            'slug': {'read_only': True},
             'title': {'required': False},
             'category': {'required': True},
         }
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        data['category'] = instance.category.slug
+        if self.is_requested('category'):
+            data['category'] = instance.category.slug
         return data
 
 
-class AllProductSerializer(serializers.ModelSerializer):
+class AllProductSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     images = ProductImageSerializer(many=True, source="productimage_set")
     features = ProductValueSerializer(many=True, read_only=True, source='values')
+    rating = serializers.DecimalField(max_digits=3, decimal_places=2, read_only=True)
+
+    select_related_fields = ('category',)
+    prefetch_related_fields = ('productimage_set', 'values__type')
+    expandable_fields = ('images', 'features')
+    field_relations = PRODUCT_FIELD_RELATIONS
 
     class Meta:
         model = Product
-        fields = ('id', 'title', 'title_uz', 'title_en', 'title_ru', 'description', 'description_uz', 'description_en',
-                  'description_ru', 'price', 'old_price', 'images', 'features')
+        fields = ('id', 'slug', 'title', 'title_uz', 'title_en', 'title_ru', 'description', 'description_uz',
+                  'description_en', 'description_ru', 'price', 'old_price', 'rating', 'rating_count', 'images',
+                  'features')
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        if instance.category.slug:
-            data['category'] = instance.category.slug
-        else:
-            data['category'] = None
+        if self.is_requested('category'):
+            if instance.category:
+                data['category'] = instance.category.slug
+            else:
+                data['category'] = None
 
         lang = self.context['request'].LANGUAGE_CODE
-        data['title'] = getattr(instance, f"title_{lang}", instance.title)
-        data['description'] = getattr(instance, f"description_{lang}", instance.description)
+        if self.is_requested('title'):
+            data['title'] = getattr(instance, f"title_{lang}", instance.title)
+        if self.is_requested('description'):
+            data['description'] = getattr(instance, f"description_{lang}", instance.description)
         return data
 
 
-class CategoryImagesSerializer(serializers.ModelSerializer):
+class CategoryProductSerializer(AllProductSerializer):
+    """
+    ``AllProductSerializer`` with the product colours, for the category page.
+    """
+    colors = ProductColorSerializer(many=True, read_only=True)
+
+    # one query for the colours of the page with their colours
+    colors_prefetch = Prefetch('colors', queryset=ProductColor.objects.select_related('color').order_by('pk'))
+    prefetch_related_fields = AllProductSerializer.prefetch_related_fields + (colors_prefetch,)
+    expandable_fields = AllProductSerializer.expandable_fields + ('colors',)
+    field_relations = {**PRODUCT_FIELD_RELATIONS, 'colors': (colors_prefetch,)}
+
+    class Meta(AllProductSerializer.Meta):
+        fields = AllProductSerializer.Meta.fields + ('colors',)
+
+
+class CategoryImagesSerializer(MediaURLMixin, serializers.ModelSerializer):
+    srcset = SrcsetField()
+
     class Meta:
         model = CategoryImages
-        fields = ('id', 'image')
+        fields = ('id', 'image', 'image_status', 'srcset')
@@ -0,0 +1,163 @@
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
+from django.dispatch import receiver
+
+from app.product.cards import rebuild_product_cards
+from app.product.facets import sync_product_facets, rebuild_facet_counts, color_facet_key
+from app.product.models import Category, CategoryImages, Product, ProductImage, ProductColor, ProductValue, \
+    ProductType, ProductFacet, Comment
+from app.product.ratings import apply_rating_change, comment_rating, stored_comment_rating
+from app.product.search import get_search_backend
+from app.utils.cache import bump_namespace
+from app.utils.images import track_renditions
+from app.utils.models import Color
+
+track_renditions(ProductImage)
+track_renditions(ProductColor)
+track_renditions(CategoryImages)
+
+
+def deleted_with(origin, model):
+    return isinstance(origin, model) or getattr(origin, 'model', None) is model
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=CategoryImages)
+def invalidate_category_cache(sender, **kwargs):
+    # product responses embed the category slug and category images
+    bump_namespace('category', 'product')
+
+
+@receiver([post_save, post_delete], sender=Product)
+@receiver([post_save, post_delete], sender=ProductImage)
+@receiver([post_save, post_delete], sender=ProductColor)
+@receiver([post_save, post_delete], sender=ProductValue)
+@receiver([post_save, post_delete], sender=ProductType)
+@receiver([post_save, post_delete], sender=Color)
+def invalidate_product_cache(sender, **kwargs):
+    bump_namespace('product')
+
+
+# cards are only kept up to date while they are served; run the ``rebuild_product_cards`` command when turning
+# PRODUCT_CARDS_ENABLED on
+@receiver(post_save, sender=Product)
+def rebuild_card_on_product_save(sender, instance, **kwargs):
+    if not settings.PRODUCT_CARDS_ENABLED:
+        return
+    rebuild_product_cards([instance.pk])
+
+
+@receiver(post_save, sender=Product)
+def index_product_on_save(sender, instance, **kwargs):
+    get_search_backend().index_products([instance])
+
+
+@receiver(post_delete, sender=Product)
+def remove_product_from_index(sender, instance, **kwargs):
+    get_search_backend().remove_products([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=ProductImage)
+@receiver([post_save, post_delete], sender=ProductValue)
+def rebuild_card_on_relation_change(sender, instance, **kwargs):
+    if not settings.PRODUCT_CARDS_ENABLED or deleted_with(kwargs.get('origin'), Product):
+        return
+    rebuild_product_cards([instance.product_id])
+
+
+@receiver([post_save, post_delete], sender=ProductType)
+def rebuild_card_on_type_change(sender, instance, **kwargs):
+    if not settings.PRODUCT_CARDS_ENABLED or deleted_with(kwargs.get('origin'), Product):
+        return
+    product_ids = set(ProductValue.objects.filter(type=instance).values_list('product_id', flat=True))
+    product_ids.add(instance.product_id)
+    rebuild_product_cards(product_ids)
+
+
+@receiver(post_save, sender=Category)
+def rebuild_cards_on_category_save(sender, instance, **kwargs):
+    if not settings.PRODUCT_CARDS_ENABLED:
+        return
+    rebuild_product_cards(Product.objects.filter(category=instance).values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Category)
+def rebuild_cards_on_category_delete(sender, instance, **kwargs):
+    if not settings.PRODUCT_CARDS_ENABLED:
+        return
+    # products and cards of the deleted category were moved to no category
+    rebuild_product_cards(
+        Product.objects.filter(cards__category__isnull=True, category__isnull=True).values_list('id', flat=True)
+    )
+
+
+@receiver(post_save, sender=Product)
+def sync_facets_on_product_save(sender, instance, **kwargs):
+    sync_product_facets(instance.pk)
+
+
+@receiver(pre_delete, sender=Product)
+def clear_facets_on_product_delete(sender, instance, **kwargs):
+    sync_product_facets(instance.pk, clear=True)
+
+
+@receiver([post_save, post_delete], sender=ProductValue)
+@receiver([post_save, post_delete], sender=ProductColor)
+def sync_facets_on_relation_change(sender, instance, **kwargs):
+    if deleted_with(kwargs.get('origin'), Product):
+        return
+    sync_product_facets(instance.product_id)
+
+
+@receiver(post_save, sender=ProductType)
+def sync_facets_on_type_change(sender, instance, **kwargs):
+    for product_id in set(ProductValue.objects.filter(type=instance).values_list('product_id', flat=True)):
+        sync_product_facets(product_id)
+
+
+@receiver(pre_delete, sender=Color)
+def remember_color_facet(sender, instance, **kwargs):
+    instance._facet_key = color_facet_key(instance)
+
+
+@receiver([post_save, post_delete], sender=Color)
+def sync_facets_on_color_change(sender, instance, **kwargs):
+    product_ids = set(ProductColor.objects.filter(color=instance).values_list('product_id', flat=True))
+    facet_key = getattr(instance, '_facet_key', None)
+    if facet_key:
+        product_ids.update(ProductFacet.objects.filter(key=facet_key).values_list('product_id', flat=True))
+    for product_id in product_ids:
+        sync_product_facets(product_id)
+
+
+@receiver(post_delete, sender=Category)
+def rebuild_facet_counts_on_category_delete(sender, instance, **kwargs):
+    # postings of the deleted category moved to no category, counts are recomputed from them
+    rebuild_facet_counts()
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_rating(sender, instance, **kwargs):
+    instance._rating_before = stored_comment_rating(instance.pk) if instance.pk else None
+
+
+@receiver(post_save, sender=Comment)
+def update_rating_on_comment_save(sender, instance, **kwargs):
+    after = comment_rating(instance.product_id, instance.rate, instance.is_active)
+    before = getattr(instance, '_rating_before', None)
+    if before == after:
+        return
+    apply_rating_change(before, after)
+    bump_namespace('product')
+    if settings.PRODUCT_CARDS_ENABLED:
+        rebuild_product_cards({product_id for product_id, _ in filter(None, (before, after))})
+
+
+@receiver(post_delete, sender=Comment)
+def update_rating_on_comment_delete(sender, instance, **kwargs):
+    if deleted_with(kwargs.get('origin'), Product) or not instance.is_active:
+        return
+    apply_rating_change(comment_rating(instance.product_id, instance.rate, instance.is_active), None)
+    bump_namespace('product')
+    if settings.PRODUCT_CARDS_ENABLED:
+        rebuild_product_cards([instance.product_id])
@@ -0,0 +1,47 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.product.models import Category, CategoryImages
+
+
+class CategoryCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name_en='Phones', name_uz='Telefonlar', name_ru='Телефоны')
+
+    def get_categories(self, language):
+        return self.client.get(reverse('list-create-category'), headers={'Accept-Language': language})
+
+    def test_cache_is_per_language(self):
+        self.assertEqual(self.get_categories('uz').data[0]['name'], 'Telefonlar')
+        self.assertEqual(self.get_categories('ru').data[0]['name'], 'Телефоны')
+        self.assertEqual(self.get_categories('en').data[0]['name'], 'Phones')
+
+    def test_cache_hit_skips_database(self):
+        self.get_categories('en')
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.get_categories('en')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(context.captured_queries), 0)
+
+    def test_model_writes_invalidate_cache(self):
+        self.get_categories('en')
+
+        self.category.name_en = 'Smartphones'
+        self.category.save()
+        self.assertEqual(self.get_categories('en').data[0]['name'], 'Smartphones')
+
+        Category.objects.create(name_en='Laptops')
+        self.assertEqual(len(self.get_categories('en').data), 2)
+
+    def test_category_images_invalidate_product_listing(self):
+        url = reverse('product-by-category', kwargs={'slug': self.category.slug})
+        self.assertEqual(self.client.get(url).data['images'], [])
+
+        CategoryImages.objects.create(category=self.category, image='images/category/banner.jpg')
+        self.assertEqual(len(self.client.get(url).data['images']), 1)
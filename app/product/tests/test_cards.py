@@ -0,0 +1,95 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.product.models import Category, Product, ProductImage, ProductType, ProductValue, ProductCard
+
+
+@override_settings(PRODUCT_CARDS_ENABLED=True)
+class ProductCardTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Phones')
+        self.products = []
+        for i in range(3):
+            product = Product.objects.create(
+                category=self.category, title_en=f'Phone {i}', title_uz=f'Telefon {i}', price=100 + i
+            )
+            ProductImage.objects.create(product=product, image=f'images/product/{i}.jpg')
+            memory = ProductType.objects.create(product=product, name_en='Memory', name_uz='Xotira')
+            ProductValue.objects.create(product=product, type=memory, value='128GB', price=10)
+            self.products.append(product)
+
+    def get_products(self, language='en'):
+        cache.clear()
+        return self.client.get(reverse('all-product'), headers={'Accept-Language': language}).data
+
+    def test_cards_match_serializer_output(self):
+        for language in ('en', 'uz', 'ru'):
+            with override_settings(PRODUCT_CARDS_ENABLED=False):
+                expected = self.get_products(language)
+            self.assertEqual(self.get_products(language), expected)
+
+    def test_listing_is_one_query(self):
+        self.get_products()
+
+        with CaptureQueriesContext(connection) as context:
+            self.get_products()
+
+        self.assertEqual(len(context.captured_queries), 1)
+
+    def test_cards_follow_relation_changes(self):
+        product = self.products[0]
+        ProductImage.objects.create(product=product, image='images/product/extra.jpg')
+        card = next(item for item in self.get_products()['results'] if item['id'] == product.id)
+        self.assertEqual(len(card['images']), 2)
+
+        memory = ProductType.objects.get(product=product)
+        memory.name_en = 'Storage'
+        memory.save()
+        card = next(item for item in self.get_products()['results'] if item['id'] == product.id)
+        self.assertEqual(card['features'][0]['type_name'], 'Storage')
+
+        self.category.slug = 'smartphones'
+        self.category.save()
+        self.assertEqual({item['category'] for item in self.get_products()['results']}, {'smartphones'})
+
+    def test_inactive_and_deleted_products_leave_the_listing(self):
+        self.products[0].is_active = False
+        self.products[0].save()
+        self.products[1].delete()
+
+        self.assertEqual([item['id'] for item in self.get_products()['results']], [self.products[2].id])
+
+    def test_category_page_serves_cards(self):
+        response = self.client.get(reverse('product-by-category', kwargs={'slug': self.category.slug}))
+
+        self.assertEqual(len(response.data['products']), 3)
+        self.assertTrue(response.data['products'][0]['images'][0]['image'].startswith('http://testserver/'))
+
+    def test_rebuild_command(self):
+        Product.objects.filter(pk=self.products[0].pk).update(title_en='Renamed')
+        ProductCard.objects.all().delete()
+
+        call_command('rebuild_product_cards', stdout=StringIO())
+
+        self.assertEqual(ProductCard.objects.count(), 9)
+        card = ProductCard.objects.get(product=self.products[0], language='en')
+        self.assertEqual(card.data['title'], 'Renamed')
+
+    @override_settings(PRODUCT_CARDS_ENABLED=False)
+    def test_cards_are_not_written_while_disabled(self):
+        product = self.products[0]
+
+        with CaptureQueriesContext(connection) as context:
+            product.title_en = 'Renamed'
+            product.save()
+            ProductImage.objects.create(product=product, image='images/product/extra.jpg')
+
+        self.assertFalse([query for query in context.captured_queries if 'productcard' in query['sql']])
+        self.assertEqual(ProductCard.objects.get(product=product, language='en').data['title'], 'Phone 0')
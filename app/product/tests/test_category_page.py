@@ -0,0 +1,92 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.product.models import Category, CategoryImages, Product, ProductColor, ProductImage, ProductType, \
+    ProductValue
+from app.utils.models import Color
+
+
+class CategoryPageTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = Category.objects.create(name='Phones')
+        other = Category.objects.create(name='Laptops')
+        CategoryImages.objects.create(category=cls.category, image='images/category/banner.jpg')
+        products = Product.objects.bulk_create(
+            Product(category=cls.category, title=f'Phone {i}', price=100 + i, is_active=i % 10 != 0)
+            for i in range(1_000)
+        )
+        Product.objects.create(category=other, title='Laptop', price=100)
+        ProductImage.objects.bulk_create(
+            ProductImage(product=product, image=f'images/product/{product.pk}.jpg') for product in products
+        )
+        types = ProductType.objects.bulk_create(ProductType(product=product, name='Memory') for product in products)
+        ProductValue.objects.bulk_create(
+            ProductValue(product=memory.product, type=memory, value='128GB', price=10) for memory in types
+        )
+        black = Color.objects.create(name_en='Black', name_uz='Qora', image='images/color/black.png')
+        ProductColor.objects.bulk_create(
+            ProductColor(product=product, color=black, image=f'images/product/{product.pk}-black.jpg', price=5)
+            for product in products
+        )
+        cls.url = reverse('product-by-category', kwargs={'slug': cls.category.slug})
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response, len(context.captured_queries)
+
+    def test_fixed_query_budget(self):
+        response, queries = self.get(self.url)
+
+        # category, its images, the page, product images, product values, product colours
+        self.assertEqual(queries, 6)
+        self.assertEqual(len(response.data['products']), 20)
+        self.assertEqual(len(response.data['products'][0]['images']), 1)
+        self.assertEqual(len(response.data['products'][0]['features']), 1)
+        self.assertEqual(response.data['products'][0]['colors'][0]['name'], 'Black')
+        self.assertEqual(len(response.data['images']), 1)
+
+        _, deep_queries = self.get(response.data['next'], {'page_size': 100})
+        self.assertEqual(deep_queries, 6)
+
+    def test_pages_cover_active_products_only(self):
+        seen = []
+        url, params = self.url, {'page_size': 100}
+        while url:
+            response, _ = self.get(url, params)
+            seen.extend(item['id'] for item in response.data['products'])
+            url, params = response.data['next'], None
+
+        expected = Product.objects.filter(category=self.category, is_active=True).order_by('-created', '-id')
+        self.assertEqual(seen, list(expected.values_list('id', flat=True)))
+        self.assertEqual(len(seen), 900)
+
+    def test_serializer_path_matches(self):
+        for language in ('en', 'uz'):
+            compiled = self.client.get(self.url, {'ordering': 'price'}, HTTP_ACCEPT_LANGUAGE=language).content
+            cache.clear()
+
+            with override_settings(COMPILED_SERIALIZERS_ENABLED=False):
+                serialized = self.client.get(self.url, {'ordering': 'price'}, HTTP_ACCEPT_LANGUAGE=language)
+            self.assertEqual(serialized.content, compiled)
+            cache.clear()
+
+            call_command('rebuild_product_cards', stdout=StringIO())
+            with override_settings(PRODUCT_CARDS_ENABLED=True):
+                cards = self.client.get(self.url, {'ordering': 'price'}, HTTP_ACCEPT_LANGUAGE=language)
+            self.assertEqual(cards.content, compiled)
+            cache.clear()
+
+    def test_unknown_category(self):
+        self.assertEqual(self.client.get(reverse('product-by-category', kwargs={'slug': 'missing'})).status_code, 404)
@@ -0,0 +1,67 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.product.models import Category, Product
+from app.utils.cache import NAMESPACE_VERSION_KEY
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Phones')
+        self.product = Product.objects.create(category=self.category, title='Phone', price=100)
+        self.url = reverse('product-detail', kwargs={'pk': self.product.pk})
+
+    def test_matching_etag_is_not_modified_without_queries(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Accept-Language', response['Vary'])
+
+        with CaptureQueriesContext(connection) as context:
+            not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+        self.assertEqual(len(context.captured_queries), 0)
+
+    def test_missing_resource_is_not_found(self):
+        url = reverse('product-detail', kwargs={'pk': 99999})
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='*').status_code, 404)
+
+    def test_revalidation_skips_the_view(self):
+        etag = self.client.get(self.url)['ETag']
+        # the cached response expired, the namespace version did not
+        version_key = NAMESPACE_VERSION_KEY.format('product')
+        version = cache.get(version_key)
+        cache.clear()
+        cache.set(version_key, version, None)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(context.captured_queries), 0)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='*').status_code, 304)
+
+    def test_write_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+
+        self.product.title = 'Renamed'
+        self.product.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['title'], 'Renamed')
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_differs_per_language(self):
+        uz = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE='uz')
+        ru = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE='ru', HTTP_IF_NONE_MATCH=uz['ETag'])
+
+        self.assertEqual(ru.status_code, 200)
+        self.assertNotEqual(ru['ETag'], uz['ETag'])
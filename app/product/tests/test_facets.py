@@ -0,0 +1,89 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from app.product.models import Category, Product, ProductType, ProductValue, ProductColor, FacetCount
+from app.utils.models import Color
+
+
+class ProductFacetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.phones = Category.objects.create(name='Phones')
+        self.laptops = Category.objects.create(name='Laptops')
+        self.black = Color.objects.create(name='Black', image='images/color/black.png')
+        self.white = Color.objects.create(name='White', image='images/color/white.png')
+
+        self.phone_128 = self.create_product(self.phones, '128GB', self.black)
+        self.phone_256 = self.create_product(self.phones, '256GB', self.black)
+        self.phone_white = self.create_product(self.phones, '128GB', self.white)
+        self.laptop = self.create_product(self.laptops, '256GB', self.black)
+
+    def create_product(self, category, memory_value, color):
+        product = Product.objects.create(category=category, title='Product', price=100)
+        memory = ProductType.objects.create(product=product, name='Memory')
+        ProductValue.objects.create(product=product, type=memory, value=memory_value)
+        ProductColor.objects.create(product=product, color=color, image='images/product/color.jpg')
+        return product
+
+    def filter_products(self, *facets, **params):
+        cache.clear()
+        response = self.client.get(reverse('all-product'), {'facet': facets, **params})
+        return {item['id'] for item in response.data['results']}
+
+    def counts(self, category=None):
+        cache.clear()
+        params = {'category': category.slug} if category else {}
+        response = self.client.get(reverse('product-facets'), params)
+        return {item['key']: item['count'] for item in response.data}
+
+    def test_multi_facet_filter_intersects(self):
+        self.assertEqual(self.filter_products('memory:128gb'), {self.phone_128.id, self.phone_white.id})
+        self.assertEqual(self.filter_products('memory:128gb', 'color:black'), {self.phone_128.id})
+        self.assertEqual(
+            self.filter_products('memory:256gb', 'color:black'), {self.phone_256.id, self.laptop.id}
+        )
+        self.assertEqual(self.filter_products('memory:256gb', name=self.laptops.slug), {self.laptop.id})
+        self.assertEqual(self.filter_products('memory:1tb'), set())
+
+    @override_settings(PRODUCT_CARDS_ENABLED=True)
+    def test_filter_on_cards(self):
+        call_command('rebuild_product_cards', stdout=StringIO())
+        self.assertEqual(self.filter_products('memory:128gb', 'color:black'), {self.phone_128.id})
+
+    def test_counts_per_category(self):
+        self.assertEqual(self.counts(self.phones), {'memory:128gb': 2, 'memory:256gb': 1, 'color:black': 2,
+                                                    'color:white': 1})
+        self.assertEqual(self.counts(), {'memory:128gb': 2, 'memory:256gb': 2, 'color:black': 3,
+                                         'color:white': 1})
+
+    def test_counts_follow_changes(self):
+        self.phone_128.is_active = False
+        self.phone_128.save()
+        self.assertEqual(self.counts(self.phones)['memory:128gb'], 1)
+
+        self.phone_256.category = self.laptops
+        self.phone_256.save()
+        self.assertEqual(self.counts(self.laptops)['memory:256gb'], 2)
+        self.assertNotIn('memory:256gb', self.counts(self.phones))
+
+        ProductValue.objects.filter(product=self.phone_white).get().delete()
+        self.assertNotIn('memory:128gb', self.counts(self.phones))
+
+        self.white.name = 'Silver'
+        self.white.save()
+        self.assertEqual(self.counts(self.phones)['color:silver'], 1)
+        self.assertNotIn('color:white', self.counts(self.phones))
+
+        self.laptop.delete()
+        self.assertEqual(self.counts(self.laptops), {'memory:256gb': 1, 'color:black': 1})
+
+    def test_rebuild_command(self):
+        FacetCount.objects.all().delete()
+
+        call_command('rebuild_facets', stdout=StringIO())
+
+        self.assertEqual(self.counts()['color:black'], 3)
@@ -0,0 +1,79 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from app.product.models import Category, Product
+
+
+class ProductOrderingTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Phones')
+        other = Category.objects.create(name='Laptops')
+        prices = [(300, 400), (100, None), (500, 450), (200, 350), (400, 410), (100, 120)]
+        self.products = [
+            Product.objects.create(category=self.category, title=f'Phone {i}', price=price, old_price=old_price)
+            for i, (price, old_price) in enumerate(prices)
+        ]
+        Product.objects.create(category=other, title='Laptop', price=250)
+        Product.objects.create(category=self.category, title='Hidden', price=150, is_active=False)
+
+    def list_ids(self, **params):
+        ids = []
+        response = self.client.get(reverse('all-product'), {'page_size': 2, **params})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            ids.extend(item['id'] for item in response.data['results'])
+            if not response.data['next']:
+                return ids
+            response = self.client.get(response.data['next'])
+
+    def test_discount_is_generated(self):
+        discounts = Product.objects.filter(pk__in=[p.pk for p in self.products]).order_by('pk')
+        self.assertEqual(
+            list(discounts.values_list('discount', flat=True)),
+            [Decimal('100'), Decimal('0'), Decimal('0'), Decimal('150'), Decimal('10'), Decimal('20')]
+        )
+
+    def test_price_ordering_pages_through_ties(self):
+        expected = list(Product.objects.filter(is_active=True).order_by('price', 'id').values_list('id', flat=True))
+        self.assertEqual(self.list_ids(ordering='price'), expected)
+        self.assertEqual(self.list_ids(ordering='-price'), list(reversed(expected)))
+
+    def test_discount_and_created_ordering(self):
+        active = Product.objects.filter(is_active=True)
+        self.assertEqual(self.list_ids(ordering='-discount'),
+                         list(active.order_by('-discount', '-id').values_list('id', flat=True)))
+        self.assertEqual(self.list_ids(ordering='created'),
+                         list(active.order_by('created', 'id').values_list('id', flat=True)))
+        self.assertEqual(self.list_ids(ordering='title'), self.list_ids())
+
+    def test_price_range(self):
+        ids = self.list_ids(ordering='price', min_price='150', max_price='400', name=self.category.slug)
+        self.assertEqual(ids, [self.products[3].id, self.products[0].id, self.products[4].id])
+
+    def test_invalid_price_is_rejected(self):
+        response = self.client.get(reverse('all-product'), {'min_price': 'cheap'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('min_price', response.data['errors'])
+
+    @override_settings(PRODUCT_CARDS_ENABLED=True)
+    def test_cards_follow_ordering_and_range(self):
+        call_command('rebuild_product_cards', stdout=StringIO())
+        expected = list(
+            Product.objects.filter(is_active=True, price__lte=300).order_by('-price', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(self.list_ids(ordering='-price', max_price='300'), expected)
+
+    def test_category_listing(self):
+        url = reverse('product-by-category', kwargs={'slug': self.category.slug})
+        response = self.client.get(url, {'ordering': '-price', 'min_price': '200'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item['id'] for item in response.data['products']],
+            [self.products[2].id, self.products[4].id, self.products[0].id, self.products[3].id]
+        )
@@ -0,0 +1,70 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from app.product.models import Category, Product
+
+
+class ProductPaginationTest(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name='Phones')
+        created = timezone.now()
+        # identical timestamps make ``id`` the only tie-breaker
+        self.products = [
+            Product.objects.create(category=category, title=f'Phone {i}', price=100, created=created)
+            for i in range(25)
+        ]
+
+    def test_cursor_pages_cover_every_row_once(self):
+        ids = []
+        url = reverse('all-product') + '?page_size=10'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+
+        expected = sorted((product.id for product in self.products), reverse=True)
+        self.assertEqual(ids, expected)
+
+    def test_previous_link_returns_previous_page(self):
+        first = self.client.get(reverse('all-product') + '?page_size=10')
+        second = self.client.get(first.data['next'])
+        self.assertIsNone(first.data['previous'])
+
+        previous = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [item['id'] for item in previous.data['results']],
+            [item['id'] for item in first.data['results']],
+        )
+
+    def test_deep_page_costs_the_same_as_first_page(self):
+        with CaptureQueriesContext(connection) as first_context:
+            first = self.client.get(reverse('all-product') + '?page_size=5')
+
+        url = first.data['next']
+        for _ in range(3):
+            url = self.client.get(url).data['next']
+
+        with CaptureQueriesContext(connection) as deep_context:
+            deep = self.client.get(url)
+
+        self.assertEqual(len(deep.data['results']), 5)
+        self.assertEqual(len(first_context.captured_queries), len(deep_context.captured_queries))
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('all-product') + '?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_number_mode_has_count(self):
+        response = self.client.get(reverse('all-product') + '?page=2&page_size=10')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 10)
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse('all-product') + '?page=3&page_size=10')
+        self.assertFalse(any('COUNT(' in query['sql'] for query in context.captured_queries))
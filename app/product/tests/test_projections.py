@@ -0,0 +1,52 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from app.product.models import Category, Product, ProductImage, ProductType, ProductValue, Comment
+from app.user.models import User
+
+
+class ProjectionEquivalenceTest(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name='Phones')
+        created = timezone.now()
+        self.product = Product.objects.create(
+            category=category, title_en='Phone', title_uz='Telefon', description_ru='Описание', price='1999.5',
+            old_price='2100', created=created
+        )
+        ProductImage.objects.create(product=self.product, image='images/product/1.jpg')
+        ProductImage.objects.create(product=self.product, image='images/product/2.jpg')
+        memory = ProductType.objects.create(product=self.product, name_en='Memory', name_ru='Память')
+        color = ProductType.objects.create(product=self.product, name_uz='Rang')
+        ProductValue.objects.create(product=self.product, type=memory, value='128GB', price='10.25')
+        ProductValue.objects.create(product=self.product, type=color, value='Black')
+        Product.objects.create(title_en='No category', price=5, created=created)
+
+        with_image = User.objects.create_user(phone_number='+998901234567', full_name='Ali',
+                                              image='images/users/ali.png')
+        without_image = User.objects.create_user(phone_number='+998901234568')
+        Comment.objects.create(user=with_image, product=self.product, rate=5, message='Great', is_active=True)
+        Comment.objects.create(user=without_image, product=self.product, rate=3, message='Ok', is_active=True,
+                               created=created)
+
+    def assertSameContent(self, url, params=None):
+        for language in ('uz', 'en', 'ru'):
+            responses = []
+            for enabled in (False, True):
+                cache.clear()
+                with override_settings(COMPILED_SERIALIZERS_ENABLED=enabled):
+                    responses.append(self.client.get(url, params, HTTP_ACCEPT_LANGUAGE=language))
+            serialized, compiled = responses
+            self.assertEqual(serialized.status_code, 200)
+            self.assertEqual(compiled.content, serialized.content)
+
+    def test_all_products(self):
+        self.assertSameContent(reverse('all-product'))
+        self.assertSameContent(reverse('all-product'), {'ordering': 'price', 'page_size': 1})
+        self.assertSameContent(reverse('all-product'), {'fields': 'id,title,features,category', 'expand': 'images'})
+
+    def test_comments(self):
+        url = reverse('list-comment', kwargs={'pk': self.product.pk})
+        self.assertSameContent(url)
+        self.assertSameContent(url, {'fields': 'user,created'})
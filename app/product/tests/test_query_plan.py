@@ -0,0 +1,60 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.product.models import Category, Product, ProductImage, ProductType, ProductValue, ProductColor
+from app.utils.models import Color
+
+
+class ProductQueryPlanTest(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name='Phones')
+        self.color = Color.objects.create(name='Black', image='images/color/black.png')
+
+    def create_products(self, count):
+        for i in range(count):
+            product = Product.objects.create(category=self.category, title=f'Phone {i}', price=100 + i)
+            ProductImage.objects.create(product=product, image=f'images/product/{i}-1.jpg')
+            ProductImage.objects.create(product=product, image=f'images/product/{i}-2.jpg')
+            ProductColor.objects.create(product=product, color=self.color, image=f'images/product/{i}-c.jpg')
+            memory = ProductType.objects.create(product=product, name='Memory')
+            ProductValue.objects.create(product=product, type=memory, value='128GB', price=10)
+            ProductValue.objects.create(product=product, type=memory, value='256GB', price=20)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_all_products_query_count_does_not_grow(self):
+        self.create_products(2)
+        few = self.count_queries(reverse('all-product'))
+
+        self.create_products(6)
+        many = self.count_queries(reverse('all-product'))
+
+        self.assertEqual(few, many)
+
+    def test_product_by_category_query_count_does_not_grow(self):
+        url = reverse('product-by-category', kwargs={'slug': self.category.slug})
+        self.create_products(2)
+        few = self.count_queries(url)
+
+        self.create_products(6)
+        many = self.count_queries(url)
+
+        self.assertEqual(few, many)
+
+    def test_product_detail_is_eager_loaded(self):
+        self.create_products(1)
+        product = Product.objects.first()
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('product-detail', kwargs={'pk': product.pk}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['images']), 2)
+        self.assertEqual(len(response.data['features']), 2)
+        self.assertLessEqual(len(context.captured_queries), 6)
@@ -0,0 +1,106 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app.order.models import Order, Item
+from app.product.models import Category, Comment, Product
+from app.user.models import User
+
+
+class ProductRatingTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(phone_number='+998901234567', full_name='Ali')
+        self.category = Category.objects.create(name='Phones')
+        self.product = Product.objects.create(category=self.category, title='Phone', price=100)
+        order = Order.objects.create(user=self.user, receive='d', payment='cash', status='s', price=100)
+        Item.objects.create(order=order, product=self.product, price=100)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def comment(self, rate):
+        response = self.client.post(reverse('create-comment'), {'product': self.product.pk, 'rate': rate,
+                                                                 'message': 'Review'})
+        self.assertEqual(response.status_code, 201)
+        return Comment.objects.get(pk=response.data['id'])
+
+    def detail(self):
+        return self.client.get(reverse('product-detail', kwargs={'pk': self.product.pk})).data
+
+    def test_comments_update_aggregates(self):
+        self.comment(5)
+        self.comment(4)
+        removed = self.comment(2)
+
+        detail = self.detail()
+        self.assertEqual(detail['rating'], '3.67')
+        self.assertEqual(detail['rating_count'], 3)
+        self.assertEqual(detail['rating_histogram'], {'0': 0, '1': 0, '2': 1, '3': 0, '4': 1, '5': 1})
+
+        self.assertEqual(self.client.delete(reverse('detail-comment', kwargs={'pk': removed.pk})).status_code, 200)
+        self.assertEqual(self.client.delete(reverse('detail-comment', kwargs={'pk': removed.pk})).status_code, 400)
+
+        detail = self.detail()
+        self.assertEqual(detail['rating'], '4.50')
+        self.assertEqual(detail['rating_histogram']['2'], 0)
+        listing = self.client.get(reverse('all-product')).data['results'][0]
+        self.assertEqual((listing['rating'], listing['rating_count']), ('4.50', 2))
+
+    def test_moderation_and_deletion(self):
+        comment = Comment.objects.create(user=self.user, product=self.product, rate=3, message='Hidden')
+        self.assertEqual(self.detail()['rating_count'], 0)
+
+        comment.is_active = True
+        comment.save()
+        comment.rate = 1
+        comment.save()
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.rating_count, self.product.rating_sum, self.product.rating_1), (1, 1, 1))
+        self.assertEqual(self.product.rating_3, 0)
+
+        comment.delete()
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.rating_count, self.product.rating_sum, self.product.rating_1), (0, 0, 0))
+
+    def test_ordering_by_rating(self):
+        other = Product.objects.create(category=self.category, title='Case', price=10)
+        unrated = Product.objects.create(category=self.category, title='Cable', price=5)
+        Comment.objects.create(user=self.user, product=self.product, rate=3, message='Fine', is_active=True)
+        Comment.objects.create(user=self.user, product=other, rate=5, message='Great', is_active=True)
+
+        response = self.client.get(reverse('all-product'), {'ordering': '-rating', 'page_size': 2})
+        self.assertEqual([item['id'] for item in response.data['results']], [other.pk, self.product.pk])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([item['id'] for item in response.data['results']], [unrated.pk])
+
+    def test_reconcile_command(self):
+        Comment.objects.create(user=self.user, product=self.product, rate=4, message='Good', is_active=True)
+        Comment.objects.filter(product=self.product).update(rate=2)
+        Product.objects.filter(pk=self.product.pk).update(rating_5=7)
+
+        out = StringIO()
+        call_command('reconcile_ratings', stdout=out)
+
+        self.assertIn('1 products corrected', out.getvalue())
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.rating_sum, 2)
+        self.assertEqual((self.product.rating_2, self.product.rating_4, self.product.rating_5), (1, 0, 0))
+        self.assertEqual(str(self.product.rating), '2.00')
+
+    def test_saving_a_loaded_product_keeps_new_ratings(self):
+        product = Product.objects.get(pk=self.product.pk)
+        # added by another request after the product was loaded, as an admin edit or PUT would load it
+        self.comment(5)
+
+        product.title = 'Renamed'
+        product.price = 150
+        product.save()
+
+        self.product.refresh_from_db()
+        self.assertEqual((self.product.title, self.product.price), ('Renamed', 150))
+        self.assertEqual((self.product.rating_count, self.product.rating_sum, self.product.rating_5), (1, 5, 1))
+        self.assertEqual(str(self.product.rating), '5.00')
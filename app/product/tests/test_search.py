@@ -0,0 +1,75 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from app.product.models import Product
+
+
+class ProductSearchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.phone = Product.objects.create(
+            title_en='Samsung Galaxy phone', title_ru='Телефон Samsung Galaxy',
+            title_uz='Samsung Galaxy telefon', description_en='Android smartphone', price=100
+        )
+        self.case = Product.objects.create(
+            title_en='Silicone case', description_en='Fits every Samsung phone', price=10
+        )
+        self.laptop = Product.objects.create(title_en='Lenovo laptop', price=500)
+
+    def search(self, query):
+        cache.clear()
+        response = self.client.get(reverse('product-search'), {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [item['id'] for item in response.data]
+
+    def test_title_matches_rank_first(self):
+        self.assertEqual(self.search('samsung phone'), [self.phone.id, self.case.id])
+
+    def test_prefix_matching(self):
+        self.assertEqual(self.search('lapt'), [self.laptop.id])
+        self.assertEqual(self.search('gal'), [self.phone.id])
+
+    def test_every_language_is_searched(self):
+        self.assertEqual(self.search('телеф'), [self.phone.id])
+        self.assertEqual(self.search('telefon'), [self.phone.id])
+
+    def test_index_follows_product_changes(self):
+        self.laptop.title_en = 'Lenovo notebook'
+        self.laptop.save()
+        self.assertEqual(self.search('laptop'), [])
+        self.assertEqual(self.search('notebook'), [self.laptop.id])
+
+        self.case.is_active = False
+        self.case.save()
+        self.assertEqual(self.search('samsung'), [self.phone.id])
+
+        self.phone.delete()
+        self.assertEqual(self.search('samsung'), [])
+
+    def test_empty_query(self):
+        self.assertEqual(self.search(''), [])
+        self.assertEqual(self.search('"*'), [])
+
+    def test_rebuild_command(self):
+        Product.objects.filter(pk=self.laptop.pk).update(title_en='Thinkpad')
+
+        call_command('rebuild_search_index', stdout=StringIO())
+
+        self.assertEqual(self.search('thinkpad'), [self.laptop.id])
+
+    # as on a database vendor without a backend
+    @mock.patch.dict('app.product.search.BACKENDS', clear=True)
+    def test_unsupported_database_falls_back_to_contains(self):
+        tablet = Product.objects.create(title_en='Samsung tablet', price=300)
+        self.laptop.title_en = 'Lenovo notebook'
+        self.laptop.save()
+
+        self.assertEqual(self.search('samsung'), [self.phone.id, tablet.id, self.case.id])
+        self.assertEqual(self.search('notebook'), [self.laptop.id])
+        self.assertEqual(self.search('phone fits'), [self.case.id])
+        call_command('rebuild_search_index', stdout=StringIO())
@@ -0,0 +1,84 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from app.product.models import Category, Product, ProductImage, ProductType, ProductValue
+from app.user.models import User
+
+
+class SparseFieldsetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Phones')
+        for i in range(3):
+            product = Product.objects.create(category=self.category, title=f'Phone {i}', description='Long text',
+                                             price=100 + i)
+            ProductImage.objects.create(product=product, image=f'images/product/{i}.jpg')
+            memory = ProductType.objects.create(product=product, name='Memory')
+            ProductValue.objects.create(product=product, type=memory, value='128GB')
+        self.product = product
+
+    def get(self, url, params=None):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response, context.captured_queries
+
+    def test_fields_prune_keys_columns_and_prefetches(self):
+        full, full_queries = self.get(reverse('all-product'))
+        sparse, sparse_queries = self.get(reverse('all-product'), {'fields': 'id,title,price'})
+
+        self.assertEqual(set(sparse.data['results'][0]), {'id', 'title', 'price'})
+        self.assertEqual(sparse.data['results'][0]['title'], full.data['results'][0]['title'])
+        self.assertLess(len(sparse_queries), len(full_queries))
+        self.assertFalse(any('productimage' in query['sql'] for query in sparse_queries))
+        listing_sql = sparse_queries[-1]['sql']
+        self.assertIn('"product"."title_uz"', listing_sql)
+        self.assertNotIn('description', listing_sql)
+
+    def test_expand_selects_nested_relations(self):
+        response, queries = self.get(reverse('all-product'), {'expand': 'images'})
+
+        item = response.data['results'][0]
+        self.assertIn('images', item)
+        self.assertNotIn('features', item)
+        self.assertIn('description', item)
+        self.assertFalse(any('productvalue' in query['sql'] for query in queries))
+
+        response, _ = self.get(reverse('all-product'), {'expand': ''})
+        self.assertNotIn('images', response.data['results'][0])
+
+    def test_detail_and_category_listing(self):
+        detail, _ = self.get(reverse('product-detail', kwargs={'pk': self.product.pk}),
+                             {'fields': 'id,category,features'})
+        self.assertEqual(set(detail.data), {'id', 'category', 'features'})
+        self.assertEqual(detail.data['category'], self.category.slug)
+
+        listing, _ = self.get(reverse('product-by-category', kwargs={'slug': self.category.slug}),
+                              {'fields': 'id,title_en'})
+        self.assertEqual(set(listing.data['products'][0]), {'id', 'title_en'})
+
+    @override_settings(PRODUCT_CARDS_ENABLED=True)
+    def test_cards(self):
+        call_command('rebuild_product_cards', stdout=StringIO())
+        response, _ = self.get(reverse('all-product'), {'fields': 'id,images,category', 'expand': 'features'})
+
+        self.assertEqual(set(response.data['results'][0]), {'id', 'category'})
+
+    def test_comments_skip_user_join(self):
+        user = User.objects.create_user(phone_number='+998901234567', first_name='Ali')
+        self.product.comment_set.create(user=user, message='Great', rate=5, is_active=True)
+        url = reverse('list-comment', kwargs={'pk': self.product.pk})
+
+        full, _ = self.get(url)
+        sparse, queries = self.get(url, {'fields': 'message,rate'})
+
+        self.assertIn('user', full.data['results'][0])
+        self.assertEqual(sparse.data['results'], [{'rate': 5, 'message': 'Great'}])
+        self.assertNotIn('"user"', queries[-1]['sql'])
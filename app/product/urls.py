@@ -4,14 +4,18 @@ from app.product.views import CategoryAPIView, ProductAPIView, AllProductAPIView
     ProductByCategoryAPIView, CategoryDetailAPIView, ProductDetailAPIView, \
     ProductImageAPIView, ProductColorsAPIView, ColorAPIView, ProductFeaturesAPIView, ProductTypeAPIView, \
     ColorDetailAPIView, ProductImageDetailAPIVIew, ProductFeaturesDetailAPIView, ProductTypeDetailAPIView, \
-    ProductColorsDetailAPIView, ListCommentAPIView, DetailCommentAPIView
+    ProductColorsDetailAPIView, ListCommentAPIView, DetailCommentAPIView, ProductSearchAPIView, \
+    ProductFacetAPIView, ProductPurchasedAPIView
 
 urlpatterns = [
 
     # product
     path('<int:pk>/', ProductDetailAPIView.as_view(), name='product-detail'),
     path('all/', AllProductAPIView.as_view(), name='all-product'),
+    path('search/', ProductSearchAPIView.as_view(), name='product-search'),
+    path('facets/', ProductFacetAPIView.as_view(), name='product-facets'),
     path('create/', ProductAPIView.as_view(), name='create-product'),
+    path('<int:pk>/purchased/', ProductPurchasedAPIView.as_view(), name='product-purchased'),
 
     path('create-images/', ProductImageAPIView.as_view(), name='create-product-image'),
     path('detail-images/<int:pk>/', ProductImageDetailAPIVIew.as_view(), name='create-product-image'),
@@ -37,4 +41,7 @@ urlpatterns = [
     path('comments/<int:pk>/', DetailCommentAPIView.as_view(), name='detail-comment'),
 
     path('categories/<slug:slug>/products/', ProductByCategoryAPIView.as_view(), name='product-by-category'),
+
+    # last, so it does not shadow the fixed paths above
+    path('<slug:slug>/', ProductDetailAPIView.as_view(), name='product-detail-slug'),
 ]
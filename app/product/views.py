@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
@@ -5,13 +7,21 @@ from rest_framework.generics import ListAPIView, CreateAPIView, ListCreateAPIVie
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.core.cache import cache
-from app.product.models import Category, Product, Comment, CategoryImages, ProductImage, ProductColor, ProductValue, \
-    ProductType
+from app.order.purchases import has_purchased
+from app.product.cards import serve_card, CARD_ORDERING_COLUMNS
+from app.product.facets import filter_by_facets, get_facet_counts
+from app.product.filters import get_product_ordering, filter_by_price
+from app.product.projections import CategoryProductProjection, ProductListProjection, CommentProjection
+from app.product.models import Category, Product, Comment, ProductImage, ProductColor, ProductValue, \
+    ProductType, ProductCard
+from app.product.search import get_search_backend
 from app.product.serializers import CategorySerializer, ProductSerializer, AllProductSerializer, CommentSerializer, \
     CategoryImagesSerializer, ProductImageSerializer, ProductColorSerializer, ColorSerializer, ProductValueSerializer, \
-    ProductTypeSerializer, ProductGetSerializer, CategoryGetSerializer, ColorGetSerializer, ProductTypeGetSerializer
+    ProductTypeSerializer, ProductGetSerializer, CategoryGetSerializer, ColorGetSerializer, ProductTypeGetSerializer, \
+    CategoryProductSerializer
 from app.user.validations import IsAdminOrSuperAdmin, IsAdminOrOwner
+from app.utils.cache import cache_response, conditional_response
+from app.utils.mixins import QueryPlanMixin, ProjectionListMixin
 from app.utils.models import Color
 
 
@@ -26,26 +36,17 @@ class CategoryAPIView(APIView):
             return [IsAdminOrSuperAdmin()]
         return [IsAuthenticated()]
 
+    @conditional_response('category')
+    @cache_response('category')
     def get(self, request):
-        cache_key = "category_list"
-        data = cache.get(cache_key)
-
-        if not data:
-            print("🧠 Cache’da yo‘q — DB’dan olayapti...")
-            categories = Category.objects.filter(is_active=True).prefetch_related('images')
-            serializer = CategoryGetSerializer(categories, many=True, context={'request': request})
-            data = serializer.data
-            cache.set(cache_key, data, 60 * 10)
-        else:
-            print("⚡ Cache’dan olayapti!")
-
-        return Response(data, status=status.HTTP_200_OK)
+        categories = CategoryGetSerializer.setup_eager_loading(Category.objects.filter(is_active=True), request)
+        serializer = CategoryGetSerializer(categories, many=True, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
     def post(self, request):
         serializer = CategorySerializer(data=request.data)
         if serializer.is_valid():
             serializer.save()
-            cache.delete("category_list")  # 🧹 Cache’ni tozalash
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -63,8 +64,9 @@ class CategoryDetailAPIView(APIView):
             return [IsAdminOrSuperAdmin()]
         return [IsAuthenticated()]
 
+    @cache_response('category')
     def get(self, request, pk):
-        category = get_object_or_404(Category, pk=pk)
+        category = get_object_or_404(CategoryGetSerializer.setup_eager_loading(Category.objects.all(), request), pk=pk)
         serializer = CategoryGetSerializer(category, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -87,20 +89,97 @@ class CategoryDetailAPIView(APIView):
 
 
 @extend_schema(tags=['Product'])
-class AllProductAPIView(ListAPIView):
+class AllProductAPIView(ProjectionListMixin, QueryPlanMixin, ListAPIView):
     serializer_class = AllProductSerializer
+    projection_class = ProductListProjection
+    queryset = Product.objects.filter(is_active=True)
 
     def get_permissions(self):
         if self.request.method == 'GET':
             return [AllowAny()]
         return [IsAuthenticated()]
 
+    @property
+    def keyset_ordering(self):
+        return get_product_ordering(self.request, CARD_ORDERING_COLUMNS if settings.PRODUCT_CARDS_ENABLED else None)
+
+    @cache_response('product')
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        if not settings.PRODUCT_CARDS_ENABLED:
+            return super().list(request, *args, **kwargs)
+
+        cards = ProductCard.objects.filter(language=request.LANGUAGE_CODE)
+        name = request.GET.get('name')
+        if name:
+            cards = cards.filter(category__slug=name)
+        cards = filter_by_facets(cards, request.GET.getlist('facet'), product_field='product_id')
+        cards = filter_by_price(cards, request, price_field='product__price')
+        keyset = [field.lstrip('-') for field in self.keyset_ordering]
+        page = self.paginate_queryset(cards.values('data', *keyset))
+        return self.get_paginated_response([
+            AllProductSerializer.select_keys(serve_card(card['data'], request), request) for card in page
+        ])
+
     def get_queryset(self):
+        queryset = super().get_queryset()
         name = self.request.GET.get('name')
         if name:
-            return Product.objects.filter(is_active=True, category__slug=name)
-        else:
-            return Product.objects.filter(is_active=True)
+            queryset = queryset.filter(category__slug=name)
+        queryset = filter_by_price(queryset, self.request)
+        return filter_by_facets(queryset, self.request.GET.getlist('facet'))
+
+
+@extend_schema(tags=['Product'])
+class ProductFacetAPIView(APIView):
+    """
+    Precomputed facet counts of active products, for all products or one category (``?category=<slug>``).
+    """
+    permission_classes = [AllowAny]
+
+    @cache_response('product')
+    def get(self, request):
+        slug = request.GET.get('category')
+        category_id = get_object_or_404(Category, slug=slug).pk if slug else None
+        data = []
+        for key, count in get_facet_counts(category_id):
+            name, _, value = key.partition(':')
+            data.append({'key': key, 'name': name, 'value': value, 'count': count})
+        return Response(data, status=status.HTTP_200_OK)
+
+
+@extend_schema(tags=['Product'])
+class ProductSearchAPIView(ListAPIView):
+    """
+    Full-text search over the product titles and descriptions in every language, best match first.
+    """
+    serializer_class = AllProductSerializer
+    permission_classes = [AllowAny]
+    pagination_class = None
+    default_limit = 20
+    max_limit = 100
+
+    @cache_response('product')
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.GET.get('limit', self.default_limit))
+        except ValueError:
+            return self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+    def get_queryset(self):
+        query = self.request.GET.get('q', '')
+        product_ids = get_search_backend().search(query, self.get_limit())
+        products = AllProductSerializer.setup_eager_loading(
+            Product.objects.filter(pk__in=product_ids, is_active=True), self.request
+        )
+        rank = {product_id: position for position, product_id in enumerate(product_ids)}
+        return sorted(products, key=lambda product: rank[product.pk])
 
 
 @extend_schema(tags=['Product'])
@@ -151,6 +230,7 @@ class ProductFeaturesAPIView(ListCreateAPIView):
     permission_classes = [IsAdminOrSuperAdmin]
     queryset = ProductValue.objects.all()
     serializer_class = ProductValueSerializer
+    keyset_ordering = ('-id',)
 
 
 @extend_schema(tags=['Product features'])
@@ -253,6 +333,7 @@ class ProductColorsAPIView(ListCreateAPIView):
     permission_classes = [IsAdminOrSuperAdmin]
     queryset = ProductColor.objects.all()
     serializer_class = ProductColorSerializer
+    keyset_ordering = ('-id',)
 
 
 @extend_schema(tags=['Product color'])
@@ -288,21 +369,24 @@ class ProductDetailAPIView(APIView):
             return [IsAdminOrSuperAdmin()]
         return [IsAuthenticated()]
 
-    def get(self, request, pk):
-        product = get_object_or_404(Product, pk=pk)
+    @conditional_response('product')
+    @cache_response('product')
+    def get(self, request, pk=None, slug=None):
+        lookup = {'pk': pk} if slug is None else {'slug': slug}
+        product = get_object_or_404(ProductGetSerializer.setup_eager_loading(Product.objects.all(), request), **lookup)
         serializer = ProductGetSerializer(product, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
-    def put(self, request, pk):
-        product = get_object_or_404(Product, pk=pk)
+    def put(self, request, pk=None, slug=None):
+        product = get_object_or_404(Product, **({'pk': pk} if slug is None else {'slug': slug}))
         serializer = ProductSerializer(product, data=request.data, partial=True, context={'request': request})
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    def delete(self, request, pk):
-        product = get_object_or_404(Product, pk=pk)
+    def delete(self, request, pk=None, slug=None):
+        product = get_object_or_404(Product, **({'pk': pk} if slug is None else {'slug': slug}))
         if product.is_active:
             product.is_active = False
             product.save()
@@ -318,7 +402,20 @@ class CreateCommentAPIView(CreateAPIView):
     queryset = Comment.objects.all()
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user, is_active=True)
+        # the comment and the rating aggregates it updates commit together
+        with transaction.atomic():
+            serializer.save(user=self.request.user, is_active=True)
+
+
+@extend_schema(tags=['Product'])
+class ProductPurchasedAPIView(APIView):
+    """
+    Whether the current user has bought the product, i.e. may review it.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        return Response({'purchased': has_purchased(request.user.pk, pk)}, status=status.HTTP_200_OK)
 
 
 @extend_schema(tags=['Product comment'])
@@ -329,7 +426,6 @@ class DetailCommentAPIView(APIView):
         if self.request.method == 'GET':
             return [IsAuthenticated()]
         elif self.request.method == 'DELETE':
-            print('deleteee')
             return [IsAdminOrOwner()]
         return [IsAuthenticated()]
 
@@ -339,18 +435,21 @@ class DetailCommentAPIView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def delete(self, request, pk):
-        comment = get_object_or_404(Comment, pk=pk)
-        if comment.is_active:
+        with transaction.atomic():
+            # locked, so concurrent deletes take the comment out of the rating aggregates once
+            comment = get_object_or_404(Comment.objects.select_for_update(), pk=pk)
+            if not comment.is_active:
+                return Response({'message': "No comment available"}, status=status.HTTP_400_BAD_REQUEST)
             comment.is_active = False
             comment.save()
-        else:
-            return Response({'message': "No comment available"}, status=status.HTTP_400_BAD_REQUEST)
         return Response({'message': "Comment successfully deleted"}, status=status.HTTP_200_OK)
 
 
 @extend_schema(tags=['Product comment'])
-class ListCommentAPIView(ListAPIView):
+class ListCommentAPIView(ProjectionListMixin, QueryPlanMixin, ListAPIView):
     serializer_class = CommentSerializer
+    projection_class = CommentProjection
+    queryset = Comment.objects.all()
 
     def get_permissions(self):
         if self.request.method == 'GET':
@@ -359,26 +458,65 @@ class ListCommentAPIView(ListAPIView):
 
     def get_queryset(self):
         pk = self.kwargs.get('pk')
-        return Comment.objects.filter(is_active=True, product_id=pk)
+        return super().get_queryset().filter(is_active=True, product_id=pk)
 
 
-class ProductByCategoryAPIView(APIView):
+class ProductByCategoryAPIView(ProjectionListMixin, QueryPlanMixin, ListAPIView):
+    """
+    Active products of one category, paginated like the product listing, with their colours and the category
+    images. The query count is fixed: the category and its images, the page, then one query per nested relation.
+    """
+    serializer_class = CategoryProductSerializer
+    projection_class = CategoryProductProjection
+    queryset = Product.objects.filter(is_active=True)
 
     def get_permissions(self):
         if self.request.method == 'GET':
             return [AllowAny()]
         return [IsAuthenticated()]
 
-    def get(self, request, slug):
-        category = get_object_or_404(Category.objects.prefetch_related('products'), slug=slug)
-        products = category.products.all()
-        images = CategoryImages.objects.filter(category__slug=slug)
+    @property
+    def keyset_ordering(self):
+        return get_product_ordering(self.request, CARD_ORDERING_COLUMNS if settings.PRODUCT_CARDS_ENABLED else None)
+
+    @cache_response('product')
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        self.category = get_object_or_404(Category.objects.prefetch_related('images'), slug=kwargs['slug'])
+
+        if settings.PRODUCT_CARDS_ENABLED:
+            cards = ProductCard.objects.filter(language=request.LANGUAGE_CODE, category=self.category)
+            cards = filter_by_price(cards, request, price_field='product__price')
+            keyset = [field.lstrip('-') for field in self.keyset_ordering]
+            page = self.paginate_queryset(cards.values('data', *keyset))
+            page = [serve_card(card['data'], request) for card in page]
+            self.add_card_colors(page, request)
+            response = self.get_paginated_response([
+                CategoryProductSerializer.select_keys(card, request) for card in page
+            ])
+        else:
+            response = super().list(request, *args, **kwargs)
 
-        product_data = ProductSerializer(products, many=True, context={"request": request}).data
-        images_data = CategoryImagesSerializer(images, many=True).data
+        response.data['products'] = response.data.pop('results')
+        response.data['images'] = CategoryImagesSerializer(self.category.images.all(), many=True).data
+        return response
 
-        data = {
-            'products': product_data,
-            'images': images_data
-        }
-        return Response(data)
+    def get_queryset(self):
+        return filter_by_price(super().get_queryset().filter(category=self.category), self.request)
+
+    @staticmethod
+    def add_card_colors(cards, request):
+        # cards hold ``AllProductSerializer`` data; colours go before ``category``, as the serializer renders them
+        if not CategoryProductSerializer.is_selected('colors', *CategoryProductSerializer.get_selection(request)):
+            return
+        colors = ProductColor.objects.filter(product_id__in=[card['id'] for card in cards]) \
+            .select_related('color').order_by('pk')
+        by_product = {}
+        for color in ProductColorSerializer(colors, many=True, context={'request': request}).data:
+            by_product.setdefault(color['product'], []).append(color)
+        for card in cards:
+            category = card.pop('category')
+            card['colors'] = by_product.get(card['id'], [])
+            card['category'] = category
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0003_user_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='image_status',
+            field=models.CharField(choices=[('r', 'ready'), ('p', 'processing'), ('f', 'failed')], default='r', editable=False, max_length=1),
+        ),
+    ]
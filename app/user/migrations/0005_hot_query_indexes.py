@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0004_user_image_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='verificationotp',
+            index=models.Index(fields=['user', 'is_confirmed', 'expires_time'], name='verifyotp_user_pending_idx'),
+        ),
+    ]
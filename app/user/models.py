@@ -7,6 +7,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from app.user.utils import generate_code
 from app.user.validations import check_image_size, check_code_validator
 from app.user.validations import validate_phone_number
+from app.utils.images import ImageStatus
 from core.settings import OTP_TIME
 from django.contrib.auth.models import BaseUserManager
 
@@ -52,6 +53,9 @@ class User(AbstractUser):
         FileExtensionValidator(allowed_extensions=['jpg', 'jpeg', 'png', 'svg', 'webp', 'heic', 'heif', 'avif']),
         check_image_size
     ], null=True, blank=True)
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
+    image_status = models.CharField(max_length=1, choices=ImageStatus.choices, default=ImageStatus.ready,
+                                    editable=False)
     role = models.CharField(max_length=10, choices=UserRole.choices, default=UserRole.user)
     auth_type = models.CharField(max_length=10, choices=AuthType.choices, null=True, blank=True)
 
@@ -69,6 +73,9 @@ class User(AbstractUser):
     class Meta:
         db_table = 'user'
         ordering = ['-date_joined']
+        indexes = [
+            models.Index(fields=['role', 'is_active', 'date_joined', 'id'], name='user_role_joined_idx'),
+        ]
 
     def create_verify_code(self, auth_type):
         code = generate_code()
@@ -107,3 +114,6 @@ class VerificationOTP(models.Model):
         verbose_name = 'Verification OTP'
         verbose_name_plural = 'Verification OTP'
         db_table = 'verifyotp'
+        indexes = [
+            models.Index(fields=['user', 'is_confirmed', 'expires_time'], name='verifyotp_user_pending_idx'),
+        ]
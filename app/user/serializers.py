@@ -6,10 +6,11 @@ from django.contrib.auth.password_validation import validate_password
 from rest_framework.exceptions import ValidationError
 from app.user.models import User, VerificationOTP
 from app.user.validations import check_valid_phone, validate_phone_number
+from app.utils.serializers import MediaURLMixin, SrcsetField
 from app.utils.utility import send_phone_number_code
 
 
-class CreateUserSerializer(serializers.ModelSerializer):
+class CreateUserSerializer(MediaURLMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = (
@@ -64,7 +65,7 @@ class CreateUserSerializer(serializers.ModelSerializer):
         return user
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(MediaURLMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = (
@@ -214,10 +215,12 @@ class VerifyOTPSerializer(serializers.Serializer):
         return data
 
 
-class MeSerializer(serializers.ModelSerializer):
+class MeSerializer(MediaURLMixin, serializers.ModelSerializer):
+    srcset = SrcsetField()
+
     class Meta:
         model = User
-        fields = ("id", "full_name", "phone_number", "image")
+        fields = ("id", "full_name", "phone_number", "image", "image_status", "srcset")
 
         extra_kwargs = {
             "id": {"read_only": True},
@@ -0,0 +1,4 @@
+from app.user.models import User
+from app.utils.images import track_renditions
+
+track_renditions(User)
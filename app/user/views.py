@@ -16,6 +16,7 @@ from app.user.serializers import (
 )
 from app.user.utils import generate_code
 from app.user.validations import IsAdminOrSuperAdmin, validate_phone_number
+from app.utils.pagination import KeysetPagination
 from app.utils.utility import send_phone_number_code
 
 
@@ -23,11 +24,14 @@ from app.utils.utility import send_phone_number_code
 class UserAPIView(APIView):
     permission_classes = (AllowAny,)
     serializer_class = CreateUserSerializer
+    keyset_ordering = ('-date_joined', '-id')
 
     def get(self, request):
         user = User.objects.filter(role=User.UserRole.user, is_active=True)
-        serializer = UserSerializer(user, many=True, context={'request': request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(user, request, view=self)
+        serializer = UserSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = CreateUserSerializer(data=request.data, context={'request': request})
@@ -2,7 +2,7 @@ from django.contrib import admin
 from modeltranslation.admin import TranslationAdmin
 from unfold.admin import ModelAdmin as UnfoldModelAdmin
 
-from app.utils.models import Color, Location, Notification, Currency
+from app.utils.models import Color, Location, Notification, Currency, IdempotencyKey
 
 
 @admin.register(Color)
@@ -23,3 +23,9 @@ class NotificationAdmin(UnfoldModelAdmin):
 @admin.register(Currency)
 class CurrencyAdmin(TranslationAdmin, UnfoldModelAdmin):
     list_display = ('id', 'name_uz', 'name_en', 'name_ru')
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(UnfoldModelAdmin):
+    list_display = ('id', 'user', 'scope', 'key', 'status_code', 'created')
+    search_fields = ('key',)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class UtilsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.utils'
+
+    def ready(self):
+        from app.utils import signals  # noqa: F401
@@ -0,0 +1,211 @@
+import hashlib
+import time
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from app.utils.compression import select_encoding
+
+NAMESPACE_VERSION_KEY = 'cache_namespace:{}:version'
+LOCK_KEY = '{}:lock'
+ENCODED_RESPONSE_KEY = 'encoded_response:{}'
+ENCODED_RESPONSE_TIMEOUT = 60 * 10
+
+
+def _new_version():
+    # time based, so a version evicted from the cache never comes back with a value used before, and the
+    # version doubles as the namespace's last modification time
+    return time.time_ns()
+
+
+def get_namespace_versions(*namespaces):
+    keys = {NAMESPACE_VERSION_KEY.format(namespace): namespace for namespace in namespaces}
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), None)
+            versions[key] = cache.get(key)
+    return [versions[NAMESPACE_VERSION_KEY.format(namespace)] for namespace in namespaces]
+
+
+def bump_namespace(*namespaces):
+    for namespace in namespaces:
+        cache.set(NAMESPACE_VERSION_KEY.format(namespace), _new_version(), None)
+
+
+def build_cache_key(request, namespaces):
+    versions = get_namespace_versions(*namespaces)
+    language = getattr(request, 'LANGUAGE_CODE', settings.LANGUAGE_CODE)
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    scope = '.'.join(f'{namespace}{version}' for namespace, version in zip(namespaces, versions))
+    return f'view_cache:{scope}:{language}:{url}'
+
+
+def encoded_response_key(etag, encoding):
+    # the ETag covers the namespace versions, language, URL and ``Accept``
+    return ENCODED_RESPONSE_KEY.format(hashlib.md5(f'{etag}:{encoding}'.encode()).hexdigest())
+
+
+def _acquire_lock(key, timeout):
+    token = uuid.uuid4().hex
+    if cache.add(LOCK_KEY.format(key), token, timeout):
+        return token
+    return None
+
+
+def _release_lock(key, token):
+    lock_key = LOCK_KEY.format(key)
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def get_or_compute(key, compute, timeout, stale_timeout=None, lock_timeout=30, wait_timeout=10,
+                   poll_interval=0.05, should_cache=None):
+    """
+    Returns the value cached under ``key``, calling ``compute`` to fill it.
+
+    Only the worker holding the key's lock recomputes. After ``timeout`` seconds the value goes stale but is
+    still served to everyone else while the lock holder refreshes it, until ``stale_timeout`` more seconds
+    pass. On a cold miss the other workers wait for the lock holder instead of recomputing.
+    """
+    stale_timeout = timeout if stale_timeout is None else stale_timeout
+    entry = cache.get(key)
+
+    if entry is not None:
+        value, fresh_until = entry
+        if fresh_until > time.time():
+            return value
+        token = _acquire_lock(key, lock_timeout)
+        if token is None:
+            return value
+        try:
+            return _refresh(key, compute, timeout, stale_timeout, should_cache)
+        finally:
+            _release_lock(key, token)
+
+    deadline = time.time() + wait_timeout
+    while True:
+        token = _acquire_lock(key, lock_timeout)
+        if token is not None:
+            try:
+                entry = cache.get(key)
+                if entry is not None and entry[1] > time.time():
+                    return entry[0]
+                return _refresh(key, compute, timeout, stale_timeout, should_cache)
+            finally:
+                _release_lock(key, token)
+
+        time.sleep(poll_interval)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+        if time.time() >= deadline:
+            return compute()
+
+
+def _refresh(key, compute, timeout, stale_timeout, should_cache):
+    value = compute()
+    if should_cache is None or should_cache(value):
+        cache.set(key, (value, time.time() + timeout), timeout + stale_timeout)
+    return value
+
+
+def cache_response(*namespaces, timeout=60 * 10, stale_timeout=None):
+    """
+    Caches successful responses of an API view method per language and URL.
+    Keys embed the version of every namespace, so bumping a namespace drops all responses built from it.
+    Expiry goes through ``get_or_compute``: one worker rebuilds an expired response while the rest keep
+    serving the stale one.
+    """
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            cache_key = build_cache_key(request, namespaces)
+            computed = {}
+
+            def compute():
+                response = view_method(view, request, *args, **kwargs)
+                computed['response'] = response
+                return response.status_code, response.data
+
+            status_code, data = get_or_compute(
+                cache_key, compute, timeout, stale_timeout,
+                should_cache=lambda value: value[0] == status.HTTP_200_OK
+            )
+            if 'response' in computed:
+                return computed['response']
+            return Response(data, status=status_code)
+
+        return wrapper
+
+    return decorator
+
+
+def _not_modified(request, etag):
+    conditional = get_conditional_response(request, etag=etag)
+    if conditional is not None:
+        conditional.headers['ETag'] = etag
+        patch_vary_headers(conditional, ('Accept-Language',))
+    return conditional
+
+
+def conditional_response(*namespaces):
+    """
+    Adds an ``ETag`` to the successful responses of an API view method and answers a matching
+    ``If-None-Match`` with ``304 Not Modified``. Goes outside ``cache_response``, with the same namespaces.
+
+    The ETag hashes the versions of ``namespaces``, the language, URL and ``Accept``, so it is known before
+    the view runs and a revalidation costs a few cache reads, never a query. Like ``cache_response`` it
+    relies on a cache shared by the workers: with a per-process cache (locmem) a worker that did not handle
+    a write keeps its old version. ``If-None-Match: *`` is only answered after the view, so a missing
+    resource stays a 404.
+
+    ``CompressionMiddleware`` keeps the compressed body of each ETag for ``ENCODED_RESPONSE_TIMEOUT``
+    seconds, so a client asking for the same coding gets it back without compressing again.
+    """
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            accept = request.META.get('HTTP_ACCEPT', '')
+            cache_key = build_cache_key(request, namespaces)
+            etag = quote_etag(hashlib.md5(f'{cache_key}:{accept}'.encode()).hexdigest())
+            if request.META.get('HTTP_IF_NONE_MATCH', '').strip() != '*':
+                conditional = _not_modified(request, etag)
+                if conditional is not None:
+                    return conditional
+
+            response = view_method(view, request, *args, **kwargs)
+            patch_vary_headers(response, ('Accept-Language',))
+            if response.status_code != status.HTTP_200_OK or not hasattr(response, 'data'):
+                return response
+            conditional = _not_modified(request, etag)
+            if conditional is not None:
+                return conditional
+
+            encoding = select_encoding(request)
+            key = encoded_response_key(etag, encoding) if encoding else None
+            encoded = cache.get(key) if key else None
+            if encoded is not None:
+                content_type, content = encoded
+                response = HttpResponse(content, content_type=content_type)
+                response.headers['Content-Encoding'] = encoding
+                response.headers['ETag'] = f'W/{etag}'
+                patch_vary_headers(response, ('Accept-Language', 'Accept-Encoding'))
+                return response
+
+            response.encoded_response_key = key
+            response.headers['ETag'] = etag
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,94 @@
+import secrets
+
+from django.conf import settings
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# response types worth compressing; images and archives are compressed already
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml')
+# below this size the encoding headers outweigh the savings
+MIN_LENGTH = 200
+# random bytes added to every compressed body, so its length does not reveal how well secrets in the page
+# compress against attacker-controlled input (BREACH)
+MAX_RANDOM_BYTES = 100
+
+
+def available_encodings():
+    """
+    Content codings the server can produce, preferred first: brotli only when the package is installed.
+    """
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def parse_accept_encoding(header):
+    codings = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        codings[coding] = quality
+    return codings
+
+
+def select_encoding(request):
+    """
+    Picks the content coding for ``request`` out of ``Accept-Encoding``, honouring q-values and ``*``;
+    ``None`` means the identity coding.
+    """
+    codings = parse_accept_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    best, best_quality = None, 0.0
+    for coding in available_encodings():
+        quality = codings.get(coding, codings.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def padding_block(length):
+    """
+    A brotli metadata meta-block of ``length`` random bytes, which decoders skip. It must start on a byte
+    boundary; the gzip counterpart is the random file name ``compress_string`` writes into the gzip header.
+    """
+    # ISLAST 0, MNIBBLES 0 (coded 11), reserved 0, MSKIPBYTES 1, MSKIPLEN - 1, zeros to the byte boundary
+    header = 0b11 << 1 | 1 << 4 | (length - 1) << 6
+    return header.to_bytes(2, 'little') + secrets.token_bytes(length)
+
+
+def compress_brotli(content):
+    compressor = brotli.Compressor(quality=settings.BROTLI_QUALITY)
+    # flushing before any input writes the window size header byte aligned, so the padding can follow it
+    return (
+        compressor.flush() + padding_block(secrets.randbelow(MAX_RANDOM_BYTES) + 1)
+        + compressor.process(content) + compressor.finish()
+    )
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return compress_brotli(content)
+    if encoding == 'gzip':
+        return compress_string(content, max_random_bytes=MAX_RANDOM_BYTES)
+    raise ValueError(f'Unsupported content coding: {encoding}')
+
+
+def is_compressible(response):
+    content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+    return (
+        not response.streaming
+        and not response.has_header('Content-Encoding')
+        and content_type.startswith(COMPRESSIBLE_TYPES)
+        and len(response.content) >= MIN_LENGTH
+    )
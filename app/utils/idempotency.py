@@ -0,0 +1,122 @@
+import hashlib
+import json
+import time
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+from app.utils.models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+KEY_MAX_LENGTH = 255
+
+
+class IdempotencyConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'A request with this Idempotency-Key is still being processed.'
+    default_code = 'idempotency_conflict'
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = 'This Idempotency-Key was already used with a different request.'
+    default_code = 'idempotency_key_reused'
+
+
+def request_fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(f'{request.method}:{request.path}:{body}'.encode()).hexdigest()
+
+
+def claim_key(user, scope, key, fingerprint):
+    """
+    Returns ``(row, claimed)``: the ``IdempotencyKey`` of ``key`` and whether this request now owns it. Rows
+    past ``IDEMPOTENCY_KEY_TTL``, and in-flight rows older than ``IDEMPOTENCY_LOCK_TIMEOUT`` (their request
+    died), are taken over.
+    """
+    while True:
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                return IdempotencyKey.objects.create(user=user, scope=scope, key=key, fingerprint=fingerprint,
+                                                     created=now), True
+        except IntegrityError:
+            pass
+
+        row = IdempotencyKey.objects.filter(user=user, scope=scope, key=key).first()
+        if row is None:
+            # its request failed and released it meanwhile
+            continue
+        expired = row.created <= now - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+        abandoned = row.status_code is None and row.created <= now - timedelta(
+            seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT)
+        if not (expired or abandoned):
+            return row, False
+        taken = IdempotencyKey.objects.filter(pk=row.pk, created=row.created).update(
+            fingerprint=fingerprint, status_code=None, response=None, created=now
+        )
+        if taken:
+            row.fingerprint, row.status_code, row.response, row.created = fingerprint, None, None, now
+            return row, True
+
+
+def idempotent(scope):
+    """
+    Makes an API view method safe to retry with an ``Idempotency-Key`` header. The first response (anything
+    below 500) is stored for ``IDEMPOTENCY_KEY_TTL`` seconds and replayed to retries with the same key and
+    body, without running the view again; a view that raises (e.g. a validation error) releases the key. A
+    retry arriving while the first request is in flight waits for it, up to ``IDEMPOTENCY_WAIT_TIMEOUT``
+    seconds. Keys are scoped per user, anonymous requests are not tracked.
+    """
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            key = request.headers.get(HEADER)
+            if not key or not request.user.is_authenticated:
+                return view_method(view, request, *args, **kwargs)
+            if len(key) > KEY_MAX_LENGTH:
+                raise ValidationError({HEADER: [f'Ensure this field has no more than {KEY_MAX_LENGTH} characters.']})
+
+            fingerprint = request_fingerprint(request)
+            deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+            while True:
+                row, claimed = claim_key(request.user, scope, key, fingerprint)
+                if claimed:
+                    break
+                if row.fingerprint != fingerprint:
+                    raise IdempotencyKeyReused()
+                if row.status_code is not None:
+                    return Response(row.response, status=row.status_code, headers={REPLAYED_HEADER: 'true'})
+                if time.monotonic() >= deadline:
+                    raise IdempotencyConflict()
+                time.sleep(settings.IDEMPOTENCY_POLL_INTERVAL)
+
+            try:
+                response = view_method(view, request, *args, **kwargs)
+            except Exception:
+                IdempotencyKey.objects.filter(pk=row.pk).delete()
+                raise
+            if response.status_code >= 500 or not hasattr(response, 'data'):
+                IdempotencyKey.objects.filter(pk=row.pk).delete()
+            else:
+                IdempotencyKey.objects.filter(pk=row.pk).update(status_code=response.status_code,
+                                                                response=response.data)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def purge_expired_keys():
+    expired = timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+    deleted, _ = IdempotencyKey.objects.filter(created__lt=expired).delete()
+    return deleted
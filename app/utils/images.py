@@ -0,0 +1,284 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, models, transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+try:
+    import pillow_heif
+except ImportError:
+    pillow_heif = None
+
+logger = logging.getLogger(__name__)
+
+# longest side of each rendition; originals smaller than a preset are re-encoded at their own size
+RENDITION_SIZES = {'thumbnail': 160, 'card': 480, 'full': 1200}
+RENDITION_FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+    'avif': {'format': 'AVIF', 'quality': 60, 'speed': 8},
+}
+RENDITIONS_DIR = 'renditions'
+# uploads most browsers cannot show; they are transcoded to ``TRANSCODE_FORMAT`` before renditions are built
+TRANSCODED_EXTENSIONS = ('.heic', '.heif')
+TRANSCODE_FORMAT = {'extension': 'jpg', 'format': 'JPEG', 'quality': 90, 'optimize': True}
+
+_executor = None
+_process_pool = None
+_executor_lock = threading.Lock()
+# (model, field_name) of every ``track_renditions`` call
+_tracked = []
+
+
+class ImageStatus(models.TextChoices):
+    ready = 'r', 'ready'
+    processing = 'p', 'processing'
+    failed = 'f', 'failed'
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.IMAGE_WORKERS, thread_name_prefix='renditions')
+        return _executor
+
+
+def get_process_pool():
+    # decoding HEIF holds the GIL for seconds, so it runs in separate processes
+    global _process_pool
+    with _executor_lock:
+        if _process_pool is None:
+            # forking the multi-threaded server process could copy locks held by other threads (logging,
+            # database connections) into the child, where nothing releases them
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _process_pool = ProcessPoolExecutor(max_workers=settings.IMAGE_TRANSCODE_PROCESSES,
+                                                mp_context=multiprocessing.get_context(start_method))
+        return _process_pool
+
+
+def rendition_name(name, size, extension):
+    stem, _ = os.path.splitext(name)
+    return f'{RENDITIONS_DIR}/{stem}/{size}.{extension}'
+
+
+def build_renditions(name):
+    """
+    Resizes the stored image ``name`` to every ``RENDITION_SIZES`` preset in every ``RENDITION_FORMATS``
+    format. Returns ``{'source', 'width', 'height', 'srcset': {size: {'width', 'height', <format>: <name>}}}``;
+    files Pillow cannot read (e.g. SVG) only get ``source``, formats Pillow cannot encode are left out.
+    """
+    try:
+        with default_storage.open(name) as file, Image.open(file) as original:
+            original = ImageOps.exif_transpose(original)
+            original.load()
+    except (UnidentifiedImageError, OSError):
+        logger.warning('Cannot build renditions of %s', name, exc_info=True)
+        return {'source': name}
+
+    if original.mode not in ('RGB', 'RGBA'):
+        original = original.convert('RGBA' if 'A' in original.getbands() else 'RGB')
+    srcset = {}
+    for size, bound in RENDITION_SIZES.items():
+        image = original.copy()
+        image.thumbnail((bound, bound), Image.Resampling.LANCZOS)
+        entry = {'width': image.width, 'height': image.height}
+        for extension, options in RENDITION_FORMATS.items():
+            buffer = BytesIO()
+            try:
+                image.save(buffer, **options)
+            except (KeyError, OSError, ValueError):
+                # e.g. a Pillow build without an AVIF encoder; the other formats are still served
+                logger.warning('Cannot encode the %s %s rendition of %s', size, extension, name, exc_info=True)
+                continue
+            target = rendition_name(name, size, extension)
+            if default_storage.exists(target):
+                default_storage.delete(target)
+            entry[extension] = default_storage.save(target, ContentFile(buffer.getvalue()))
+        srcset[size] = entry
+    return {'source': name, 'width': original.width, 'height': original.height, 'srcset': srcset}
+
+
+def rendition_files(renditions):
+    return {
+        entry[extension]
+        for entry in renditions.get('srcset', {}).values() for extension in RENDITION_FORMATS if entry.get(extension)
+    }
+
+
+def delete_renditions(renditions, keep=()):
+    for name in rendition_files(renditions) - set(keep):
+        default_storage.delete(name)
+
+
+def update_renditions(model, pk, field_name, name):
+    """
+    Builds the renditions of ``name`` and stores them on the row, unless its image was replaced meanwhile.
+    Saved with ``update_fields``, so the model's cache invalidation signals run.
+    """
+    renditions = build_renditions(name)
+    with transaction.atomic():
+        instance = model._default_manager.select_for_update().filter(pk=pk).first()
+        if instance is None or getattr(instance, field_name).name != name:
+            delete_renditions(renditions)
+            return
+        stale = instance.renditions
+        instance.renditions = renditions
+        instance.save(update_fields=['renditions'])
+    delete_renditions(stale, keep=rendition_files(renditions))
+
+
+def needs_transcoding(name):
+    return os.path.splitext(name)[1].lower() in TRANSCODED_EXTENSIONS
+
+
+def transcode(content):
+    """
+    Decodes HEIC/HEIF bytes and returns them encoded as ``TRANSCODE_FORMAT``. Runs in the process pool, so
+    it only deals with bytes.
+    """
+    if pillow_heif is None:
+        raise RuntimeError('pillow-heif is required to decode HEIC/HEIF images')
+    pillow_heif.register_heif_opener()
+    with Image.open(BytesIO(content)) as image:
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        options = {key: value for key, value in TRANSCODE_FORMAT.items() if key != 'extension'}
+        buffer = BytesIO()
+        image.save(buffer, **options)
+    return buffer.getvalue()
+
+
+def transcode_image(model, pk, field_name, name):
+    """
+    Transcodes the stored upload ``name`` and swaps the row over to the result, unless its image was
+    replaced meanwhile. Failures leave the original in place with ``ImageStatus.failed``.
+    """
+    with default_storage.open(name) as file:
+        content = file.read()
+    try:
+        if settings.IMAGE_PIPELINE_EAGER:
+            content = transcode(content)
+        else:
+            content = get_process_pool().submit(transcode, content).result()
+    except Exception:
+        logger.exception('Cannot transcode %s', name)
+        with transaction.atomic():
+            instance = model._default_manager.select_for_update().filter(pk=pk).first()
+            if instance is not None and getattr(instance, field_name).name == name:
+                instance.image_status = ImageStatus.failed
+                instance.save(update_fields=['image_status'])
+        return
+
+    stem, _ = os.path.splitext(name)
+    transcoded = default_storage.save(f"{stem}.{TRANSCODE_FORMAT['extension']}", ContentFile(content))
+    with transaction.atomic():
+        instance = model._default_manager.select_for_update().filter(pk=pk).first()
+        if instance is None or getattr(instance, field_name).name != name:
+            default_storage.delete(transcoded)
+            return
+        setattr(instance, field_name, transcoded)
+        instance.image_status = ImageStatus.ready
+        # saving the new name queues its renditions
+        instance.save(update_fields=[field_name, 'image_status'])
+        transaction.on_commit(lambda: default_storage.delete(name))
+
+
+def requeue_processing_images():
+    """
+    Transcodes again the uploads a restart left ``ImageStatus.processing``, inline, and returns how many
+    there were.
+    """
+    count = 0
+    for model, field_name in _tracked:
+        if not any(field.name == 'image_status' for field in model._meta.concrete_fields):
+            continue
+        stuck = model._default_manager.filter(image_status=ImageStatus.processing).values_list('pk', field_name)
+        for pk, name in stuck.iterator():
+            count += 1
+            if name and needs_transcoding(name):
+                transcode_image(model, pk, field_name, name)
+            else:
+                model._default_manager.filter(pk=pk, image_status=ImageStatus.processing).update(
+                    image_status=ImageStatus.ready)
+    return count
+
+
+def get_srcset(renditions, name, url):
+    """
+    The ``srcset`` map served for an image: the renditions with media names turned into URLs by ``url``,
+    or ``{}`` while the renditions of the current image ``name`` are not built yet.
+    """
+    if not name or renditions.get('source') != name:
+        return {}
+    return {
+        size: {key: url(value) if key in RENDITION_FORMATS else value for key, value in entry.items()}
+        for size, entry in renditions.get('srcset', {}).items()
+    }
+
+
+def _run_in_worker(function, *args):
+    try:
+        function(*args)
+    except Exception:
+        logger.exception('Image rendition task failed')
+    finally:
+        close_old_connections()
+
+
+def schedule_renditions(instance, field_name='image', task=update_renditions):
+    """
+    Queues ``task`` (``update_renditions`` or ``transcode_image``) for the image of ``instance`` once the
+    current transaction commits. Runs inline with ``IMAGE_PIPELINE_EAGER``.
+    """
+    name = getattr(instance, field_name).name
+    args = (type(instance), instance.pk, field_name, name)
+    if settings.IMAGE_PIPELINE_EAGER:
+        transaction.on_commit(lambda: task(*args))
+    else:
+        transaction.on_commit(lambda: get_executor().submit(_run_in_worker, task, *args))
+
+
+def track_renditions(model, field_name='image'):
+    """
+    Keeps ``model.renditions`` in line with ``model.<field_name>``: new uploads are queued for the worker
+    pool, replaced and deleted images drop their renditions. Models with an ``image_status`` field also get
+    HEIC/HEIF uploads transcoded first, ``ImageStatus.processing`` until then.
+    """
+    transcodes = any(field.name == 'image_status' for field in model._meta.concrete_fields)
+    _tracked.append((model, field_name))
+
+    def on_pre_save(sender, instance, update_fields=None, **kwargs):
+        if update_fields is not None and field_name not in update_fields:
+            return
+        file = getattr(instance, field_name)
+        # only a new upload, the stored file is not committed yet
+        if file and not file._committed:
+            instance.image_status = ImageStatus.processing if needs_transcoding(file.name) else ImageStatus.ready
+
+    def on_save(sender, instance, update_fields=None, **kwargs):
+        if update_fields is not None and field_name not in update_fields:
+            return
+        name = getattr(instance, field_name).name
+        built_for = instance.renditions.get('source')
+        if not name or built_for == name:
+            return
+        if transcodes and instance.image_status == ImageStatus.processing:
+            schedule_renditions(instance, field_name, task=transcode_image)
+        elif not needs_transcoding(name):
+            schedule_renditions(instance, field_name)
+
+    def on_delete(sender, instance, **kwargs):
+        if instance.renditions:
+            transaction.on_commit(lambda: delete_renditions(instance.renditions))
+
+    if transcodes:
+        pre_save.connect(on_pre_save, sender=model, weak=False, dispatch_uid=f'renditions_pre_save_{model._meta.label}')
+    post_save.connect(on_save, sender=model, weak=False, dispatch_uid=f'renditions_save_{model._meta.label}')
+    post_delete.connect(on_delete, sender=model, weak=False, dispatch_uid=f'renditions_delete_{model._meta.label}')
@@ -0,0 +1,174 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from app.bot.models import BotUser
+from app.order.models import Order
+from app.product.models import Category, Comment, Product
+from app.user.models import User, VerificationOTP
+from app.utils.models import Notification
+
+MARKER = 'Benchmark'
+PHONE_PREFIX = '+99800'
+
+
+class Command(BaseCommand):
+    help = ('Prints the query plans and latency of the hot filters with and without their indexes on generated '
+            'rows. The indexes are dropped and recreated around the "without" pass; generated rows are rolled '
+            'back, or deleted on backends without transactional DDL (MySQL).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=2_000)
+        parser.add_argument('--products', type=int, default=20_000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--rows', type=int, default=50_000,
+                            help='Orders, comments, OTPs, notifications and bot users generated of each')
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--no-explain', action='store_true', help='Print timings only')
+
+    def handle(self, *args, **options):
+        self.runs = options['runs']
+        self.explain = not options['no_explain']
+
+        if connection.features.can_rollback_ddl:
+            # the SQLite schema editor refuses to run with constraint checks on inside a transaction
+            with connection.constraint_checks_disabled(), transaction.atomic():
+                self.benchmark(options)
+                transaction.set_rollback(True)
+            self.stdout.write(self.style.SUCCESS('Benchmark finished, generated rows rolled back'))
+            return
+
+        # MySQL commits before every DDL statement, so nothing could be rolled back
+        try:
+            self.benchmark(options)
+        finally:
+            self.cleanup()
+        self.stdout.write(self.style.SUCCESS('Benchmark finished, generated rows deleted'))
+
+    def benchmark(self, options):
+        users, categories, products, codes = self.generate(options['users'], options['products'],
+                                                           options['categories'], options['rows'])
+        rng = random.Random(1)
+        user, category, product = rng.choice(users), rng.choice(categories), rng.choice(products)
+        now = timezone.now()
+
+        cases = [
+            ('order history', Order, Order.objects.filter(user=user).order_by('-created', '-id'),
+             ['order_user_created_idx']),
+            ('orders by status', Order,
+             Order.objects.filter(status=Order.OrderStatus.Pending, created__gte=now - timedelta(days=7))
+             .order_by('-created', '-id'),
+             ['order_status_created_idx']),
+            ('product comments', Comment,
+             Comment.objects.filter(product=product, is_active=True).order_by('-created', '-id'),
+             ['comment_product_created_idx']),
+            ('active products', Product, Product.objects.filter(is_active=True).order_by('-created', '-id'),
+             ['product_created_idx', 'product_active_created_idx']),
+            ('active products of a category', Product,
+             Product.objects.filter(is_active=True, category=category).order_by('-created', '-id'),
+             ['product_category_created_idx', 'product_active_category_idx']),
+            ('pending OTP', VerificationOTP,
+             VerificationOTP.objects.filter(user=user, is_confirmed=False, expires_time__gte=now),
+             ['verifyotp_user_pending_idx']),
+            ('notifications', Notification,
+             Notification.objects.filter(Q(user=user) | Q(private=False)).order_by('-created'),
+             ['notification_user_created_idx', 'notification_public_idx']),
+            # tmp_code is unique, its index cannot be dropped without the constraint
+            ('bot user by code', BotUser, BotUser.objects.filter(tmp_code=rng.choice(codes)), []),
+        ]
+        for label, model, queryset, index_names in cases:
+            queryset = queryset[:20]
+            indexed = self.measure(queryset)
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(f'  with indexes: {indexed:.2f} ms')
+            self.write_plan(queryset)
+            if not index_names:
+                continue
+
+            indexes = [index for index in model._meta.indexes if index.name in index_names]
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.remove_index(model, index)
+            try:
+                self.stdout.write(f'  without {", ".join(index_names)}: {self.measure(queryset):.2f} ms')
+                self.write_plan(queryset)
+            finally:
+                with connection.schema_editor() as editor:
+                    for index in indexes:
+                        editor.add_index(model, index)
+
+    def generate(self, user_count, product_count, category_count, count):
+        rng = random.Random(0)
+        now = timezone.now()
+
+        def moment(days=365):
+            return now - timedelta(minutes=rng.randint(0, days * 1_440))
+
+        User.objects.bulk_create(
+            (User(phone_number=f'{PHONE_PREFIX}{i:07d}', username=f'benchmark-index-{i}', full_name=MARKER,
+                  date_joined=moment()) for i in range(user_count)),
+            batch_size=1_000
+        )
+        # MySQL does not return primary keys from bulk inserts
+        users = list(User.objects.filter(phone_number__startswith=PHONE_PREFIX).values_list('id', flat=True))
+        categories = [Category.objects.create(name=f'{MARKER} index {i}') for i in range(category_count)]
+        Product.objects.bulk_create(
+            (Product(category=categories[i % category_count], title=f'{MARKER} product {i}', price=100 + i,
+                     is_active=rng.random() < 0.9, created=moment()) for i in range(product_count)),
+            batch_size=1_000
+        )
+        products = list(Product.objects.filter(category__in=categories).values_list('id', flat=True))
+
+        Order.objects.bulk_create(
+            (Order(user_id=rng.choice(users), status=rng.choice(Order.OrderStatus.values), receive='d',
+                   payment='cash', price=100, created=moment()) for _ in range(count)),
+            batch_size=1_000
+        )
+        Comment.objects.bulk_create(
+            (Comment(user_id=rng.choice(users), product_id=rng.choice(products), rate=rng.randint(1, 5),
+                     message=MARKER, is_active=rng.random() < 0.8, created=moment()) for _ in range(count)),
+            batch_size=1_000
+        )
+        VerificationOTP.objects.bulk_create(
+            (VerificationOTP(user_id=rng.choice(users), code=f'{rng.randint(0, 999_999):06d}',
+                             is_confirmed=rng.random() < 0.9, expires_time=moment(days=30) + timedelta(days=30),
+                             auth_type=VerificationOTP.AuthType.phone_number) for _ in range(count)),
+            batch_size=1_000
+        )
+        Notification.objects.bulk_create(
+            (Notification(user_id=rng.choice(users) if rng.random() < 0.95 else None, title=MARKER,
+                          private=rng.random() < 0.95, created=moment()) for _ in range(count)),
+            batch_size=1_000
+        )
+        codes = [f'{i:06d}' for i in rng.sample(range(1_000_000), count)]
+        BotUser.objects.bulk_create(
+            (BotUser(username=MARKER, tmp_code=code, created=moment()) for code in codes), batch_size=1_000
+        )
+        return users, categories, products, codes
+
+    def cleanup(self):
+        # orders, comments, OTPs and notifications go with their users
+        User.objects.filter(phone_number__startswith=PHONE_PREFIX).delete()
+        Notification.objects.filter(user=None, title=MARKER).delete()
+        Product.objects.filter(category__name__startswith=f'{MARKER} index').delete()
+        Category.objects.filter(name__startswith=f'{MARKER} index').delete()
+        BotUser.objects.filter(username=MARKER).delete()
+
+    def write_plan(self, queryset):
+        if self.explain:
+            for line in queryset.explain().splitlines():
+                self.stdout.write(f'    {line}')
+
+    def measure(self, queryset):
+        timings = []
+        for _ in range(self.runs):
+            start = time.perf_counter()
+            list(queryset.values_list('id', flat=True))
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
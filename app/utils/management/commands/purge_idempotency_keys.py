@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from app.utils.idempotency import purge_expired_keys
+
+
+class Command(BaseCommand):
+    help = 'Deletes stored Idempotency-Key responses older than IDEMPOTENCY_KEY_TTL'
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_keys()
+        self.stdout.write(self.style.SUCCESS(f'Purged {deleted} idempotency keys'))
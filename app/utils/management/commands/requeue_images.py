@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from app.utils.images import requeue_processing_images
+
+
+class Command(BaseCommand):
+    help = 'Transcodes the HEIC/HEIF uploads left in the processing status, e.g. by a restart'
+
+    def handle(self, *args, **options):
+        count = requeue_processing_images()
+        self.stdout.write(self.style.SUCCESS(f'Requeued {count} images'))
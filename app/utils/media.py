@@ -0,0 +1,46 @@
+from functools import cache
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.encoding import filepath_to_uri
+
+
+@cache
+def cdn_base():
+    # read once per process; '' serves media from the request host
+    base = getattr(settings, 'MEDIA_CDN_BASE', '')
+    return base.rstrip('/') + '/' if base else ''
+
+
+@receiver(setting_changed)
+def reset_cdn_base(setting, **kwargs):
+    if setting in ('MEDIA_CDN_BASE', 'MEDIA_URL'):
+        cdn_base.cache_clear()
+
+
+def media_prefix(request=None):
+    """
+    What every media URL starts with: ``MEDIA_CDN_BASE``, or the storage base URL made absolute for
+    ``request``, resolved once per request.
+    """
+    base = cdn_base()
+    if base:
+        return base
+    if request is None:
+        return default_storage.base_url
+    prefix = getattr(request, '_media_prefix', None)
+    if prefix is None:
+        prefix = request._media_prefix = request.build_absolute_uri(default_storage.base_url)
+    return prefix
+
+
+def media_url(name, request=None):
+    """
+    ``request.build_absolute_uri(default_storage.url(name))``, or the ``MEDIA_CDN_BASE`` URL of ``name``,
+    built by concatenation. ``None`` for an empty ``name``.
+    """
+    if not name:
+        return None
+    return media_prefix(request) + filepath_to_uri(name).lstrip('/')
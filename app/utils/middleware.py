@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.utils.cache import patch_vary_headers
+
+from app.utils.cache import ENCODED_RESPONSE_TIMEOUT
+from app.utils.compression import compress, is_compressible, select_encoding
+
+
+class CompressionMiddleware:
+    """
+    Compresses text and JSON responses with the best coding the client accepts: brotli when installed,
+    gzip otherwise. Goes right after ``WhiteNoiseMiddleware``, which serves its own precompressed files.
+
+    Responses of ``conditional_response`` views carry ``encoded_response_key``; their compressed body is
+    cached under it and served again by the view decorator while the ETag stays the same.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = select_encoding(request)
+        if encoding is None:
+            return response
+
+        content = compress(response.content, encoding)
+        if len(content) >= len(response.content):
+            return response
+        response.content = content
+        response.headers['Content-Length'] = str(len(content))
+        response.headers['Content-Encoding'] = encoding
+        # the representation changed, so a strong ETag becomes weak (RFC 9110 8.8.1)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = f'W/{etag}'
+
+        key = getattr(response, 'encoded_response_key', None)
+        if key:
+            cache.set(key, (response['Content-Type'], content), ENCODED_RESPONSE_TIMEOUT)
+        return response
@@ -0,0 +1,143 @@
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.serializers import ListSerializer
+
+
+class EagerLoadingMixin:
+    """
+    Serializer mixin declaring which relations the serializer walks, so views can load them up front
+    instead of issuing one query per row.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, request=None, columns=()):
+        if cls.select_related_fields:
+            queryset = queryset.select_related(*cls.select_related_fields)
+        if cls.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*cls.prefetch_related_fields)
+        return queryset
+
+
+class SparseFieldsetMixin(EagerLoadingMixin):
+    """
+    Serializer mixin for ``?fields=`` (the top-level keys to render) and ``?expand=`` (which of the nested
+    ``expandable_fields`` to render; all of them when absent) on safe requests.
+
+    ``field_relations`` names the select/prefetch lookups behind each key, so ``setup_eager_loading`` skips
+    the relations of keys left out and narrows the columns with ``only()``; ``field_columns`` names the
+    columns read by computed keys. Keys added in ``to_representation`` should be guarded with ``is_requested``.
+    """
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+    expandable_fields = ()
+    field_relations = {}
+    field_columns = {}
+
+    @classmethod
+    def get_selection(cls, request):
+        if getattr(request, 'query_params', None) is None or request.method not in SAFE_METHODS:
+            return None, None
+        return cls._parse_names(request, cls.fields_query_param), cls._parse_names(request, cls.expand_query_param)
+
+    @staticmethod
+    def _parse_names(request, param):
+        if param not in request.query_params:
+            return None
+        return {
+            name.strip() for value in request.query_params.getlist(param) for name in value.split(',') if name.strip()
+        }
+
+    @classmethod
+    def is_selected(cls, name, fields, expand):
+        if fields is not None and name not in fields:
+            return False
+        if expand is not None and name in cls.expandable_fields and name not in expand:
+            return False
+        return True
+
+    @classmethod
+    def select_keys(cls, data, request):
+        """
+        Applies the selection to already rendered data, e.g. product cards.
+        """
+        fields, expand = cls.get_selection(request)
+        return {key: value for key, value in data.items() if cls.is_selected(key, fields, expand)}
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, request=None, columns=()):
+        fields, expand = cls.get_selection(request)
+        if fields is None and expand is None:
+            return super().setup_eager_loading(queryset, request, columns)
+
+        needed, dropped = set(), set()
+        for name, lookups in cls.field_relations.items():
+            (needed if cls.is_selected(name, fields, expand) else dropped).update(lookups)
+        dropped -= needed
+
+        select_related = [lookup for lookup in cls.select_related_fields if lookup not in dropped]
+        prefetch_related = [lookup for lookup in cls.prefetch_related_fields if lookup not in dropped]
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+
+        if fields is not None:
+            opts = queryset.model._meta
+            concrete = {field.name for field in opts.concrete_fields}
+            names = {opts.pk.name, *columns, *(lookup.split('__')[0] for lookup in select_related)}
+            names.update(name for name in fields if name in concrete)
+            names.update(column for name in fields for column in cls.field_columns.get(name, ()))
+            queryset = queryset.only(*names)
+        return queryset
+
+    def _get_own_selection(self):
+        if not hasattr(self, '_selection'):
+            # only the serializer the view renders follows the query string, not copies nested in other ones
+            parent = self.parent.parent if isinstance(self.parent, ListSerializer) else self.parent
+            self._selection = self.get_selection(self.context.get('request')) if parent is None else (None, None)
+        return self._selection
+
+    def is_requested(self, name):
+        return self.is_selected(name, *self._get_own_selection())
+
+    def get_fields(self):
+        fields = super().get_fields()
+        return {name: field for name, field in fields.items() if self.is_requested(name)}
+
+
+class QueryPlanMixin:
+    """
+    Generic view mixin applying the eager loading plan of the view's serializer to ``get_queryset``.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, 'setup_eager_loading'):
+            keyset = [name.lstrip('-') for name in getattr(self, 'keyset_ordering', ())]
+            queryset = serializer_class.setup_eager_loading(queryset, request=self.request, columns=keyset)
+        return queryset
+
+
+class ProjectionListMixin:
+    """
+    List view mixin rendering through ``projection_class`` (see ``app.utils.projections``) instead of the
+    serializer while ``COMPILED_SERIALIZERS_ENABLED`` is on.
+    """
+    projection_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.projection_class is None or not settings.COMPILED_SERIALIZERS_ENABLED:
+            return super().list(request, *args, **kwargs)
+
+        projection = self.projection_class(request)
+        get_ordering = getattr(self.paginator, 'get_ordering', None)
+        keyset = [name.lstrip('-') for name in get_ordering(self)] if get_ordering else []
+        rows = projection.get_rows(self.filter_queryset(self.get_queryset()), keyset)
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(projection.serialize(rows))
+        return self.get_paginated_response(projection.serialize(page))
@@ -1,3 +1,4 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import FileExtensionValidator
 from django.db import models
 from django.utils import timezone
@@ -12,6 +13,7 @@ class Color(models.Model):
         check_image_size
     ])
     name = models.CharField(max_length=20)
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self):
         return str(self.name)
@@ -48,6 +50,10 @@ class Notification(models.Model):
 
     class Meta:
         db_table = 'notification'
+        indexes = [
+            models.Index(fields=['user', 'created', 'id'], name='notification_user_created_idx'),
+            models.Index(fields=['private', 'created', 'id'], name='notification_public_idx'),
+        ]
 
 
 class Currency(models.Model):
@@ -55,3 +61,29 @@ class Currency(models.Model):
 
     def __str__(self):
         return str(self.name)
+
+
+class IdempotencyKey(models.Model):
+    """
+    The stored outcome of a request sent with an ``Idempotency-Key`` header (see ``app.utils.idempotency``);
+    ``status_code`` stays empty while the first request is in flight.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    scope = models.CharField(max_length=30)
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.scope} | {self.key}"
+
+    class Meta:
+        db_table = 'idempotencykey'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'scope', 'key'], name='idempotencykey_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['created'], name='idempotencykey_created_idx'),
+        ]
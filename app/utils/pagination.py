@@ -0,0 +1,236 @@
+import base64
+import binascii
+import hashlib
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator keeping ``COUNT(*)`` results in the cache, so paging through a large table does not recount it
+    on every page.
+    """
+    count_timeout = 60
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        try:
+            sql = str(query) if query is not None else None
+        except EmptyResultSet:
+            return 0
+        if sql is None:
+            return super().count
+
+        cache_key = 'paginator_count:' + hashlib.md5(sql.encode()).hexdigest()
+        count = cache.get(cache_key)
+        if count is None:
+            count = super().count
+            cache.set(cache_key, count, self.count_timeout)
+        return count
+
+
+class CachedCountPageNumberPagination(PageNumberPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    django_paginator_class = CachedCountPaginator
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination seeking on a composite key (``(created, id)`` by default) instead of an offset,
+    so deep pages cost the same as the first one when the key is backed by an index.
+
+    Views pick the key with ``keyset_ordering``. Passing ``?page=`` switches to page-number pagination
+    with a cached total count, for the admin front-end.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE or 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created', '-id')
+    page_number_query_param = 'page'
+    page_number_class = CachedCountPageNumberPagination
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.keyset = self.get_ordering(view)
+        queryset = queryset.order_by(*self.keyset)
+
+        self.page_number_paginator = None
+        if self.page_number_query_param in request.query_params:
+            self.page_number_paginator = self.page_number_class()
+            self.page_number_paginator.page_size = self.page_size
+            return self.page_number_paginator.paginate_queryset(queryset, request, view)
+
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        position, reverse = self.decode_cursor(request, queryset.model)
+
+        if reverse:
+            queryset = queryset.order_by(*[self._flip(name) for name in self.keyset])
+        if position is not None:
+            queryset = queryset.filter(self._seek(position, reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        if self.page_number_paginator is not None:
+            return self.page_number_paginator.get_paginated_response(data)
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.page_number_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Switches to page-number pagination with a total count.',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, 'keyset_ordering', self.ordering))
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def encode_cursor(self, item, reverse):
+        position = [self._serialize(self._get_value(item, name.lstrip('-'))) for name in self.keyset]
+        payload = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            raw_position = payload['p']
+            if len(raw_position) != len(self.keyset):
+                raise ValueError
+            position = [
+                self._get_field(model, name.lstrip('-')).to_python(value)
+                for name, value in zip(self.keyset, raw_position)
+            ]
+            return position, bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _seek(self, position, reverse):
+        condition = Q()
+        for index, name in enumerate(self.keyset):
+            field = name.lstrip('-')
+            descending = name.startswith('-')
+            lookup = 'gt' if descending == reverse else 'lt'
+            clause = Q(**{f'{field}__{lookup}': position[index]})
+            for previous_name, previous_value in zip(self.keyset[:index], position[:index]):
+                clause &= Q(**{previous_name.lstrip('-'): previous_value})
+            condition |= clause
+        # redundant bound on the leading column, so the planner can start an index range scan at the cursor
+        # instead of filtering the ``OR`` row by row
+        field = self.keyset[0].lstrip('-')
+        lookup = 'gte' if self.keyset[0].startswith('-') == reverse else 'lte'
+        return Q(**{f'{field}__{lookup}': position[0]}) & condition
+
+    @staticmethod
+    def _flip(name):
+        return name[1:] if name.startswith('-') else f'-{name}'
+
+    @staticmethod
+    def _get_field(model, name):
+        # follows ``__`` paths, for keys ordering on a related model's column
+        *relations, name = name.split('__')
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        field = model._meta.get_field(name)
+        return getattr(field, 'output_field', field)
+
+    @staticmethod
+    def _get_value(item, name):
+        if isinstance(item, dict):
+            return item[name]
+        return getattr(item, name)
+
+    @staticmethod
+    def _serialize(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
@@ -0,0 +1,115 @@
+from collections import defaultdict
+from types import SimpleNamespace
+
+from django.conf import settings
+from modeltranslation.fields import NONE
+from modeltranslation.utils import get_language, resolution_order, fallbacks_enabled
+from rest_framework import serializers
+
+from app.utils.media import media_url
+
+
+def decimal_formatter(model, field_name):
+    """
+    Formats values of a model ``DecimalField`` exactly like the serializer field ``ModelSerializer`` maps it to.
+    """
+    model_field = model._meta.get_field(field_name)
+    # generated columns carry the type on their output field
+    model_field = getattr(model_field, 'output_field', model_field)
+    field = serializers.DecimalField(max_digits=model_field.max_digits, decimal_places=model_field.decimal_places)
+    return lambda value: None if value is None else field.to_representation(value)
+
+
+def datetime_formatter():
+    field = serializers.DateTimeField()
+    return lambda value: None if value is None else field.to_representation(value)
+
+
+def translator(model, field_name, prefix=''):
+    """
+    Compiles reading a modeltranslation field for the active language, with the same fallbacks as reading it
+    from an instance, out of the ``<prefix><field>_<lang>`` columns of ``values()`` rows.
+    """
+    descriptor = vars(model)[field_name]
+    default = descriptor.field.get_default()
+    undefined = default if descriptor.fallback_undefined is NONE else descriptor.fallback_undefined
+    if fallbacks_enabled() and descriptor.fallback_value is not NONE:
+        default = descriptor.fallback_value
+    columns = [
+        f'{prefix}{field_name}_{language}'
+        for language in resolution_order(get_language(), descriptor.fallback_languages)
+    ]
+
+    def read(row):
+        for column in columns:
+            value = row[column]
+            if value is not None and value != undefined:
+                return value
+        return default
+
+    return read
+
+
+def translated_columns(field_name, prefix=''):
+    return tuple(f'{prefix}{field_name}_{code}' for code, _ in settings.LANGUAGES)
+
+
+def group_by(rows, key):
+    groups = defaultdict(list)
+    for row in rows:
+        groups[row[key]].append(row)
+    return groups
+
+
+class Projection:
+    """
+    Compiled, read-only counterpart of a model serializer: reads a flat ``values()`` projection of the
+    queryset and assembles the output dicts in one pass, with one extra query per nested relation.
+
+    ``get_fields`` lists ``(key, columns, getter)`` in output order; the keys picked by ``?fields=`` /
+    ``?expand=`` of ``serializer_class`` are compiled once per request, so only their columns are read.
+    The output must stay identical to ``serializer_class``.
+    """
+    serializer_class = None
+
+    def __init__(self, request):
+        self.request = request
+        self.language = getattr(request, 'LANGUAGE_CODE', settings.LANGUAGE_CODE)
+        self.selection = self.serializer_class.get_selection(request)
+        self.getters = []
+        self.columns = {'id': None}
+        for key, columns, getter in self.get_fields():
+            if self.wants(key):
+                self.getters.append((key, getter))
+                self.columns.update(dict.fromkeys(columns))
+
+    def get_fields(self):
+        raise NotImplementedError
+
+    def wants(self, name):
+        return self.serializer_class.is_selected(name, *self.selection)
+
+    def get_rows(self, queryset, extra_columns=()):
+        return queryset.prefetch_related(None).values(*self.columns, *extra_columns)
+
+    def serialize(self, rows):
+        rows = list(rows)
+        related = self.load_related(rows)
+        getters = self.getters
+        return [{key: getter(row, related) for key, getter in getters} for row in rows]
+
+    def load_related(self, rows):
+        return {}
+
+    def media_url(self, name):
+        # what ``MediaImageField`` renders
+        return media_url(name, self.request)
+
+
+def column(name, formatter=None):
+    """
+    Getter for a plain column, optionally passed through ``formatter``.
+    """
+    if formatter is None:
+        return lambda row, related: row[name]
+    return lambda row, related: formatter(row[name])
@@ -0,0 +1,35 @@
+from rest_framework import renderers
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    """
+    ``JSONRenderer`` on top of orjson, byte for byte the same output. Values orjson would format differently
+    (datetimes, decimals, lazy strings, ...) go through DRF's encoder; indented output, settings orjson cannot
+    honour and data it cannot encode (e.g. integers over 64 bits) fall back to ``json``.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (orjson is None or not self.compact or self.ensure_ascii or not api_settings.STRICT_JSON
+                or self.get_indent(accepted_media_type, renderer_context or {})):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            content = orjson.dumps(
+                data,
+                default=JSONEncoder().default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # same as ``JSONRenderer``: keep the output valid JavaScript
+        return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
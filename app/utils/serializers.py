@@ -1,8 +1,52 @@
+from django.db import models
 from rest_framework import serializers
 
+from app.utils.images import get_srcset
+from app.utils.media import media_url
 from app.utils.models import Location, Notification, Currency
 
 
+class MediaImageField(serializers.ImageField):
+    """
+    ``ImageField`` rendering its URL with ``media_url`` instead of ``build_absolute_uri`` per value.
+    """
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        if not getattr(self, 'use_url', True):
+            return value.name
+        return media_url(value.name, self.context.get('request'))
+
+
+class MediaURLMixin:
+    """
+    Makes a ``ModelSerializer`` build the image fields of its model as ``MediaImageField``.
+    """
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.ImageField: MediaImageField,
+    }
+
+
+class SrcsetField(serializers.Field):
+    """
+    Read-only ``{size: {'width', 'height', 'webp', 'avif'}}`` map of the renditions of ``image_field``,
+    with absolute URLs like ``ImageField`` renders.
+    """
+
+    def __init__(self, image_field='image', **kwargs):
+        self.image_field = image_field
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        request = self.context.get('request')
+        return get_srcset(instance.renditions, getattr(instance, self.image_field).name,
+                          lambda name: media_url(name, request))
+
+
 class LocationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Location
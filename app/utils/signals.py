@@ -0,0 +1,4 @@
+from app.utils.images import track_renditions
+from app.utils.models import Color
+
+track_renditions(Color)
@@ -0,0 +1,55 @@
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, IntegerField, Max, Q
+from django.db.models.functions import Cast, Substr
+from django.utils.text import slugify
+
+
+def next_free_slug(model, source, field_name='slug', reserved=()):
+    """
+    ``slugify(source)`` while it is free, else ``<slug>-<n>`` with ``n`` one past the highest numeric suffix
+    taken, found with a single range scan of the unique index on ``field_name``. Falls back to the model name
+    when ``source`` has nothing to slugify, and shortens the base so the suffix fits ``max_length``.
+
+    All-digit slugs and the ``reserved`` ones always get a suffix, as routes matching an id or a fixed path
+    come first and would never reach them.
+    """
+    max_length = model._meta.get_field(field_name).max_length
+    base = slugify(source)[:max_length].strip('-') or model._meta.model_name
+    while True:
+        # every ``<base>-<n>`` sorts between ``<base>-`` and ``<base>.``; the pattern drops ``<base>-<word>``
+        numbered = Q(**{
+            f'{field_name}__gt': f'{base}-', f'{field_name}__lt': f'{base}.',
+            f'{field_name}__regex': rf'^{re.escape(base)}-[0-9]+$',
+        })
+        found = model._default_manager.filter(Q(**{field_name: base}) | numbered).aggregate(
+            base=Count('pk', filter=Q(**{field_name: base})),
+            suffix=Max(Cast(Substr(field_name, len(base) + 2), IntegerField()), filter=numbered),
+        )
+        if not found['base'] and not (base.isdigit() or base in reserved):
+            return base
+        taken = found['suffix'] or 0
+        slug = f'{base}-{taken + 1}'
+        if len(slug) <= max_length:
+            return slug
+        base = base[:max_length - len(slug) + len(base)].rstrip('-')
+
+
+def save_with_slug(instance, source, save, field_name='slug', attempts=5, reserved=()):
+    """
+    Calls ``save`` after filling an empty ``field_name`` with ``next_free_slug``. A concurrent insert can take
+    the same slug first; the unique index then rejects the row and the next free slug is tried.
+    """
+    if getattr(instance, field_name):
+        return save()
+
+    for attempt in range(attempts):
+        setattr(instance, field_name, next_free_slug(type(instance), source, field_name, reserved))
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError:
+            setattr(instance, field_name, None)
+            if attempt == attempts - 1:
+                raise
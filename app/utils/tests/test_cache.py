@@ -0,0 +1,82 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from app.utils.cache import get_or_compute
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                       'LOCATION': 'single-flight-tests'}})
+class GetOrComputeTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+        self.calls_lock = threading.Lock()
+
+    def slow_compute(self, value, delay=0.3):
+        def compute():
+            with self.calls_lock:
+                self.calls += 1
+            time.sleep(delay)
+            return value
+
+        return compute
+
+    def run_concurrently(self, target, workers=8):
+        barrier = threading.Barrier(workers)
+        results = [None] * workers
+
+        def run(index):
+            barrier.wait()
+            results[index] = target()
+
+        threads = [threading.Thread(target=run, args=(index,)) for index in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_misses_compute_once(self):
+        compute = self.slow_compute('fresh')
+        results = self.run_concurrently(lambda: get_or_compute('key', compute, timeout=60))
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, ['fresh'] * 8)
+
+    def test_stale_value_is_served_while_refreshing(self):
+        get_or_compute('key', lambda: 'old', timeout=0.1, stale_timeout=60)
+        time.sleep(0.2)
+
+        compute = self.slow_compute('new')
+        started = time.time()
+        results = self.run_concurrently(lambda: (get_or_compute('key', compute, timeout=60), time.time()))
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(sorted(value for value, _ in results), ['new'] + ['old'] * 7)
+        for value, finished in results:
+            if value == 'old':
+                self.assertLess(finished - started, 0.2)
+        self.assertEqual(get_or_compute('key', compute, timeout=60), 'new')
+
+    def test_expired_value_is_recomputed(self):
+        get_or_compute('key', lambda: 'old', timeout=0.1, stale_timeout=0.1)
+        time.sleep(0.3)
+
+        self.assertEqual(get_or_compute('key', lambda: 'new', timeout=60), 'new')
+
+    def test_lock_is_released_when_compute_fails(self):
+        def failing():
+            raise RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            get_or_compute('key', failing, timeout=60)
+
+        self.assertEqual(get_or_compute('key', lambda: 'value', timeout=60, wait_timeout=0), 'value')
+
+    def test_uncacheable_values_are_not_stored(self):
+        get_or_compute('key', lambda: 404, timeout=60, should_cache=lambda value: value == 200)
+
+        self.assertEqual(get_or_compute('key', lambda: 200, timeout=60), 200)
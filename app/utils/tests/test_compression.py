@@ -0,0 +1,133 @@
+import datetime
+import gzip
+import uuid
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from app.product.models import Category, Product
+from app.utils import compression, middleware
+from app.utils.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    def test_output_matches_json_renderer(self):
+        data = ReturnDict({
+            'id': uuid.uuid4(),
+            'price': Decimal('12.50'),
+            'created': datetime.datetime(2024, 5, 1, 10, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'day': datetime.date(2024, 5, 1),
+            'title': 'Телефон “Pro”',
+            'separator': 'a\u2028b\u2029c',
+            'label': gettext_lazy('Phone'),
+            'rating': 4.25,
+            'counts': {1: 2, 5: 10},
+            'images': [None, True, ('a', 'b')],
+        }, serializer=None)
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indent_falls_back_to_json(self):
+        data = {'a': [1, 2]}
+        renderer_context = {'indent': 4}
+
+        self.assertEqual(
+            ORJSONRenderer().render(data, renderer_context=renderer_context),
+            JSONRenderer().render(data, renderer_context=renderer_context)
+        )
+
+    def test_big_integers_fall_back_to_json(self):
+        self.assertEqual(ORJSONRenderer().render({'n': 2 ** 70}), b'{"n":1180591620717411303424}')
+
+
+class SelectEncodingTest(SimpleTestCase):
+    def select(self, header):
+        return compression.select_encoding(RequestFactory().get('/', HTTP_ACCEPT_ENCODING=header))
+
+    @mock.patch.object(compression, 'available_encodings', return_value=('br', 'gzip'))
+    def test_q_values(self, available_encodings):
+        self.assertEqual(self.select('gzip, deflate, br'), 'br')
+        self.assertEqual(self.select('gzip;q=1.0, br;q=0.5'), 'gzip')
+        self.assertEqual(self.select('br;q=0, *'), 'gzip')
+        self.assertEqual(self.select('identity'), None)
+        self.assertEqual(self.select(''), None)
+
+    @mock.patch.object(compression, 'available_encodings', return_value=('gzip',))
+    def test_without_brotli(self, available_encodings):
+        self.assertEqual(self.select('br, gzip;q=0.1'), 'gzip')
+        self.assertEqual(self.select('br'), None)
+
+
+@skipUnless(compression.brotli, 'brotli is not installed')
+class BrotliTest(SimpleTestCase):
+    content = b'{"title": "A phone with a long description."}' * 20
+
+    def test_round_trip(self):
+        self.assertEqual(compression.brotli.decompress(compression.compress(self.content, 'br')), self.content)
+
+    def test_length_is_padded(self):
+        unpadded = len(compression.brotli.compress(self.content, quality=settings.BROTLI_QUALITY))
+        lengths = {len(compression.compress(self.content, 'br')) for _ in range(20)}
+
+        self.assertGreater(min(lengths), unpadded)
+        self.assertGreater(len(lengths), 1)
+
+
+class CompressionMiddlewareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        category = Category.objects.create(name='Phones')
+        self.product = Product.objects.create(
+            category=category, title='Phone', description='A phone with a long description. ' * 20, price=100
+        )
+        self.url = reverse('product-detail', kwargs={'pk': self.product.pk})
+
+    def get(self, **headers):
+        with mock.patch.object(compression, 'available_encodings', return_value=('gzip',)):
+            return self.client.get(self.url, **headers)
+
+    def test_gzip(self):
+        identity = self.get()
+        response = self.get(HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), identity.content)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(response['ETag'], f'W/{identity["ETag"]}')
+
+    def test_identity_without_accept_encoding(self):
+        response = self.get()
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.json()['id'], self.product.pk)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_compressed_body_is_reused(self):
+        first = self.get(HTTP_ACCEPT_ENCODING='gzip')
+
+        with mock.patch.object(middleware, 'compress', wraps=compression.compress) as compress:
+            second = self.get(HTTP_ACCEPT_ENCODING='gzip')
+
+        compress.assert_not_called()
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Content-Encoding'], 'gzip')
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(second['Content-Type'], first['Content-Type'])
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=second['ETag']).status_code, 304)
+
+    def test_write_drops_compressed_body(self):
+        self.get(HTTP_ACCEPT_ENCODING='gzip')
+
+        self.product.title = 'Renamed'
+        self.product.save()
+        response = self.get(HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertIn(b'Renamed', gzip.decompress(response.content))
@@ -0,0 +1,178 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from app.product.models import Category, Product, ProductImage
+from app.utils import images
+from app.utils.images import RENDITION_SIZES, ImageStatus, build_renditions
+
+
+def upload(name='photo.png', size=(1600, 800)):
+    buffer = BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+def fake_transcode(content):
+    # stands in for the HEIF decoder; the test uploads are PNGs named .heic
+    buffer = BytesIO()
+    Image.open(BytesIO(content)).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+class RenditionPipelineTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings = override_settings(IMAGE_PIPELINE_EAGER=True, MEDIA_ROOT=media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.product = Product.objects.create(category=Category.objects.create(name='Phones'), title='Phone',
+                                              price=100)
+
+    def create_image(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ProductImage.objects.create(product=self.product, image=upload(**kwargs))
+
+    def test_renditions_are_built_after_commit(self):
+        image = self.create_image()
+        image.refresh_from_db()
+
+        self.assertEqual(image.renditions['source'], image.image.name)
+        self.assertEqual(set(image.renditions['srcset']), set(RENDITION_SIZES))
+        thumbnail = image.renditions['srcset']['thumbnail']
+        self.assertEqual((thumbnail['width'], thumbnail['height']), (160, 80))
+        for extension in ('webp', 'avif'):
+            self.assertTrue(default_storage.exists(thumbnail[extension]))
+
+        detail = self.client.get(reverse('product-detail', kwargs={'pk': self.product.pk})).data
+        srcset = detail['images'][0]['srcset']
+        self.assertEqual(srcset['full']['width'], 1200)
+        self.assertTrue(srcset['card']['webp'].startswith('http://testserver/media/renditions/'))
+
+        listing = self.client.get(reverse('all-product')).data['results'][0]
+        self.assertEqual(listing['images'][0]['srcset'], srcset)
+
+    def test_small_originals_keep_their_size(self):
+        image = self.create_image(size=(100, 50))
+        image.refresh_from_db()
+
+        self.assertEqual(image.renditions['srcset']['full']['width'], 100)
+
+    def test_replaced_image_drops_stale_renditions(self):
+        image = self.create_image()
+        image.refresh_from_db()
+        stale = image.renditions['srcset']['card']['webp']
+
+        image.image = upload('other.png')
+        with self.captureOnCommitCallbacks(execute=True):
+            image.save()
+            # the old renditions are not served for the new image while it is processed
+            detail = self.client.get(reverse('product-detail', kwargs={'pk': self.product.pk})).data
+            self.assertEqual(detail['images'][0]['srcset'], {})
+
+        image.refresh_from_db()
+        self.assertEqual(image.renditions['source'], image.image.name)
+        self.assertFalse(default_storage.exists(stale))
+
+        card = image.renditions['srcset']['card']['webp']
+        with self.captureOnCommitCallbacks(execute=True):
+            image.delete()
+        self.assertFalse(default_storage.exists(card))
+
+    def test_unreadable_files(self):
+        name = default_storage.save('images/product/logo.svg', BytesIO(b'<svg xmlns="http://www.w3.org/2000/svg"/>'))
+
+        with self.assertLogs('app.utils.images', 'WARNING'):
+            self.assertEqual(build_renditions(name), {'source': name})
+
+    def test_failing_encoder_keeps_the_other_formats(self):
+        save = Image.Image.save
+
+        def save_without_avif(image, fp, format=None, **options):
+            if format == 'AVIF':
+                raise OSError('encoder error')
+            return save(image, fp, format, **options)
+
+        with mock.patch.object(Image.Image, 'save', save_without_avif), \
+                self.assertLogs('app.utils.images', 'WARNING'):
+            image = self.create_image()
+        image.refresh_from_db()
+
+        for entry in image.renditions['srcset'].values():
+            self.assertNotIn('avif', entry)
+            self.assertTrue(default_storage.exists(entry['webp']))
+        detail = self.client.get(reverse('product-detail', kwargs={'pk': self.product.pk})).data
+        self.assertEqual(set(detail['images'][0]['srcset']['card']), {'width', 'height', 'webp'})
+
+    def test_heic_upload_is_transcoded(self):
+        with mock.patch.object(images, 'transcode', side_effect=fake_transcode):
+            with self.captureOnCommitCallbacks(execute=True):
+                image = ProductImage.objects.create(product=self.product, image=upload('iphone.heic'))
+                self.assertEqual(image.image_status, ImageStatus.processing)
+                original = image.image.name
+
+        image.refresh_from_db()
+        self.assertEqual(image.image_status, ImageStatus.ready)
+        self.assertTrue(image.image.name.endswith('.jpg'))
+        self.assertFalse(default_storage.exists(original))
+        self.assertEqual(image.renditions['source'], image.image.name)
+
+        detail = self.client.get(reverse('product-detail', kwargs={'pk': self.product.pk})).data
+        self.assertEqual(detail['images'][0]['image_status'], 'r')
+        self.assertEqual(detail['images'][0]['srcset']['thumbnail']['width'], 160)
+
+    def test_heic_replaced_while_transcoding(self):
+        def replace_and_transcode(content):
+            ProductImage.objects.filter(pk=image.pk).update(image='images/product/other.png')
+            return fake_transcode(content)
+
+        with mock.patch.object(images, 'transcode', side_effect=replace_and_transcode):
+            with self.captureOnCommitCallbacks(execute=True):
+                image = ProductImage.objects.create(product=self.product, image=upload('iphone.heic'))
+
+        image.refresh_from_db()
+        self.assertEqual(image.image.name, 'images/product/other.png')
+        self.assertFalse(default_storage.exists(image.image.name.replace('other.png', 'iphone.jpg')))
+
+    def test_failed_transcoding_keeps_the_original(self):
+        with mock.patch.object(images, 'pillow_heif', None), self.assertLogs('app.utils.images', 'ERROR'):
+            with self.captureOnCommitCallbacks(execute=True):
+                image = ProductImage.objects.create(product=self.product, image=upload('iphone.heic'))
+
+        image.refresh_from_db()
+        self.assertEqual(image.image_status, ImageStatus.failed)
+        self.assertTrue(default_storage.exists(image.image.name))
+        self.assertEqual(image.renditions, {})
+
+    def test_uploads_left_processing_are_requeued(self):
+        # the server restarted before the transcoding ran
+        image = ProductImage.objects.create(product=self.product, image=upload('iphone.heic'))
+        self.assertEqual(image.image_status, ImageStatus.processing)
+
+        with mock.patch.object(images, 'transcode', side_effect=fake_transcode):
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command('requeue_images', stdout=StringIO())
+
+        image.refresh_from_db()
+        self.assertEqual(image.image_status, ImageStatus.ready)
+        self.assertTrue(image.image.name.endswith('.jpg'))
+        self.assertEqual(image.renditions['source'], image.image.name)
+
+    @override_settings(IMAGE_PIPELINE_EAGER=False)
+    def test_transcoding_processes_are_not_forked(self):
+        with mock.patch.object(images, '_process_pool', None):
+            pool = images.get_process_pool()
+            self.addCleanup(pool.shutdown)
+
+            self.assertIn(pool._mp_context.get_start_method(), ('forkserver', 'spawn'))
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory, override_settings
+from django.urls import reverse
+
+from app.order.models import Item
+from app.order.serializers import ItemSerializer
+from app.product.models import Category, Product, ProductImage
+from app.user.models import User
+from app.utils.media import media_url
+
+
+class MediaURLTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.product = Product.objects.create(category=Category.objects.create(name='Phones'), title='Phone',
+                                              price=100)
+        ProductImage.objects.create(product=self.product, image='images/product/front side.png')
+
+    def test_matches_build_absolute_uri(self):
+        request = RequestFactory().get('/', secure=True, HTTP_HOST='shop.example.com')
+
+        self.assertEqual(media_url('images/product/front side.png', request),
+                         request.build_absolute_uri('/media/images/product/front%20side.png'))
+        self.assertEqual(media_url('images/product/a.png'), '/media/images/product/a.png')
+        self.assertIsNone(media_url('', request))
+
+    @override_settings(MEDIA_CDN_BASE='https://cdn.example.com/media')
+    def test_cdn_base(self):
+        expected = 'https://cdn.example.com/media/images/product/front%20side.png'
+
+        detail = self.client.get(reverse('product-detail', kwargs={'pk': self.product.pk})).data
+        self.assertEqual(detail['images'][0]['image'], expected)
+        listing = self.client.get(reverse('all-product')).data['results'][0]
+        self.assertEqual(listing['images'][0]['image'], expected)
+
+        serializer = ItemSerializer(context={'request': RequestFactory().get('/')})
+        self.assertEqual(serializer.get_images(Item(product=self.product)), [expected])
+
+
+class MediaServingTest(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        os.makedirs(os.path.join(media_root, 'images', 'product'))
+        with open(os.path.join(media_root, 'images', 'product', 'a b.png'), 'wb') as file:
+            file.write(b'png')
+        settings = override_settings(MEDIA_ROOT=media_root, MEDIA_PRIVATE_PREFIXES=['private/'])
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.media_root = media_root
+
+    def get_with_token(self, path, user):
+        return self.client.get(path, HTTP_AUTHORIZATION=f'Bearer {user.get_tokens()["access"]}')
+
+    @override_settings(MEDIA_SERVE_MODE='accel')
+    def test_accel_redirect(self):
+        response = self.client.get('/media/images/product/a%20b.png')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/images/product/a%20b.png')
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertIn('max-age=2592000', response['Cache-Control'])
+        self.assertEqual(response.content, b'')
+
+        self.assertEqual(self.client.get('/media/images/product/missing.png').status_code, 404)
+        self.assertEqual(self.client.get('/media/../core/settings.py').status_code, 404)
+
+    @override_settings(MEDIA_SERVE_MODE='sendfile')
+    def test_sendfile_and_private_files(self):
+        os.makedirs(os.path.join(self.media_root, 'private'))
+        with open(os.path.join(self.media_root, 'private', 'report.pdf'), 'wb') as file:
+            file.write(b'pdf')
+
+        self.assertEqual(self.client.get('/media/private/report.pdf').status_code, 403)
+        customer = User.objects.create_user(phone_number='+998901234567', is_staff=True)
+        self.assertEqual(self.get_with_token('/media/private/report.pdf', customer).status_code, 403)
+        self.assertEqual(self.client.get('/media/private/report.pdf', HTTP_AUTHORIZATION='Bearer x').status_code,
+                         403)
+
+        admin = User.objects.create_user(phone_number='+998901234568', role=User.UserRole.admin)
+        response = self.get_with_token('/media/private/report.pdf', admin)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Sendfile'], os.path.join(self.media_root, 'private', 'report.pdf'))
+        self.assertIn('private', response['Cache-Control'])
+
+    def test_not_served_without_a_mode(self):
+        self.assertEqual(self.client.get('/media/images/product/a%20b.png').status_code, 404)
@@ -0,0 +1,112 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from rest_framework.test import APIClient
+
+from app.product.models import RESERVED_PRODUCT_SLUGS, Category, Product
+from app.product.urls import urlpatterns
+from app.user.models import User
+from app.utils import slugs
+
+
+class SlugAllocationTest(TestCase):
+    def test_thousands_of_same_named_categories(self):
+        categories = [Category.objects.create(name='Phones') for _ in range(2_000)]
+
+        self.assertEqual(categories[0].slug, 'phones')
+        self.assertEqual(categories[1].slug, 'phones-1')
+        self.assertEqual(categories[-1].slug, 'phones-1999')
+        self.assertEqual(len({category.slug for category in categories}), 2_000)
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(slugs.next_free_slug(Category, 'Phones'), 'phones-2000')
+        self.assertEqual(len(context.captured_queries), 1)
+
+    def test_other_slugs_sharing_the_prefix(self):
+        Category.objects.create(name='Phones')
+        Category.objects.create(name='Phones Pro')
+        Category.objects.create(name='Phonesx')
+
+        self.assertEqual(Category.objects.create(name='Phones').slug, 'phones-1')
+        self.assertEqual(Category.objects.create(name='Phones Pro').slug, 'phones-pro-1')
+
+    def test_free_base_next_to_worded_suffixes(self):
+        Product.objects.create(title='iPhone Pro', price=100)
+        Product.objects.create(title='Samsung 15 Ultra', price=100)
+        Product.objects.create(title='Samsung 2', price=100)
+
+        self.assertEqual(Product.objects.create(title='iPhone', price=100).slug, 'iphone')
+        self.assertEqual(Product.objects.create(title='Samsung', price=100).slug, 'samsung')
+        # only ``<base>-<n>`` counts as a suffix once the base is taken
+        self.assertEqual(Product.objects.create(title='Samsung', price=100).slug, 'samsung-3')
+        self.assertEqual(Product.objects.create(title='iPhone', price=100).slug, 'iphone-1')
+
+    def test_suffix_fits_max_length(self):
+        name = 'a' * 30
+        first = Category.objects.create(name=name)
+        second = Category.objects.create(name=name)
+
+        self.assertEqual(first.slug, name)
+        # no room for a suffix, so the base is shortened and allocated again
+        self.assertEqual(second.slug, 'a' * 28)
+        self.assertEqual(Category.objects.create(name=name).slug, 'a' * 28 + '-1')
+
+    def test_retries_when_a_concurrent_insert_takes_the_slug(self):
+        Category.objects.create(name='Phones')
+        allocate = slugs.next_free_slug
+        # the first allocation sees the table before the other insert landed
+        with mock.patch.object(slugs, 'next_free_slug', side_effect=['phones', allocate(Category, 'Phones')]):
+            category = Category.objects.create(name='Phones')
+
+        self.assertEqual(category.slug, 'phones-1')
+        self.assertEqual(Category.objects.count(), 2)
+
+    def test_product_slugs(self):
+        category = Category.objects.create(name='Phones')
+        first = Product.objects.create(category=category, title='iPhone 15 Pro', price=100)
+        second = Product.objects.create(category=category, title='iPhone 15 Pro', price=100)
+        unnamed = Product.objects.create(title='Телефон', price=100)
+
+        self.assertEqual((first.slug, second.slug), ('iphone-15-pro', 'iphone-15-pro-1'))
+        self.assertEqual(unnamed.slug, 'product')
+
+        second.title = 'Renamed'
+        second.save()
+        self.assertEqual(second.slug, 'iphone-15-pro-1')
+
+        response = self.client.get(reverse('product-detail-slug', kwargs={'slug': 'iphone-15-pro-1'}))
+        self.assertEqual(response.data['id'], second.pk)
+
+    def test_slugs_shadowed_by_other_routes_get_a_suffix(self):
+        category = Category.objects.create(name='2024')
+        self.assertEqual(category.slug, '2024-1')
+        self.assertEqual(Product.objects.create(category=category, title='2024', price=100).slug, '2024-1')
+        self.assertEqual(Product.objects.create(category=category, title='2024', price=100).slug, '2024-2')
+        for word in ('all', 'search', 'facets', 'create'):
+            self.assertEqual(Product.objects.create(title=word, price=100).slug, f'{word}-1')
+
+        response = self.client.get(reverse('product-detail-slug', kwargs={'slug': '2024-1'}))
+        self.assertEqual(response.status_code, 200)
+
+    def test_reserved_slugs_cover_the_fixed_routes(self):
+        fixed = {
+            str(pattern.pattern).strip('/') for pattern in urlpatterns
+            if isinstance(pattern, URLPattern) and '<' not in str(pattern.pattern)
+            and str(pattern.pattern).count('/') == 1
+        }
+
+        self.assertLessEqual(fixed, set(RESERVED_PRODUCT_SLUGS))
+
+    def test_slug_route_updates_and_deletes(self):
+        product = Product.objects.create(category=Category.objects.create(name='Phones'), title='Phone', price=100)
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(phone_number='+998901234567', role=User.UserRole.admin))
+        url = reverse('product-detail-slug', kwargs={'slug': product.slug})
+
+        self.assertEqual(client.put(url, {'price': '150.00'}, format='json').status_code, 200)
+        self.assertEqual(client.delete(url).status_code, 204)
+        product.refresh_from_db()
+        self.assertEqual((product.price, product.is_active), (150, False))
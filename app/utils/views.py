@@ -1,7 +1,20 @@
+import mimetypes
+import os
+from urllib.parse import quote
+
 from rest_framework import generics, status
+from rest_framework.exceptions import APIException
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from django.conf import settings
+from django.core.exceptions import PermissionDenied, SuspiciousFileOperation
 from django.db.models import Q
+from django.http import Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control
+from django.views import static
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
@@ -23,6 +36,7 @@ class CurrencyGetAPIView(ListAPIView):
     permission_classes = (AllowAny,)
     queryset = Currency.objects.all()
     serializer_class = CurrencyGetSerializer
+    pagination_class = None
 
 
 class CurrencyAPIView(APIView):
@@ -36,3 +50,51 @@ class CurrencyAPIView(APIView):
             serializer.save()
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+def can_read_private_media(request):
+    """
+    Whether ``request`` comes from an admin, authenticated like the API does: a plain Django view never reads
+    the bearer token.
+    """
+    api_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        return IsAdminOrSuperAdmin().has_permission(api_request, None)
+    except APIException:
+        return False
+
+
+def serve_media(request, path):
+    """
+    Checks access to the media file ``path`` and leaves sending it to the front proxy, as ``MEDIA_SERVE_MODE``
+    says: ``accel`` answers with ``X-Accel-Redirect`` (nginx), ``sendfile`` with ``X-Sendfile`` (Apache,
+    lighttpd). Without a mode, media is served by Django itself only with ``DEBUG``.
+    """
+    mode = settings.MEDIA_SERVE_MODE
+    if not mode:
+        if not settings.DEBUG:
+            raise Http404
+        return static.serve(request, path, document_root=settings.MEDIA_ROOT)
+
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    private = path.startswith(tuple(settings.MEDIA_PRIVATE_PREFIXES))
+    if private and not can_read_private_media(request):
+        raise PermissionDenied
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    response = HttpResponse(content_type=content_type or 'application/octet-stream')
+    if mode == 'accel':
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(path)
+    else:
+        response['X-Sendfile'] = full_path
+    if private:
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        patch_cache_control(response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE)
+    return response
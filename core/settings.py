@@ -58,6 +58,7 @@ INSTALLED_APPS = LOCAL_APPS + THIRD_PARTY_APPS
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'app.utils.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -95,7 +96,13 @@ REST_FRAMEWORK = {
         'rest_framework_simplejwt.authentication.JWTAuthentication',
         'rest_framework.authentication.BasicAuthentication',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'app.utils.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_PAGINATION_CLASS': 'app.utils.pagination.KeysetPagination',
+    'PAGE_SIZE': 20,
     'EXCEPTION_HANDLER': 'core.exceptions.custom_exception_handler'
 }
 
@@ -117,6 +124,39 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+# Serve product listings from the denormalized ProductCard table (see app.product.cards). Cards are not maintained
+# while off: run ``manage.py rebuild_product_cards`` before turning it on
+PRODUCT_CARDS_ENABLED = env.bool('PRODUCT_CARDS_ENABLED', default=False)
+
+# Prices of products, colours and features each worker keeps for quotes (see app.order.pricing), per kind
+PRICE_BOOK_SIZE = env.int('PRICE_BOOK_SIZE', default=10_000)
+# seconds before a quoted price is read again; bounds staleness when the cache is per process (locmem)
+PRICE_BOOK_MAX_AGE = env.int('PRICE_BOOK_MAX_AGE', default=30)
+
+# Serve the hottest read-only lists through compiled values() projections (see app.utils.projections)
+COMPILED_SERIALIZERS_ENABLED = env.bool('COMPILED_SERIALIZERS_ENABLED', default=True)
+
+# Resized WebP/AVIF renditions of uploaded images (see app.utils.images), built by a pool of worker threads
+IMAGE_WORKERS = env.int('IMAGE_WORKERS', default=2)
+# builds them when the upload commits instead, in the request
+IMAGE_PIPELINE_EAGER = env.bool('IMAGE_PIPELINE_EAGER', default=False)
+# processes decoding HEIC/HEIF uploads into JPEG (needs pillow-heif)
+IMAGE_TRANSCODE_PROCESSES = env.int('IMAGE_TRANSCODE_PROCESSES', default=1)
+
+# Retried POSTs carrying an Idempotency-Key header (see app.utils.idempotency): how long their first response is
+# replayed, how long a retry waits for the first request in flight, and when an in-flight request counts as dead
+IDEMPOTENCY_KEY_TTL = env.int('IDEMPOTENCY_KEY_TTL', default=60 * 60 * 24)
+IDEMPOTENCY_WAIT_TIMEOUT = env.float('IDEMPOTENCY_WAIT_TIMEOUT', default=10)
+IDEMPOTENCY_POLL_INTERVAL = 0.1
+IDEMPOTENCY_LOCK_TIMEOUT = env.int('IDEMPOTENCY_LOCK_TIMEOUT', default=60)
+
+# Brotli level of compressed responses (see app.utils.middleware); brotli is used only when installed
+BROTLI_QUALITY = env.int('BROTLI_QUALITY', default=5)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -164,6 +204,25 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# e.g. https://cdn.example.com/media/; media URLs are built against it instead of the request host
+MEDIA_CDN_BASE = env('MEDIA_CDN_BASE', default='')
+# How app.utils.views.serve_media hands media files to the front proxy after its checks: 'accel'
+# (X-Accel-Redirect, nginx) or 'sendfile' (X-Sendfile); empty serves them from Django with DEBUG only
+MEDIA_SERVE_MODE = env('MEDIA_SERVE_MODE', default='')
+# the nginx ``internal`` location aliasing MEDIA_ROOT
+MEDIA_ACCEL_REDIRECT_PREFIX = env('MEDIA_ACCEL_REDIRECT_PREFIX', default='/protected-media/')
+# media paths only admins (IsAdminOrSuperAdmin, authenticated like the API) may fetch
+MEDIA_PRIVATE_PREFIXES = env.list('MEDIA_PRIVATE_PREFIXES', default=[])
+MEDIA_CACHE_MAX_AGE = env.int('MEDIA_CACHE_MAX_AGE', default=60 * 60 * 24 * 30)
+
+# Content-hashed, precompressed (gzip, and brotli when installed) static files by collectstatic; WhiteNoise serves
+# the hashed names with an immutable, far-future Cache-Control
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+# falls back to the plain names of files missing from the manifest instead of failing the page
+WHITENOISE_MANIFEST_STRICT = False
 
 # # if DEBUG:
 # STATIC_URL = 'static/'